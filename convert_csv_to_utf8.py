@@ -1,18 +1,16 @@
 """
 서울시 상권 CSV 파일을 UTF-8 인코딩으로 변환하여 CSV 폴더에 저장
+- 파일 앞부분으로 인코딩 감지, 청크 단위 스트리밍 변환, 프로세스 풀 병렬 처리 (csv_transcoder.py)
+- DataFrame을 만들지 않고 원본/변환 파일의 행 수를 비교해 검증
 """
-import os
-import pandas as pd
 from pathlib import Path
-import chardet
+
+from csv_transcoder import transcode_files
 
 # 소스 디렉토리와 타겟 디렉토리 설정
 source_dir = Path(r"d:\git_rk\data\서울시 상권")
 target_dir = Path(r"d:\git_rk\CSV")
 
-# 타겟 디렉토리 생성
-target_dir.mkdir(exist_ok=True)
-
 # 변환할 파일 목록
 files_to_convert = [
     "서울시 상권분석서비스(길단위인구-상권).csv",
@@ -27,63 +25,42 @@ files_to_convert = [
     "서울시 상권분석서비스(추정매출-상권)__2022년 1분기~2024년 4분기.csv"
 ]
 
-def detect_encoding(file_path):
-    """파일의 인코딩을 감지"""
-    with open(file_path, 'rb') as f:
-        result = chardet.detect(f.read(100000))  # 처음 100KB만 읽어서 감지
-    return result['encoding']
-
-def convert_to_utf8(source_file, target_file):
-    """CSV 파일을 UTF-8로 변환"""
-    try:
-        # 인코딩 감지
-        encoding = detect_encoding(source_file)
-        print(f"처리 중: {source_file.name}")
-        print(f"  - 감지된 인코딩: {encoding}")
-        
-        # CSV 파일 읽기
-        df = pd.read_csv(source_file, encoding=encoding)
-        
-        # UTF-8로 저장
-        df.to_csv(target_file, index=False, encoding='utf-8-sig')
-        
-        print(f"  - 저장 완료: {target_file.name}")
-        print(f"  - 행 수: {len(df):,}, 열 수: {len(df.columns)}")
-        print()
-        
-        return True
-    except Exception as e:
-        print(f"  - 오류 발생: {str(e)}")
-        print()
-        return False
-
-# 메인 실행
-print("=" * 60)
-print("서울시 상권 CSV 파일 UTF-8 변환 작업 시작")
-print("=" * 60)
-print()
+MAX_WORKERS = None  # 동시에 변환할 파일 수 (None이면 CPU 코어 수)
 
-success_count = 0
-fail_count = 0
 
-for filename in files_to_convert:
-    source_file = source_dir / filename
-    target_file = target_dir / filename
+def main():
+    print("=" * 60)
+    print("서울시 상권 CSV 파일 UTF-8 변환 작업 시작")
+    print("=" * 60)
+    print()
     
-    if source_file.exists():
-        if convert_to_utf8(source_file, target_file):
-            success_count += 1
+    # 타겟 디렉토리 생성
+    target_dir.mkdir(exist_ok=True)
+    
+    pairs = []
+    missing = []
+    for filename in files_to_convert:
+        source_file = source_dir / filename
+        if source_file.exists():
+            pairs.append((source_file, target_dir / filename))
         else:
-            fail_count += 1
-    else:
-        print(f"파일을 찾을 수 없음: {filename}")
-        fail_count += 1
-        print()
+            print(f"파일을 찾을 수 없음: {filename}")
+            missing.append(filename)
+    
+    print(f"처리 중: {len(pairs)}개 파일 (병렬 변환)")
+    results, failures = transcode_files(pairs, workers=MAX_WORKERS)
+    print()
+    
+    print("=" * 60)
+    print("변환 작업 완료")
+    print("=" * 60)
+    print(f"성공: {len(results)}개")
+    print(f"실패: {len(failures) + len(missing)}개")
+    print(f"총 행 수: {sum(r['rows'] for r in results):,}")
+    print(f"저장 위치: {target_dir}")
+    print()
+
 
-print("=" * 60)
-print("변환 작업 완료")
-print("=" * 60)
-print(f"성공: {success_count}개")
-print(f"실패: {fail_count}개")
-print(f"저장 위치: {target_dir}")
-print()
+# 메인 실행 (프로세스 풀을 쓰므로 Windows에서는 반드시 이 블록 안에서 실행)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+CSV 파일 인코딩 스트리밍 변환 (cp949/euc-kr → UTF-8)
+- 파일 앞부분(최대 1MB)만 읽어 인코딩 감지
+- 고정 크기 바이트 청크 단위로 증분 디코더를 사용해 변환 (파일 전체를 메모리에 올리지 않음)
+- 여러 파일을 프로세스 풀로 병렬 변환 (큰 파일부터)
+- DataFrame 없이 원본/변환 파일의 행 수를 세어 검증 (원본은 디코딩 없이 바이트 그대로 세어 변환과 독립적으로 비교)
+"""
+import codecs
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+# 인코딩 감지 후보 (utf-8-sig는 BOM 유무와 관계없이 UTF-8을 읽고 BOM은 제거)
+ENCODINGS = ['utf-8-sig', 'cp949', 'euc-kr']
+SAMPLE_BYTES = 1 << 20      # 인코딩 감지에 사용할 앞부분 크기 (1MB)
+CHUNK_BYTES = 4 << 20       # 변환 청크 크기 (4MB)
+
+
+def detect_encoding(path, encodings=ENCODINGS, sample_bytes=SAMPLE_BYTES):
+    """파일 앞부분 sample_bytes만 읽어 디코딩 가능한 첫 번째 인코딩 반환"""
+    with open(path, 'rb') as f:
+        sample = f.read(sample_bytes)
+    for enc in encodings:
+        try:
+            # 샘플 끝에서 잘린 멀티바이트 문자는 오류로 보지 않도록 증분 디코딩
+            codecs.getincrementaldecoder(enc)().decode(sample, final=False)
+            return enc
+        except UnicodeDecodeError:
+            continue
+    raise ValueError(f"Could not decode {path} with any of {encodings}")
+
+
+class RowCounter:
+    """
+    따옴표 밖의 줄바꿈만 세어 CSV 레코드 수 계산 (따옴표 안 줄바꿈이 있는 셀도 한 행으로 처리)
+
+    문자열과 바이트 모두 받습니다. cp949/euc-kr/UTF-8의 멀티바이트 문자에는 0x0A(줄바꿈)와
+    0x22(따옴표) 바이트가 들어가지 않으므로 원본 바이트를 디코딩 없이 세어도 레코드 수가 같습니다.
+    """
+
+    def __init__(self):
+        self.newlines = 0
+        self.in_quotes = False
+        self.last_char = ''
+
+    def feed(self, text):
+        if not text:
+            return
+        quote, newline = (b'"', b'\n') if isinstance(text, bytes) else ('"', '\n')
+        parts = text.split(quote)
+        # parts[0]은 현재 상태 그대로, 이후 조각마다 따옴표 안/밖이 바뀜 ("" 이스케이프는 두 번 바뀌어 상쇄)
+        for i, part in enumerate(parts):
+            if not (self.in_quotes ^ (i % 2 == 1)):
+                self.newlines += part.count(newline)
+        self.in_quotes ^= (len(parts) - 1) % 2 == 1
+        self.last_char = text[-1:]
+
+    def rows(self):
+        """헤더를 제외한 데이터 행 수"""
+        records = self.newlines + (1 if self.last_char not in ('', '\n', b'\n') else 0)
+        return max(records - 1, 0)
+
+
+def count_rows(path, encoding, chunk_bytes=CHUNK_BYTES):
+    """파일을 스트리밍으로 읽어 데이터 행 수 계산"""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    counter = RowCounter()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_bytes)
+            counter.feed(decoder.decode(chunk, final=not chunk))
+            if not chunk:
+                break
+    return counter.rows()
+
+
+def count_source_rows(path, chunk_bytes=CHUNK_BYTES):
+    """원본 파일을 디코딩하지 않고 바이트 그대로 읽어 데이터 행 수 계산 (변환 결과 검증용)"""
+    counter = RowCounter()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_bytes)
+            if not chunk:
+                break
+            counter.feed(chunk)
+    return counter.rows()
+
+
+def _transcode(source_file, tmp_file, encoding, chunk_bytes):
+    decoder = codecs.getincrementaldecoder(encoding)()
+    encoder = codecs.getincrementalencoder('utf-8')()
+    counter = RowCounter()
+    with open(source_file, 'rb') as fin, open(tmp_file, 'wb') as fout:
+        fout.write(codecs.BOM_UTF8)  # Excel에서 한글이 깨지지 않도록 BOM 추가
+        while True:
+            chunk = fin.read(chunk_bytes)
+            text = decoder.decode(chunk, final=not chunk)
+            counter.feed(text)
+            fout.write(encoder.encode(text, final=not chunk))
+            if not chunk:
+                break
+    return counter.rows()
+
+
+def transcode_file(source_file, target_file, encoding=None, chunk_bytes=CHUNK_BYTES, verify=True):
+    """
+    CSV 파일 한 개를 UTF-8(BOM)로 스트리밍 변환
+
+    임시 파일에 쓴 뒤 교체하므로 중간에 실패해도 기존 결과 파일은 남습니다.
+    감지한 인코딩으로 끝까지 읽지 못하면 다음 후보 인코딩으로 다시 변환합니다.
+    verify=True이면 원본 바이트로 센 행 수와 기록된 결과 파일을 다시 읽어 센 행 수를 비교합니다.
+
+    Returns:
+    --------
+    dict
+        file, encoding, rows, source_bytes, target_bytes, seconds
+    """
+    source_file = Path(source_file)
+    target_file = Path(target_file)
+    target_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = target_file.with_name(target_file.name + '.tmp')
+    started = time.perf_counter()
+
+    detected = encoding or detect_encoding(source_file)
+    candidates = [detected] + [enc for enc in ENCODINGS if enc != detected and encoding is None]
+
+    rows = None
+    used_encoding = None
+    try:
+        for enc in candidates:
+            try:
+                rows = _transcode(source_file, tmp_file, enc, chunk_bytes)
+                used_encoding = enc
+                break
+            except UnicodeDecodeError:
+                continue
+        if used_encoding is None:
+            raise ValueError(f"지원되는 인코딩으로 읽을 수 없음: {candidates}")
+
+        if verify:
+            source_rows = count_source_rows(source_file, chunk_bytes)
+            target_rows = count_rows(tmp_file, 'utf-8-sig', chunk_bytes)
+            if target_rows != source_rows:
+                raise ValueError(f"행 수 불일치: 원본 {source_rows:,}행, 변환 {target_rows:,}행")
+
+        os.replace(tmp_file, target_file)
+    finally:
+        if tmp_file.exists():
+            tmp_file.unlink()
+
+    return {
+        'file': source_file.name,
+        'encoding': used_encoding,
+        'rows': rows,
+        'source_bytes': source_file.stat().st_size,
+        'target_bytes': target_file.stat().st_size,
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def transcode_files(pairs, workers=None, chunk_bytes=CHUNK_BYTES):
+    """
+    (원본, 대상) 경로 목록을 프로세스 풀에서 병렬 변환 (큰 파일부터 시작)
+
+    Returns:
+    --------
+    (list, list)
+        성공 결과(dict) 목록, (파일명, 오류 메시지) 목록
+    """
+    pairs = sorted(pairs, key=lambda pair: Path(pair[0]).stat().st_size, reverse=True)
+    results = []
+    failures = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(transcode_file, source, target, None, chunk_bytes): Path(source).name
+            for source, target in pairs
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                failures.append((name, str(e)))
+                print(f"  - 오류 발생: {name}: {e}")
+                continue
+            results.append(result)
+            mb = result['source_bytes'] / (1 << 20)
+            print(f"  - 저장 완료: {name} ({result['encoding']}, {result['rows']:,}행, "
+                  f"{result['source_bytes']:,} → {result['target_bytes']:,} bytes, "
+                  f"{result['seconds']:.1f}초, {mb / result['seconds'] if result['seconds'] > 0 else 0:.1f}MB/s)")
+    return results, failures
@@ -48,6 +48,7 @@ required_libraries = {
 optional_libraries = {
     'koreanize_matplotlib': 'koreanize_matplotlib',
     'psutil': 'psutil',
+    'pyarrow': 'pyarrow',  # 데이터 로딩 캐시 (없으면 매번 CSV 로딩)
 }
 
 missing_required = []
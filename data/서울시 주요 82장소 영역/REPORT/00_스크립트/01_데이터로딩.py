@@ -2,7 +2,7 @@
 """
 의원급 피부과 입지 분석 - 데이터 로딩 및 초기 설정
 작성일: 2026-02-03
-버전: 2.1 (UTF-8 인코딩 안정성 강화 - Go 클라이언트 호환)
+버전: 2.2 (파일 병렬 로딩 + 전처리 결과 캐시)
 """
 
 import pandas as pd
@@ -11,10 +11,12 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from matplotlib import font_manager, rc
 from math import pi
+import hashlib
 import os
 import sys
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
@@ -37,11 +39,12 @@ if sys.platform == 'win32':
 # 하트비트 파일 초기화
 # ============================================================================
 HEARTBEAT_FILE = Path('d:/git_rk/data/서울시 주요 82장소 영역/REPORT/heartbeat.txt')
+_heartbeat_lock = threading.Lock()  # 병렬 로딩 중 여러 스레드가 동시에 기록
 
 def write_heartbeat(message):
     """하트비트 파일에 상태 기록 (UTF-8 인코딩)"""
     try:
-        with open(HEARTBEAT_FILE, 'a', encoding='utf-8') as f:
+        with _heartbeat_lock, open(HEARTBEAT_FILE, 'a', encoding='utf-8') as f:
             timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             # 단순 문자열 기록 (이중 인코딩 제거)
             f.write(f"[{timestamp}] {message}\n")
@@ -98,6 +101,60 @@ def load_csv_with_retry(file_path, max_retries=3, encoding='utf-8'):
             else:
                 raise Exception(f"Max retry exceeded: {e}")
 
+# ============================================================================
+# 전처리 결과 캐시 (원본 CSV 내용 해시 기준)
+# ============================================================================
+CACHE_DIR = Path('d:/git_rk/data/서울시 주요 82장소 영역/REPORT/.cache')
+CACHE_VERSION = '1'     # preprocess_frame 로직을 바꾸면 올려서 기존 캐시 무효화
+LOAD_WORKERS = None     # 동시에 읽을 파일 수 (None이면 파일 수만큼)
+
+def file_digest(file_path, chunk_size=1 << 20):
+    """CSV 파일 내용 해시 (캐시 키)"""
+    h = hashlib.sha1(CACHE_VERSION.encode())
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()[:16]
+
+def preprocess_frame(df):
+    """기준_년분기_코드 → 년도/분기 컬럼 추가"""
+    if '기준_년분기_코드' in df.columns:
+        df['기준_년분기_코드'] = df['기준_년분기_코드'].astype(str)
+        df['년도'] = df['기준_년분기_코드'].str[:4].astype(int)
+        df['분기'] = df['기준_년분기_코드'].str[4:].astype(int)
+    return df
+
+def load_cached_frame(name, file_path, cache_dir=CACHE_DIR):
+    """
+    전처리된 DataFrame 로딩 (캐시가 있으면 Feather 파일, 없으면 CSV 로딩 + 전처리 후 캐시 저장)
+
+    Returns:
+    --------
+    (DataFrame, bool)
+        데이터, 캐시 사용 여부
+    """
+    cache_file = Path(cache_dir) / f"{name}_{file_digest(file_path)}.feather"
+    if cache_file.exists():
+        try:
+            return pd.read_feather(cache_file), True
+        except Exception:
+            pass  # 손상된 캐시는 다시 생성
+
+    df = preprocess_frame(load_csv_with_retry(file_path, max_retries=3))
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(cache_file.name + '.tmp')
+        df.to_feather(tmp_file)
+        os.replace(tmp_file, cache_file)
+        # 같은 데이터셋의 이전 버전 캐시 정리
+        for old in cache_file.parent.glob(f"{name}_*.feather"):
+            if old != cache_file:
+                old.unlink()
+    except Exception as e:
+        # 캐시 저장 실패(pyarrow 미설치 등)는 로딩 결과에 영향 없음
+        write_heartbeat(f"  Cache write skipped: {name} - {e}")
+    return df, False
+
 # ============================================================================
 # 데이터 로딩 함수
 # ============================================================================
@@ -136,48 +193,50 @@ def load_data():
     print(f"\n[3/4] 데이터 로딩 중 (총 {len(files_to_load)}개 파일)...", flush=True)
     write_heartbeat(f"STEP 3/4 - 데이터 로딩 시작 (총 {len(files_to_load)}개 파일)")
     
-    dataframes = {}
     total_start = time.time()
-    
-    for idx, (name, filename) in enumerate(files_to_load, 1):
+    total = len(files_to_load)
+
+    def load_one(idx, name, filename):
         file_start = time.time()
-        print(f"  [{idx}/{len(files_to_load)}] {name:15s} loading...", end=' ')
-        write_heartbeat(f"  File {idx}/{len(files_to_load)} loading: {name}")
-        
-        file_path = data_path / filename
-        
-        try:
-            # 재시도 로직으로 CSV 로딩
-            df = load_csv_with_retry(file_path, max_retries=3)
-            dataframes[name] = df
-            
-            file_elapsed = time.time() - file_start
-            print(f"OK ({df.shape[0]:,} rows, {df.shape[1]} cols, {file_elapsed:.1f}s)")
-            write_heartbeat(f"  File {idx}/{len(files_to_load)} loaded: {name} ({df.shape[0]:,} rows, {df.shape[1]} cols, {file_elapsed:.1f}s)")
-            
-        except Exception as e:
-            print(f"FAIL: {e}")
-            write_heartbeat(f"  File {idx}/{len(files_to_load)} failed: {name} - {e}")
-            raise Exception(f"File loading failed: {filename} - {e}")
-    
+        write_heartbeat(f"  File {idx}/{total} loading: {name}")
+        df, cached = load_cached_frame(name, data_path / filename)
+        file_elapsed = time.time() - file_start
+        source = 'cache' if cached else 'csv'
+        print(f"  [{idx}/{total}] {name:15s} OK ({df.shape[0]:,} rows, {df.shape[1]} cols, {source}, {file_elapsed:.1f}s)",
+              flush=True)
+        write_heartbeat(f"  File {idx}/{total} loaded: {name} ({df.shape[0]:,} rows, {df.shape[1]} cols, {source}, {file_elapsed:.1f}s)")
+        return df, cached
+
+    loaded = {}
+    with ThreadPoolExecutor(max_workers=LOAD_WORKERS or total) as executor:
+        futures = {
+            executor.submit(load_one, idx, name, filename): (idx, name, filename)
+            for idx, (name, filename) in enumerate(files_to_load, 1)
+        }
+        for future in as_completed(futures):
+            idx, name, filename = futures[future]
+            try:
+                loaded[name] = future.result()
+            except Exception as e:
+                print(f"  [{idx}/{total}] {name:15s} FAIL: {e}")
+                write_heartbeat(f"  File {idx}/{total} failed: {name} - {e}")
+                for other in futures:
+                    other.cancel()
+                raise Exception(f"File loading failed: {filename} - {e}")
+
+    # 원래 파일 순서 유지
+    dataframes = {name: loaded[name][0] for name, _ in files_to_load}
+    cache_hits = sum(1 for _, cached in loaded.values() if cached)
+
     total_elapsed = time.time() - total_start
-    print(f"\n  All files loaded (elapsed: {total_elapsed:.1f}s)")
-    write_heartbeat(f"STEP 3/4 - Data loading completed (total {total_elapsed:.1f}s)")
+    print(f"\n  All files loaded (elapsed: {total_elapsed:.1f}s, cache {cache_hits}/{total})")
+    write_heartbeat(f"STEP 3/4 - Data loading completed (total {total_elapsed:.1f}s, cache {cache_hits}/{total})")
 
-    # 전처리
+    # 전처리 (기준_년분기_코드 변환은 파일별 로딩 단계에서 수행, 캐시된 파일은 이미 변환됨)
     print("\n[4/4] Preprocessing (date conversion)...", end=' ')
     write_heartbeat("STEP 4/4 - Preprocessing started")
-    
-    preprocess_start = time.time()
-    for df in dataframes.values():
-        if '기준_년분기_코드' in df.columns:
-            df['기준_년분기_코드'] = df['기준_년분기_코드'].astype(str)
-            df['년도'] = df['기준_년분기_코드'].str[:4].astype(int)
-            df['분기'] = df['기준_년분기_코드'].str[4:].astype(int)
-    
-    preprocess_elapsed = time.time() - preprocess_start
-    print(f"OK ({preprocess_elapsed:.1f}s)")
-    write_heartbeat(f"STEP 4/4 - Preprocessing completed ({preprocess_elapsed:.1f}s)")
+    print(f"OK (done while loading, {total - cache_hits} files converted)")
+    write_heartbeat(f"STEP 4/4 - Preprocessing completed ({total - cache_hits} files converted)")
 
     return dataframes, output_base
 
@@ -2,194 +2,315 @@
 """
 의원급 피부과 입지 분석 - 전체 파이프라인 통합 실행
 작성일: 2026-02-03
-버전: 1.0
-설명: 데이터 로딩부터 최종 보고서 생성까지 전체 분석을 순차적으로 실행합니다.
+버전: 2.0 (단일 프로세스 데이터 로딩 + 분석 단계 병렬 실행)
+설명: 데이터를 한 번만 로딩한 뒤 Arrow IPC 파일로 공유하고, 서로 독립적인 분석 단계
+      (경쟁환경, 고객, 인구유동, 입지조건)는 별도 프로세스에서 동시에 실행합니다.
+      종합평가는 앞의 단계가 모두 끝난 뒤 실행하며, 단계별 소요 시간과 최대 메모리를
+      하트비트 파일과 REPORT/06_최종리포트/파이프라인_실행기록.csv에 기록합니다.
 """
 
-import sys
+import importlib.util
 import os
+import shutil
 import subprocess
-from datetime import datetime
+import sys
 import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
 
 # 현재 스크립트 디렉토리를 경로에 추가
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, current_dir)
 
-print("=" * 80)
-print("🏥 의원급 피부과 입지 분석 - 전체 파이프라인 실행")
-print("=" * 80)
-print(f"시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-print("=" * 80)
-
-# 전체 시작 시간 기록
-total_start_time = time.time()
-
 # ============================================================================
-# 사전 단계: 환경 진단
+# 파이프라인 단계 정의 (DAG)
 # ============================================================================
-print("\n" + "▶" * 40)
-print("🔍 [사전 단계] 환경 진단")
-print("▶" * 40)
-
-step_start = time.time()
-try:
-    import subprocess
-    result = subprocess.run(
-        [sys.executable, os.path.join(current_dir, '00_환경진단.py')],
-        capture_output=True,
-        text=True,
-        timeout=30,
-        encoding='utf-8'
-    )
-    
-    if result.returncode == 0:
-        print(result.stdout)
-        step_elapsed = time.time() - step_start
-        print(f"\n✅ 환경 진단 완료 (소요 시간: {step_elapsed:.1f}초)", flush=True)
-    else:
-        print(result.stdout)
-        print(result.stderr)
-        print(f"\n❌ 환경 진단 실패! 위 문제를 해결한 후 다시 실행하세요.", flush=True)
-        sys.exit(1)
-        
-except subprocess.TimeoutExpired:
-    print(f"\n⚠ 환경 진단 타임아웃 (30초 초과)", flush=True)
-    print("환경 진단을 건너뛰고 계속 진행합니다...", flush=True)
-except Exception as e:
-    print(f"\n⚠ 환경 진단 중 오류 발생: {e}", flush=True)
-    print("환경 진단을 건너뛰고 계속 진행합니다...", flush=True)
+# 각 단계 스크립트는 function(dataframes, output_base)를 제공해야 합니다.
+STAGES = [
+    {'key': '경쟁환경', 'title': '🏪 [단계 2/6] 경쟁 환경 분석',
+     'script': '02_경쟁환경분석.py', 'function': 'analyze_competition', 'depends': []},
+    {'key': '고객', 'title': '👥 [단계 3/6] 고객 및 매출 분석',
+     'script': '03_고객분석.py', 'function': 'analyze_customers', 'depends': []},
+    {'key': '인구유동', 'title': '🚶 [단계 4/6] 인구 및 유동량 분석',
+     'script': '04_인구유동분석.py', 'function': 'analyze_population', 'depends': []},
+    {'key': '입지조건', 'title': '📍 [단계 5/6] 입지 및 인프라 평가',
+     'script': '05_입지조건분석.py', 'function': 'analyze_location', 'depends': []},
+    {'key': '종합평가', 'title': '📊 [단계 6/6] 종합 평가 및 보고서 생성',
+     'script': '06_종합평가.py', 'function': 'evaluate_overall',
+     'depends': ['경쟁환경', '고객', '인구유동', '입지조건']},
+]
 
-# ============================================================================
-# 단계 1: 데이터 로딩 및 준비
-# ============================================================================
-print("\n" + "▶" * 40)
-print("📂 [단계 1/6] 데이터 로딩 및 준비")
-print("▶" * 40)
-
-step_start = time.time()
-STEP1_TIMEOUT = 180  # 3분 타임아웃
-
-try:
-    # 타임아웃을 위한 별도 프로세스 실행
-    import subprocess
-    
-    print("데이터 로딩 중... (최대 대기 시간: 180초)", flush=True)
-    result = subprocess.run(
-        [sys.executable, '-c', 
-         'import sys; sys.path.insert(0, r"' + current_dir + '"); '
-         'from 데이터로딩 import load_data; '
-         'dataframes, output_base = load_data(); '
-         'print("LOAD_SUCCESS")'],
-        capture_output=True,
-        text=True,
-        timeout=STEP1_TIMEOUT,
-        encoding='utf-8',
-        cwd=current_dir
-    )
-    
-    if "LOAD_SUCCESS" in result.stdout:
-        print(result.stdout)
-        # 실제 데이터 로딩 (이미 검증됨)
-        from 데이터로딩 import load_data
-        dataframes, output_base = load_data()
-        
-        step_elapsed = time.time() - step_start
-        print(f"\n✅ 단계 1 완료 (소요 시간: {step_elapsed:.1f}초)", flush=True)
-    else:
-        print(result.stdout)
-        print(result.stderr)
-        raise Exception("데이터 로딩 검증 실패")
-        
-except subprocess.TimeoutExpired:
-    print(f"\n❌ 단계 1 타임아웃 ({STEP1_TIMEOUT}초 초과)", flush=True)
-    print("오류 진단:", flush=True)
-    print("  1. heartbeat.txt 파일을 확인하여 어느 단계에서 멈췄는지 확인하세요.", flush=True)
-    print("  2. 메모리 부족 가능성: 다른 프로그램을 종료하고 재시도하세요.", flush=True)
-    print("  3. 데이터 파일 손상 가능성: 00_환경진단.py를 실행하여 파일을 확인하세요.", flush=True)
-    sys.exit(1)
-except Exception as e:
-    print(f"\n❌ 단계 1 실패: {e}", flush=True)
-    print("오류 상세:", flush=True)
-    import traceback
-    traceback.print_exc()
-    
-    # 복구 옵션 제시
-    print("\n💡 복구 옵션:", flush=True)
-    print("  1. 01_데이터로딩.py를 단독으로 실행하여 상세 오류 확인", flush=True)
-    print("  2. heartbeat.txt 파일을 확인하여 실패 지점 파악", flush=True)
-    print("  3. 환경진단_결과.txt 파일을 확인하여 환경 문제 확인", flush=True)
-    sys.exit(1)
+STAGE_WORKERS = 4           # 동시에 실행할 분석 단계 수
+ENV_CHECK_TIMEOUT = 30      # 환경 진단 타임아웃 (초)
+TIMINGS_FILE = '06_최종리포트/파이프라인_실행기록.csv'
 
 
-# ============================================================================
-# 단계 2: 경쟁 환경 분석
-# ============================================================================
-print("\n" + "▶" * 40)
-print("🏪 [단계 2/6] 경쟁 환경 분석")
-print("▶" * 40)
-print("⚠ 아직 구현되지 않은 모듈입니다.", flush=True)
-print("→ 02_경쟁환경분석.py 스크립트를 생성하여 실행하세요.", flush=True)
-
-# step_start = time.time()
-# try:
-#     from 경쟁환경분석 import analyze_competition
-#     analyze_competition(dataframes, output_base)
-#     step_elapsed = time.time() - step_start
-#     print(f"\n✅ 단계 2 완료 (소요 시간: {step_elapsed:.1f}초)", flush=True)
-# except Exception as e:
-#     print(f"\n❌ 단계 2 실패: {e}", flush=True)
-#     sys.exit(1)
+def load_module(filename):
+    """숫자로 시작하는 스크립트 파일(예: 01_데이터로딩.py)을 모듈로 로딩"""
+    path = os.path.join(current_dir, filename)
+    spec = importlib.util.spec_from_file_location(Path(filename).stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
 
-# ============================================================================
-# 단계 3: 고객 및 매출 분석
-# ============================================================================
-print("\n" + "▶" * 40)
-print("👥 [단계 3/6] 고객 및 매출 분석")
-print("▶" * 40)
-print("⚠ 아직 구현되지 않은 모듈입니다.", flush=True)
-print("→ 03_고객분석.py 스크립트를 생성하여 실행하세요.", flush=True)
 
-# ============================================================================
-# 단계 4: 인구 및 유동량 분석
-# ============================================================================
-print("\n" + "▶" * 40)
-print("🚶 [단계 4/6] 인구 및 유동량 분석")
-print("▶" * 40)
-print("⚠ 아직 구현되지 않은 모듈입니다.", flush=True)
-print("→ 04_인구유동분석.py 스크립트를 생성하여 실행하세요.", flush=True)
+def peak_memory_mb():
+    """현재 프로세스의 최대 메모리 사용량 (MB), 측정할 수 없으면 None"""
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        # Windows는 peak_wset 제공, 그 외에는 resource 모듈로 측정
+        if hasattr(info, 'peak_wset'):
+            return info.peak_wset / (1024 ** 2)
+    except ImportError:
+        pass
+    try:
+        import resource
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss / (1024 ** 2) if sys.platform == 'darwin' else maxrss / 1024
+    except ImportError:
+        return None
+
 
 # ============================================================================
-# 단계 5: 입지 및 인프라 평가
+# 공유 데이터 (Arrow IPC)
 # ============================================================================
-print("\n" + "▶" * 40)
-print("📍 [단계 5/6] 입지 및 인프라 평가")
-print("▶" * 40)
-print("⚠ 아직 구현되지 않은 모듈입니다.", flush=True)
-print("→ 05_입지조건분석.py 스크립트를 생성하여 실행하세요.", flush=True)
+def share_dataframes(dataframes, share_dir):
+    """DataFrame을 비압축 Arrow IPC(Feather) 파일로 저장 (작업 프로세스에서 메모리 맵으로 읽음)"""
+    share_dir = Path(share_dir)
+    if share_dir.exists():
+        shutil.rmtree(share_dir)
+    share_dir.mkdir(parents=True)
+    for name, df in dataframes.items():
+        df.to_feather(share_dir / f"{name}.arrow", compression='uncompressed')
+    return share_dir
+
+
+def read_shared_dataframes(share_dir):
+    import pyarrow.feather as feather
+    return {
+        path.stem: feather.read_table(path, memory_map=True).to_pandas()
+        for path in sorted(Path(share_dir).glob('*.arrow'))
+    }
+
+
+def run_stage(script, function, share_dir, output_base):
+    """
+    작업 프로세스에서 분석 단계 하나를 실행
+
+    Returns:
+    --------
+    dict
+        elapsed, peak_mb
+    """
+    os.environ.setdefault('MPLBACKEND', 'Agg')  # 작업 프로세스에서는 창 없이 그림 저장
+    sys.path.insert(0, current_dir)
+    start = time.time()
+    dataframes = read_shared_dataframes(share_dir)
+    module = load_module(script)
+    getattr(module, function)(dataframes, Path(output_base))
+    return {'elapsed': time.time() - start, 'peak_mb': peak_memory_mb()}
+
 
 # ============================================================================
-# 단계 6: 종합 평가 및 보고서 생성
+# DAG 실행
 # ============================================================================
-print("\n" + "▶" * 40)
-print("📊 [단계 6/6] 종합 평가 및 보고서 생성")
-print("▶" * 40)
-print("⚠ 아직 구현되지 않은 모듈입니다.", flush=True)
-print("→ 06_종합평가.py 스크립트를 생성하여 실행하세요.", flush=True)
+def run_pipeline(stages, share_dir, output_base, heartbeat, workers=STAGE_WORKERS):
+    """
+    의존성이 충족된 단계부터 프로세스 풀에 제출하여 실행
+
+    구현되지 않은 단계(스크립트 없음)는 건너뛰고 후속 단계는 계속 실행하며,
+    실패한 단계에 의존하는 단계는 실행하지 않습니다.
+
+    Returns:
+    --------
+    list
+        단계별 실행 기록 (key, status, elapsed, peak_mb, error)
+    """
+    records = {}
+    pending = list(stages)
+
+    def record(stage, status, elapsed=None, peak_mb=None, error=''):
+        records[stage['key']] = {'key': stage['key'], 'status': status, 'elapsed': elapsed,
+                                 'peak_mb': peak_mb, 'error': error}
+        memory = f", peak {peak_mb:.0f}MB" if peak_mb is not None else ''
+        timing = f" ({elapsed:.1f}s{memory})" if elapsed is not None else ''
+        heartbeat(f"STAGE {stage['key']} - {status}{timing}{' - ' + error if error else ''}")
+
+    try:
+        executor = ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1)
+    except TypeError:
+        # Python 3.10 이하: 프로세스가 재사용되어 최대 메모리는 여러 단계의 최대값일 수 있음
+        executor = ProcessPoolExecutor(max_workers=workers)
+
+    running = {}
+    with executor:
+        while pending or running:
+            for stage in list(pending):
+                deps = [records.get(d, {}).get('status') for d in stage['depends']]
+                if any(s is None for s in deps):
+                    continue
+                pending.remove(stage)
+                print("\n" + "▶" * 40)
+                print(stage['title'])
+                print("▶" * 40)
+                failed = [d for d, s in zip(stage['depends'], deps) if s in ('실패', '중단')]
+                if failed:
+                    print(f"⚠ 선행 단계 실패로 건너뜁니다: {failed}", flush=True)
+                    record(stage, '중단', error='선행 단계 실패')
+                elif not os.path.exists(os.path.join(current_dir, stage['script'])):
+                    print("⚠ 아직 구현되지 않은 모듈입니다.", flush=True)
+                    print(f"→ {stage['script']} 스크립트를 생성하여 실행하세요.", flush=True)
+                    record(stage, '미구현')
+                else:
+                    print(f"실행 시작 ({stage['script']})", flush=True)
+                    heartbeat(f"STAGE {stage['key']} - 시작")
+                    future = executor.submit(run_stage, stage['script'], stage['function'],
+                                             str(share_dir), str(output_base))
+                    running[future] = stage
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                try:
+                    result = future.result()
+                    print(f"\n✅ {stage['key']} 완료 (소요 시간: {result['elapsed']:.1f}초)", flush=True)
+                    record(stage, '완료', result['elapsed'], result['peak_mb'])
+                except Exception as e:
+                    print(f"\n❌ {stage['key']} 실패: {e}", flush=True)
+                    record(stage, '실패', error=str(e))
+
+    return [records[stage['key']] for stage in stages]
+
+
+def save_timings(records, output_base):
+    import pandas as pd
+    path = Path(output_base) / TIMINGS_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(records).to_csv(path, index=False, encoding='utf-8-sig')
+    return path
+
 
 # ============================================================================
-# 전체 실행 완료
+# 사전 단계: 환경 진단
 # ============================================================================
-total_elapsed = time.time() - total_start_time
-print("\n" + "=" * 80)
-print("🎉 전체 파이프라인 실행 완료!")
-print("=" * 80)
-print(f"총 소요 시간: {total_elapsed:.1f}초 ({total_elapsed/60:.1f}분)")
-print(f"종료 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-print(f"산출물 저장 경로: {output_base}")
-print("=" * 80)
-print("\n💡 다음 단계:")
-print("  1. REPORT/ 디렉토리의 각 폴더에서 생성된 CSV 및 PNG 파일 확인")
-print("  2. 06_최종리포트/ 폴더의 종합 보고서 검토")
-print("  3. 추천 상권 Top 3 기반으로 현장 실사 계획 수립")
-print()
+def check_environment():
+    print("\n" + "▶" * 40)
+    print("🔍 [사전 단계] 환경 진단")
+    print("▶" * 40)
+
+    step_start = time.time()
+    try:
+        result = subprocess.run(
+            [sys.executable, os.path.join(current_dir, '00_환경진단.py')],
+            capture_output=True,
+            text=True,
+            timeout=ENV_CHECK_TIMEOUT,
+            encoding='utf-8'
+        )
+
+        if result.returncode == 0:
+            print(result.stdout)
+            step_elapsed = time.time() - step_start
+            print(f"\n✅ 환경 진단 완료 (소요 시간: {step_elapsed:.1f}초)", flush=True)
+        else:
+            print(result.stdout)
+            print(result.stderr)
+            print(f"\n❌ 환경 진단 실패! 위 문제를 해결한 후 다시 실행하세요.", flush=True)
+            sys.exit(1)
+
+    except subprocess.TimeoutExpired:
+        print(f"\n⚠ 환경 진단 타임아웃 ({ENV_CHECK_TIMEOUT}초 초과)", flush=True)
+        print("환경 진단을 건너뛰고 계속 진행합니다...", flush=True)
+    except Exception as e:
+        print(f"\n⚠ 환경 진단 중 오류 발생: {e}", flush=True)
+        print("환경 진단을 건너뛰고 계속 진행합니다...", flush=True)
+
+
+def main():
+    print("=" * 80)
+    print("🏥 의원급 피부과 입지 분석 - 전체 파이프라인 실행")
+    print("=" * 80)
+    print(f"시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("=" * 80)
+
+    # 전체 시작 시간 기록
+    total_start_time = time.time()
+
+    check_environment()
+
+    # ========================================================================
+    # 단계 1: 데이터 로딩 및 준비 (이 프로세스에서 한 번만)
+    # ========================================================================
+    print("\n" + "▶" * 40)
+    print("📂 [단계 1/6] 데이터 로딩 및 준비")
+    print("▶" * 40)
+
+    step_start = time.time()
+    try:
+        loader = load_module('01_데이터로딩.py')
+        dataframes, output_base = loader.load_data()
+        share_dir = share_dataframes(dataframes, loader.CACHE_DIR / 'pipeline_shared')
+        step_elapsed = time.time() - step_start
+        peak = peak_memory_mb()
+        loader.write_heartbeat(f"STAGE 데이터로딩 - 완료 ({step_elapsed:.1f}s"
+                               f"{f', peak {peak:.0f}MB' if peak is not None else ''})")
+        print(f"\n✅ 단계 1 완료 (소요 시간: {step_elapsed:.1f}초)", flush=True)
+    except Exception as e:
+        print(f"\n❌ 단계 1 실패: {e}", flush=True)
+        print("오류 상세:", flush=True)
+        import traceback
+        traceback.print_exc()
+
+        # 복구 옵션 제시
+        print("\n💡 복구 옵션:", flush=True)
+        print("  1. 01_데이터로딩.py를 단독으로 실행하여 상세 오류 확인", flush=True)
+        print("  2. heartbeat.txt 파일을 확인하여 실패 지점 파악", flush=True)
+        print("  3. 환경진단_결과.txt 파일을 확인하여 환경 문제 확인", flush=True)
+        sys.exit(1)
+
+    records = [{'key': '데이터로딩', 'status': '완료', 'elapsed': step_elapsed,
+                'peak_mb': peak, 'error': ''}]
+
+    # ========================================================================
+    # 단계 2~6: 분석 단계 (DAG)
+    # ========================================================================
+    records += run_pipeline(STAGES, share_dir, output_base, loader.write_heartbeat)
+    timings_path = save_timings(records, output_base)
+    shutil.rmtree(share_dir, ignore_errors=True)
+
+    # ========================================================================
+    # 전체 실행 완료
+    # ========================================================================
+    total_elapsed = time.time() - total_start_time
+    failed = [r['key'] for r in records if r['status'] in ('실패', '중단')]
+    print("\n" + "=" * 80)
+    print("🎉 전체 파이프라인 실행 완료!" if not failed else f"⚠ 파이프라인 실행 완료 (실패/중단: {failed})")
+    print("=" * 80)
+    print(f"{'단계':10s} {'상태':6s} {'소요(초)':>9s} {'최대메모리(MB)':>15s}")
+    for r in records:
+        elapsed = f"{r['elapsed']:.1f}" if r['elapsed'] is not None else '-'
+        peak_mb = f"{r['peak_mb']:.0f}" if r['peak_mb'] is not None else '-'
+        print(f"{r['key']:10s} {r['status']:6s} {elapsed:>9s} {peak_mb:>15s}")
+    print("-" * 80)
+    print(f"총 소요 시간: {total_elapsed:.1f}초 ({total_elapsed/60:.1f}분)")
+    print(f"종료 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"산출물 저장 경로: {output_base}")
+    print(f"실행 기록: {timings_path}")
+    print("=" * 80)
+    print("\n💡 다음 단계:")
+    print("  1. REPORT/ 디렉토리의 각 폴더에서 생성된 CSV 및 PNG 파일 확인")
+    print("  2. 06_최종리포트/ 폴더의 종합 보고서 검토")
+    print("  3. 추천 상권 Top 3 기반으로 현장 실사 계획 수립")
+    print()
+    loader.write_heartbeat(f"PIPELINE - 완료 ({total_elapsed:.1f}s)")
+    if failed:
+        sys.exit(1)
+
+
+# 분석 단계를 프로세스 풀에서 실행하므로 Windows에서는 반드시 이 블록 안에서 실행
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+Unified 종별코드명 + keyword extraction for the HIRA hospital CSV.
+
+Replaces the separate extract_* scripts with one command and selectable engines:
+    csv      pure-Python csv streaming (no dependencies)
+    pandas   chunked, column-wise vectorised filter (keyword_filter.py)
+    pyarrow  multithreaded Arrow CSV reader with compute kernels
+    duckdb   one SQL scan (UTF-8 sources only)
+
+Examples:
+    python extract_cli.py
+    python extract_cli.py data.csv -o out.csv --engine pyarrow --keywords 피부,피부과
+    python extract_cli.py data.csv --benchmark
+    python extract_cli.py data.csv --engine csv --errors replace   # keep going past undecodable bytes
+"""
+
+import argparse
+import codecs
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from keyword_filter import (DEFAULT_KEYWORDS, DEFAULT_TYPES, TYPE_COLUMN, detect_encoding,
+                            keyword_pattern, stream_filter_csv)
+
+DEFAULT_SOURCE = r'd:\git_rk\data\seoul hospital\HIRA_강남언니_결합_최종.csv'
+DEFAULT_OUTPUT = r'd:\git_rk\data\seoul hospital\seoul_extraction.csv'
+ENGINES = ['csv', 'pandas', 'pyarrow', 'duckdb']
+DECODE_ERRORS = ['strict', 'replace', 'ignore']  # how undecodable source bytes are handled
+PROGRESS_EVERY = 50000  # rows between progress lines for the row-streaming engines
+
+
+class ProgressReporter:
+    """Prints processed/extracted counts with rows/sec, optionally mirrored to a log file."""
+
+    def __init__(self, log_path=None):
+        self.started = time.perf_counter()
+        self.log_path = log_path
+
+    def message(self, text):
+        print(text)
+        if self.log_path:
+            with open(self.log_path, 'a', encoding='utf-8') as log:
+                log.write(text + '\n')
+
+    def __call__(self, processed, extracted):
+        elapsed = time.perf_counter() - self.started
+        rate = processed / elapsed if elapsed > 0 else 0
+        self.message(f"Processed {processed:,} rows, Found {extracted:,} so far ({rate:,.0f} rows/sec)")
+
+
+def _header(source_path, encoding, errors='strict'):
+    with open(source_path, 'r', encoding=encoding, errors=errors, newline='') as f:
+        return next(csv.reader(f))
+
+
+def _check_columns(header, type_column, text_columns):
+    missing = [c for c in [type_column] + list(text_columns or []) if c not in header]
+    if missing:
+        raise KeyError(f"Columns not found: {missing}")
+
+
+def extract_csv(source_path, output_path, allowed_types, keywords, type_column, text_columns,
+                encoding, chunksize, progress, errors='strict'):
+    """Pure-Python engine: csv.reader line by line."""
+    allowed_types = set(allowed_types)
+    processed = 0
+    extracted = 0
+    with open(source_path, 'r', encoding=encoding, errors=errors, newline='') as fin, \
+         open(output_path, 'w', encoding='utf-8-sig', newline='') as fout:
+        reader = csv.reader(fin)
+        header = next(reader)
+        _check_columns(header, type_column, text_columns)
+        type_idx = header.index(type_column)
+        text_idx = [header.index(c) for c in text_columns] if text_columns else None
+
+        writer = csv.writer(fout, lineterminator='\n')
+        writer.writerow(header)
+        for row in reader:
+            processed += 1
+            if len(row) > type_idx and row[type_idx] in allowed_types:
+                fields = [row[i] for i in text_idx if i < len(row)] if text_idx else row
+                if any(k in field for field in fields for k in keywords):
+                    writer.writerow(row)
+                    extracted += 1
+            if processed % PROGRESS_EVERY == 0:
+                progress(processed, extracted)
+    progress(processed, extracted)
+    return processed, extracted
+
+
+def extract_pandas(source_path, output_path, allowed_types, keywords, type_column, text_columns,
+                   encoding, chunksize, progress, errors='strict'):
+    """Chunked pandas engine with column-wise vectorised matching."""
+    return stream_filter_csv(source_path, output_path, allowed_types, keywords, type_column,
+                             text_columns, encoding, chunksize, progress=progress, errors=errors)
+
+
+def extract_pyarrow(source_path, output_path, allowed_types, keywords, type_column, text_columns,
+                    encoding, chunksize, progress, errors='strict'):
+    """Arrow engine: streaming multithreaded reader, is_in + match_substring_regex kernels."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+
+    header = _header(source_path, encoding, errors)
+    _check_columns(header, type_column, text_columns)
+    search_columns = list(text_columns) if text_columns else header
+    pattern = keyword_pattern(keywords)
+    value_set = pa.array(list(allowed_types), type=pa.string())
+
+    if errors == 'strict':
+        source = source_path
+        read_encoding = 'utf8' if encoding.replace('-', '').lower().startswith('utf8') else encoding
+    else:
+        # Arrow always decodes strictly: recode to UTF-8 in Python with the requested error handler
+        source = codecs.EncodedFile(open(source_path, 'rb'), 'utf-8', encoding, errors)
+        read_encoding = 'utf8'
+
+    reader = pa_csv.open_csv(
+        source,
+        read_options=pa_csv.ReadOptions(encoding=read_encoding, block_size=1 << 24),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.string() for name in header},
+            strings_can_be_null=False,
+            quoted_strings_can_be_null=False
+        )
+    )
+
+    processed = 0
+    extracted = 0
+    with open(output_path, 'wb') as fout:
+        fout.write(b'\xef\xbb\xbf')
+        writer = pa_csv.CSVWriter(fout, reader.schema)
+        for batch in reader:
+            mask = pc.is_in(batch.column(type_column), value_set=value_set)
+            if pc.any(mask).as_py():
+                keyword_mask = None
+                for name in search_columns:
+                    hit = pc.match_substring_regex(batch.column(name), pattern)
+                    keyword_mask = hit if keyword_mask is None else pc.or_(keyword_mask, hit)
+                mask = pc.and_(mask, keyword_mask)
+                matched = batch.filter(mask)
+                if matched.num_rows:
+                    writer.write_batch(matched)
+                extracted += matched.num_rows
+            processed += batch.num_rows
+            progress(processed, extracted)
+        writer.close()
+    if source is not source_path:
+        source.close()
+    return processed, extracted
+
+
+def extract_duckdb(source_path, output_path, allowed_types, keywords, type_column, text_columns,
+                   encoding, chunksize, progress, errors='strict'):
+    """DuckDB engine: a single parallel scan, COPY of the matching rows."""
+    import duckdb
+
+    if not encoding.replace('-', '').lower().startswith('utf8'):
+        raise ValueError(f"duckdb engine reads UTF-8 only (source is {encoding}); "
+                         f"convert it first with csv_transcoder.py (convert_csv_to_utf8.py) or use another engine")
+    if errors != 'strict':
+        raise ValueError(f"duckdb engine decodes strictly (errors={errors!r} needs the csv, pandas or pyarrow engine)")
+
+    header = _header(source_path, encoding)
+    _check_columns(header, type_column, text_columns)
+    search_columns = list(text_columns) if text_columns else header
+
+    def ident(name):
+        return '"' + name.replace('"', '""') + '"'
+
+    keyword_sql = ' OR '.join(f"contains({ident(c)}, ?)" for c in search_columns for _ in keywords)
+    type_sql = ', '.join('?' for _ in allowed_types)
+    where = f"{ident(type_column)} IN ({type_sql}) AND ({keyword_sql})"
+    params = list(allowed_types) + [k for _ in search_columns for k in keywords]
+    scan = "read_csv(?, header = true, all_varchar = true)"
+
+    con = duckdb.connect()
+    try:
+        processed = con.execute(f"SELECT count(*) FROM {scan}", [source_path]).fetchone()[0]
+
+        # DuckDB does not write a BOM: COPY to a temp file, then prepend it while copying
+        fd, tmp_path = tempfile.mkstemp(suffix='.csv', dir=os.path.dirname(os.path.abspath(output_path)))
+        os.close(fd)
+        try:
+            # COPY returns the number of rows written
+            extracted = con.execute(
+                f"COPY (SELECT * FROM {scan} WHERE {where}) TO '{tmp_path.replace(chr(39), chr(39) * 2)}' "
+                f"(HEADER, DELIMITER ',')",
+                [source_path] + params
+            ).fetchone()[0]
+            with open(tmp_path, 'rb') as fin, open(output_path, 'wb') as fout:
+                fout.write(b'\xef\xbb\xbf')
+                shutil.copyfileobj(fin, fout, 1 << 20)
+        finally:
+            os.remove(tmp_path)
+    finally:
+        con.close()
+
+    progress(processed, extracted)
+    return processed, extracted
+
+
+EXTRACTORS = {
+    'csv': extract_csv,
+    'pandas': extract_pandas,
+    'pyarrow': extract_pyarrow,
+    'duckdb': extract_duckdb,
+}
+
+
+def run_extraction(source_path=DEFAULT_SOURCE, output_path=DEFAULT_OUTPUT, engine='pandas',
+                   allowed_types=DEFAULT_TYPES, keywords=DEFAULT_KEYWORDS, type_column=TYPE_COLUMN,
+                   text_columns=None, encoding=None, chunksize=50000, log_path=None, errors='strict'):
+    """
+    Extract rows whose type_column is in allowed_types and that contain any keyword.
+
+    errors is the codec error handler for the source ('strict' aborts on an undecodable byte,
+    'replace' / 'ignore' keep going).
+    Returns (rows processed, rows extracted, seconds).
+    """
+    if not os.path.exists(source_path):
+        raise FileNotFoundError(f"Source not found: {source_path}")
+    if encoding is None:
+        encoding = detect_encoding(source_path)
+
+    progress = ProgressReporter(log_path)
+    progress.message(f"[{engine}] {source_path} -> {output_path} (encoding {encoding}, errors {errors})")
+    processed, extracted = EXTRACTORS[engine](
+        source_path, output_path, list(allowed_types), list(keywords), type_column,
+        text_columns, encoding, chunksize, progress, errors=errors
+    )
+    elapsed = time.perf_counter() - progress.started
+    progress.message(f"[{engine}] Finished. Total rows: {processed:,}, Matches: {extracted:,} "
+                     f"in {elapsed:.2f}s ({processed / elapsed if elapsed > 0 else 0:,.0f} rows/sec)")
+    progress.message(f"Saved to: {output_path}")
+    return processed, extracted, elapsed
+
+
+def run_benchmark(source_path, output_path, engines=ENGINES, **options):
+    """Time each engine on the same input; outputs go next to output_path as <name>.<engine>.csv."""
+    base, ext = os.path.splitext(output_path)
+    results = []
+    for engine in engines:
+        engine_output = f"{base}.{engine}{ext or '.csv'}"
+        try:
+            processed, extracted, elapsed = run_extraction(source_path, engine_output, engine=engine, **options)
+            results.append((engine, processed, extracted, elapsed, ''))
+        except (ImportError, ValueError) as e:
+            results.append((engine, None, None, None, str(e)))
+        print()
+
+    print(f"{'engine':<8} {'seconds':>9} {'rows/sec':>12} {'matches':>9}")
+    for engine, processed, extracted, elapsed, note in results:
+        if elapsed is None:
+            print(f"{engine:<8} {'skipped':>9}  {note}")
+        else:
+            rate = processed / elapsed if elapsed > 0 else 0
+            print(f"{engine:<8} {elapsed:>9.2f} {rate:>12,.0f} {extracted:>9,}")
+
+    counts = {extracted for _, _, extracted, elapsed, _ in results if elapsed is not None}
+    if len(counts) > 1:
+        print("WARNING: engines disagree on the number of matches")
+    return results
+
+
+def _split(value):
+    return [v.strip() for v in value.split(',') if v.strip()] if value else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract hospitals by 종별코드명 and keyword from a CSV file")
+    parser.add_argument('source', nargs='?', default=DEFAULT_SOURCE, help="Source CSV file")
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT, help="Output CSV file (UTF-8 with BOM)")
+    parser.add_argument('--engine', choices=ENGINES, default='pandas', help="Extraction engine (default: pandas)")
+    parser.add_argument('--types', default=','.join(DEFAULT_TYPES), help="Comma-separated allowed 종별코드명 values")
+    parser.add_argument('--keywords', default=','.join(DEFAULT_KEYWORDS), help="Comma-separated keywords (any match)")
+    parser.add_argument('--type-column', default=TYPE_COLUMN, help="Column holding the hospital type")
+    parser.add_argument('--columns', help="Comma-separated text columns to search (default: all columns)")
+    parser.add_argument('--encoding', help="Source encoding (default: detect utf-8-sig / cp949 / euc-kr)")
+    parser.add_argument('--errors', choices=DECODE_ERRORS, default='strict',
+                        help="Undecodable source bytes: abort (strict, default), replace with U+FFFD, or ignore")
+    parser.add_argument('--chunksize', type=int, default=50000, help="Rows per chunk for the pandas engine")
+    parser.add_argument('--log', help="Also append progress lines to this file")
+    parser.add_argument('--benchmark', action='store_true', help="Run every engine on the same input and compare")
+    parser.add_argument('--engines', default=','.join(ENGINES), help="Engines to include in --benchmark")
+    args = parser.parse_args(argv)
+
+    options = dict(
+        allowed_types=_split(args.types),
+        keywords=_split(args.keywords),
+        type_column=args.type_column,
+        text_columns=_split(args.columns),
+        encoding=args.encoding,
+        chunksize=args.chunksize,
+        log_path=args.log,
+        errors=args.errors,
+    )
+
+    if args.benchmark:
+        run_benchmark(args.source, args.output, engines=_split(args.engines), **options)
+    else:
+        run_extraction(args.source, args.output, engine=args.engine, **options)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
@@ -1,4 +1,4 @@
-import os
+from extract_cli import run_extraction
 
 def primitive_extract():
     source = r'd:\git_rk\data\seoul hospital\HIRA_강남언니_결합_최종.csv'
@@ -9,26 +9,10 @@ def primitive_extract():
     # Hospital types
     types = ['의원', '병원', '종합병원', '상급종합']
     
+    # Pure csv engine of extract_cli.py (matches on the 종별코드명 column instead of anywhere in the line)
     try:
-        # Detect encoding
-        encoding = 'cp949'
-        with open(source, 'r', encoding=encoding, errors='ignore') as f:
-            header = f.readline()
-        
-        with open(source, 'r', encoding=encoding, errors='ignore') as fin, \
-             open(output, 'w', encoding='utf-8-sig', newline='') as fout:
-            
-            header = fin.readline()
-            fout.write(header)
-            
-            count = 0
-            for line in fin:
-                # Basic line filter
-                if any(k in line for k in keywords) and any(t in line for t in types):
-                    fout.write(line)
-                    count += 1
-                
-        print(f"Extracted {count} rows.")
+        # errors='ignore': undecodable bytes are dropped instead of aborting the run
+        run_extraction(source, output, engine='csv', allowed_types=types, keywords=keywords, errors='ignore')
     except Exception as e:
         print(f"Error: {e}")
 
@@ -0,0 +1,79 @@
+import re
+
+import pandas as pd
+
+from csv_transcoder import detect_encoding
+
+# Defaults used by the extract_* scripts
+TYPE_COLUMN = '종별코드명'
+DEFAULT_TYPES = ["의원", "병원", "종합병원", "상급종합병원"]
+DEFAULT_KEYWORDS = ['피부']
+
+
+def keyword_pattern(keywords):
+    return '|'.join(re.escape(k) for k in keywords)
+
+
+def keyword_mask(df, keywords, columns=None):
+    """
+    Column-wise vectorised "any column contains any keyword" mask.
+
+    columns limits the search to the given text columns (default: every column).
+    """
+    pattern = keyword_pattern(keywords)
+    mask = pd.Series(False, index=df.index)
+    for col in (columns if columns is not None else df.columns):
+        values = df[col]
+        if not pd.api.types.is_string_dtype(values):
+            values = values.astype(str)
+        mask |= values.str.contains(pattern, regex=True, na=False)
+    return mask
+
+
+def filter_frame(df, allowed_types, keywords, type_column=TYPE_COLUMN, text_columns=None):
+    """Rows whose type is in allowed_types and that contain any keyword."""
+    typed = df[df[type_column].isin(allowed_types)]
+    if typed.empty:
+        return typed
+    # Keyword search only runs on rows that already passed the (cheap) type filter
+    return typed[keyword_mask(typed, keywords, text_columns)]
+
+
+def stream_filter_csv(source_path, output_path, allowed_types=DEFAULT_TYPES, keywords=DEFAULT_KEYWORDS,
+                      type_column=TYPE_COLUMN, text_columns=None, encoding=None, chunksize=50000,
+                      progress=None, errors='strict'):
+    """
+    Stream source_path in chunks and append matching rows to output_path (UTF-8 with BOM).
+
+    Cells are read as text so matched rows are written back exactly as they appear in the source.
+    errors is the codec error handler for undecodable bytes ('strict', 'replace' or 'ignore').
+    progress(processed, extracted) is called after every chunk (default: print).
+    Returns (rows processed, rows extracted).
+    """
+    if encoding is None:
+        encoding = detect_encoding(source_path)
+    print(f"Filtering {source_path} (encoding {encoding}, types {allowed_types}, keywords {keywords})")
+
+    total_processed = 0
+    total_extracted = 0
+    with open(output_path, 'w', encoding='utf-8-sig', newline='') as out:
+        reader = pd.read_csv(source_path, encoding=encoding, encoding_errors=errors, chunksize=chunksize,
+                             dtype=str, keep_default_na=False)
+        for i, chunk in enumerate(reader):
+            if i == 0:
+                missing = [c for c in [type_column] + list(text_columns or []) if c not in chunk.columns]
+                if missing:
+                    raise KeyError(f"Columns not found in {source_path}: {missing}")
+                chunk.iloc[:0].to_csv(out, index=False)
+
+            matched = filter_frame(chunk, allowed_types, keywords, type_column, text_columns)
+            if not matched.empty:
+                matched.to_csv(out, index=False, header=False)
+            total_processed += len(chunk)
+            total_extracted += len(matched)
+            if progress is not None:
+                progress(total_processed, total_extracted)
+            else:
+                print(f"Processed {total_processed} rows, Found {total_extracted} so far...")
+
+    return total_processed, total_extracted
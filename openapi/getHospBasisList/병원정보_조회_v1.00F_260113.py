@@ -7,14 +7,25 @@
 ================================================================================
 """
 
-import requests
 import json
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import pandas as pd
 from datetime import datetime
 import time
 import os
+import math
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
+import sys
+
+# 공용 HTTP 클라이언트 (openapi/hira_client.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from hira_client import HiraClient, get_default_client
+from hira_checkpoint import CheckpointLog
+from hira_cache import get_default_cache
+from hira_sink import BASIS_FIELD_TYPES, HiraParquetSink, parquet_to_excel
+from hira_registry import HospitalRegistry
 
 # ============================================================================
 # 설정 (Configuration)
@@ -43,6 +54,17 @@ READ_TIMEOUT = 60        # 읽기 타임아웃 (초)
 ENABLE_CHECKPOINT = True # 진행상황 저장 활성화
 CHECKPOINT_INTERVAL = 5  # 체크포인트 저장 간격 (페이지 단위)
 
+# 동시 조회 설정
+MAX_WORKERS = 4          # 동시에 조회할 최대 페이지 수 (1이면 순차 조회)
+RATE_LIMIT_PER_SEC = 10  # 초당 최대 API 호출 수 (0이면 제한 없음)
+
+# 저장 설정 (결과는 항상 Parquet으로 저장)
+SAVE_CSV = False         # Parquet과 함께 CSV도 저장
+SAVE_EXCEL = False       # Parquet 저장 후 엑셀 파일도 생성 (대용량에서는 느림)
+
+# 증분 동기화 설정 (openapi/hira_registry.py)
+SYNC_REGISTRY = True     # 조회 결과를 ykiho 기준 마스터 테이블과 비교하여 신규/변경/폐업 기록
+
 # 지역 코드 (시도/시군구)
 SIDO_CODES = {
     '서울': '110000',
@@ -151,7 +173,10 @@ def get_hospital_list(
     page_no: int = 1,
     num_of_rows: int = 100,
     max_retries: int = MAX_RETRIES,
-    retry_delay: int = RETRY_DELAY
+    retry_delay: int = RETRY_DELAY,
+    client: Optional[HiraClient] = None,
+    rate_limiter: Optional["RateLimiter"] = None,
+    refresh: bool = False
 ) -> Dict:
     """
     병원정보 API 호출 함수 (재시도 로직 포함)
@@ -183,6 +208,12 @@ def get_hospital_list(
         최대 재시도 횟수 (기본값: 3)
     retry_delay : int
         초기 재시도 대기 시간 (기본값: 1초)
+    client : HiraClient, optional
+        HTTP 클라이언트 (None이면 공용 기본 클라이언트 사용)
+    rate_limiter : RateLimiter, optional
+        호출 속도 제한기 (캐시 미적중으로 실제 API를 호출할 때만 대기)
+    refresh : bool
+        True이면 응답 캐시를 건너뛰고 API를 호출 (캐시는 새 응답으로 갱신)
     
     Returns:
     --------
@@ -225,120 +256,186 @@ def get_hospital_list(
     if dgsbj_cd:
         params['dgsbjtCd'] = dgsbj_cd
     
-    # 재시도 로직
-    last_exception = None
-    for attempt in range(max_retries + 1):
-        try:
-            if attempt > 0:
-                wait_time = retry_delay * (2 ** (attempt - 1))  # 지수 백오프
-                print(f"[재시도 {attempt}/{max_retries}] {wait_time}초 대기 중...")
-                time.sleep(wait_time)
-            
-            # API 호출
-            if attempt == 0:
-                print(f"[API 호출] 페이지: {page_no}, 결과 수: {num_of_rows}")
-            
-            response = requests.get(
-                api_url, 
-                params=params, 
-                timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
-            )
-            
-            # HTTP 상태 코드 확인
-            response.raise_for_status()
-            
-            # JSON 파싱
-            data = response.json()
-            
-            # API 응답 헤더 확인
-            header = data['response']['header']
-            if header['resultCode'] != '00':
-                raise Exception(f"API 오류 [{header['resultCode']}]: {header['resultMsg']}")
-            
-            return data
-            
-        except requests.exceptions.Timeout as e:
-            last_exception = Exception(f"API 호출 시간 초과 (연결: {CONNECT_TIMEOUT}초, 읽기: {READ_TIMEOUT}초)")
-            if attempt < max_retries:
-                print(f"[경고] {last_exception}")
-                continue
-        except requests.exceptions.ConnectionError as e:
-            last_exception = Exception("네트워크 연결 오류. 인터넷 연결을 확인하세요.")
-            if attempt < max_retries:
-                print(f"[경고] {last_exception}")
-                continue
-        except requests.exceptions.HTTPError as e:
-            # HTTP 에러 발생 시 응답 내용 출력
-            error_msg = f"HTTP 오류: {e}"
-            try:
-                error_response = e.response.text
-                print(f"\n[API 응답 내용]\n{error_response}\n")
-                error_msg += f"\n응답 내용: {error_response}"
-            except:
-                pass
-            last_exception = Exception(error_msg)
-            # HTTP 에러는 재시도하지 않음 (인증 오류 등)
-            break
-        except KeyError as e:
-            last_exception = Exception(f"응답 데이터 형식 오류: {e}")
-            break
-        except Exception as e:
-            last_exception = Exception(f"예상치 못한 오류: {e}")
-            if attempt < max_retries:
-                print(f"[경고] {last_exception}")
-                continue
-    
-    # 모든 재시도 실패
-    raise last_exception
+    # API 호출 (공용 세션 재사용, 재시도 로직 포함)
+    print(f"[API 호출] 페이지: {page_no}, 결과 수: {num_of_rows}")
+    client = client or get_default_client()
+    return client.get_json(
+        api_url,
+        params,
+        max_retries=max_retries,
+        retry_delay=retry_delay,
+        timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+        throttle=rate_limiter.wait if rate_limiter is not None else None,
+        refresh=refresh
+    )
 
 
-def save_checkpoint(data: Dict, checkpoint_file: str):
+def save_checkpoint(
+    checkpoint_file: str,
+    page_no: Optional[int] = None,
+    items: Optional[List[Dict]] = None,
+    **progress
+):
     """
-    체크포인트 저장
+    체크포인트 저장 (추가 전용 JSONL)
+    
+    전체 결과를 다시 쓰지 않고 새로 완료된 페이지 결과와
+    작은 진행 정보 레코드만 파일 끝에 추가합니다.
     
     Parameters:
     -----------
-    data : dict
-        저장할 데이터
     checkpoint_file : str
         체크포인트 파일 경로
+    page_no : int, optional
+        완료된 페이지 번호 (None이면 결과 레코드를 기록하지 않음)
+    items : list, optional
+        해당 페이지의 병원 정보 리스트
+    **progress
+        진행 정보 (total_count, completed_pages, error 등)
     """
     try:
-        with open(checkpoint_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        print(f"[체크포인트 저장] {checkpoint_file}")
+        log = CheckpointLog(checkpoint_file)
+        if page_no is not None:
+            log.append_result(page_no, items or [])
+        if progress:
+            log.append_progress(**progress)
+            print(f"[체크포인트 저장] {checkpoint_file}")
     except Exception as e:
         print(f"[경고] 체크포인트 저장 실패: {e}")
 
 
-def load_checkpoint(checkpoint_file: str) -> Optional[Dict]:
+def restore_page_items(checkpoint_data: Dict, num_of_rows: int) -> Dict[int, List[Dict]]:
+    """
+    이전 형식(JSON, last_page + items) 체크포인트에서 페이지별 결과 복원
+    
+    'pages' 항목이 없으면 items를 num_of_rows 단위로 잘라
+    1 ~ last_page 페이지로 복원합니다.
+    
+    Parameters:
+    -----------
+    checkpoint_data : dict
+        이전 형식 체크포인트 데이터
+    num_of_rows : int
+        한 페이지 결과 수
+    
+    Returns:
+    --------
+    dict
+        {페이지 번호: 병원 정보 리스트}
+    """
+    if 'pages' in checkpoint_data:
+        return {int(page): items for page, items in checkpoint_data['pages'].items()}
+    
+    items = checkpoint_data.get('items', [])
+    last_page = checkpoint_data.get('last_page', 0)
+    return {
+        page: items[(page - 1) * num_of_rows:page * num_of_rows]
+        for page in range(1, last_page + 1)
+    }
+
+
+def load_checkpoint(checkpoint_file: str, num_of_rows: int = 100) -> Optional[Dict]:
     """
     체크포인트 로드
     
+    JSONL 로그를 한 줄씩 읽어 페이지별 결과를 복원합니다.
+    이전 형식(JSON 한 덩어리) 체크포인트는 읽은 뒤 같은 경로에 JSONL로 변환합니다.
+    
     Parameters:
     -----------
     checkpoint_file : str
         체크포인트 파일 경로
+    num_of_rows : int
+        한 페이지 결과 수 (이전 형식 변환용, 기본값: 100)
     
     Returns:
     --------
     dict or None
-        저장된 데이터 또는 None
+        {'pages': {페이지 번호: 병원 정보 리스트}, 'total_count': 전체 건수} 또는 None
     """
     if not os.path.exists(checkpoint_file):
         return None
     
     try:
-        with open(checkpoint_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if CheckpointLog(checkpoint_file).is_legacy_json():
+            # 이전 형식: json.dump로 저장된 단일 JSON
+            with open(checkpoint_file, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+            pages = restore_page_items(legacy, num_of_rows)
+            total_count = legacy.get('total_count')
+            
+            # 임시 파일에 쓴 뒤 교체 (변환 도중 중단되어도 이전 체크포인트 보존)
+            CheckpointLog(checkpoint_file).rewrite(pages, {
+                'timestamp': datetime.now().isoformat(),
+                'total_count': total_count
+            })
+            print(f"[체크포인트 변환] 이전 JSON 형식을 JSONL로 변환했습니다.")
+        else:
+            state = CheckpointLog(checkpoint_file).load()
+            pages = state['results']
+            total_count = state['progress'].get('total_count')
+        
         print(f"[체크포인트 로드] {checkpoint_file}")
-        print(f"  - 이전 진행: 페이지 {data.get('last_page', 0)}, {data.get('total_items', 0)}건 수집")
-        return data
+        total_items = sum(len(items) for items in pages.values())
+        print(f"  - 이전 진행: 완료 페이지 {len(pages)}개, {total_items}건 수집")
+        return {'pages': pages, 'total_count': total_count}
     except Exception as e:
         print(f"[경고] 체크포인트 로드 실패: {e}")
         return None
 
 
+class RateLimiter:
+    """
+    여러 스레드가 공유하는 API 호출 속도 제한기
+    
+    호출 사이의 최소 간격(1 / calls_per_sec)을 보장합니다.
+    
+    Parameters:
+    -----------
+    calls_per_sec : float
+        초당 최대 호출 수 (0 이하이면 제한 없음)
+    """
+    
+    def __init__(self, calls_per_sec: float = RATE_LIMIT_PER_SEC):
+        self.interval = 1.0 / calls_per_sec if calls_per_sec and calls_per_sec > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+    
+    def wait(self):
+        """다음 호출 가능 시점까지 대기"""
+        if self.interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait_time = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+def extract_items(data: Dict) -> List[Dict]:
+    """
+    API 응답에서 병원 목록(item) 추출
+    
+    Parameters:
+    -----------
+    data : dict
+        get_hospital_list 응답 데이터
+    
+    Returns:
+    --------
+    list
+        병원 정보 리스트 (결과가 없으면 빈 리스트)
+    """
+    items = data['response']['body'].get('items') or {}
+    items = items.get('item', [])
+    
+    # 단일 결과인 경우 리스트로 변환
+    if isinstance(items, dict):
+        items = [items]
+    return items
+
+
 def get_all_hospitals(
     service_key: str,
     use_encoded_key: bool = False,
@@ -350,10 +447,18 @@ def get_all_hospitals(
     dgsbj_cd: Optional[str] = None,
     max_results: Optional[int] = None,
     enable_checkpoint: bool = ENABLE_CHECKPOINT,
-    checkpoint_file: Optional[str] = None
+    checkpoint_file: Optional[str] = None,
+    max_workers: int = MAX_WORKERS,
+    rate_limit: float = RATE_LIMIT_PER_SEC,
+    sink: Optional[HiraParquetSink] = None,
+    refresh: bool = False
 ) -> List[Dict]:
     """
-    모든 페이지의 병원 정보를 가져오는 함수 (체크포인트 지원)
+    모든 페이지의 병원 정보를 가져오는 함수 (체크포인트, 동시 조회 지원)
+    
+    1페이지에서 totalCount를 확인한 뒤 나머지 페이지를 스레드 풀로
+    동시에 조회하고, 결과는 페이지 순서대로 병합합니다.
+    sink를 지정하면 앞 페이지까지 모두 도착한 페이지를 순서대로 바로 기록합니다.
     
     Parameters:
     -----------
@@ -369,102 +474,133 @@ def get_all_hospitals(
         체크포인트 기능 활성화 여부
     checkpoint_file : str, optional
         체크포인트 파일 경로 (None이면 자동 생성)
+    max_workers : int
+        동시에 조회할 최대 페이지 수 (1이면 순차 조회, 기본값: 4)
+    rate_limit : float
+        초당 최대 API 호출 수 (0이면 제한 없음, 기본값: 10)
+    sink : HiraParquetSink, optional
+        페이지 도착 즉시 결과를 기록할 저장기 (닫기는 호출한 쪽에서 처리)
+    refresh : bool
+        True이면 응답 캐시를 건너뛰고 모든 페이지를 새로 조회
+        (결과를 HospitalRegistry.sync에 넘길 때 사용. 캐시된 응답으로는 변경을 감지할 수 없음)
     
     Returns:
     --------
     list
-        모든 병원 정보 리스트
+        모든 병원 정보 리스트 (페이지 순서)
     """
     
     # 체크포인트 파일 설정
     if enable_checkpoint and checkpoint_file is None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        checkpoint_file = f"checkpoint_{timestamp}.json"
+        checkpoint_file = f"checkpoint_{timestamp}.jsonl"
+    
+    num_of_rows = 100  # 한 번에 가져올 최대 개수
     
     # 이전 진행상황 로드
-    all_items = []
-    page_no = 1
+    page_items: Dict[int, List[Dict]] = {}
+    total_count = None
     
     if enable_checkpoint and checkpoint_file:
-        checkpoint_data = load_checkpoint(checkpoint_file)
+        checkpoint_data = load_checkpoint(checkpoint_file, num_of_rows)
         if checkpoint_data:
-            all_items = checkpoint_data.get('items', [])
-            page_no = checkpoint_data.get('last_page', 0) + 1
-            print(f"[재개] 페이지 {page_no}부터 계속 진행합니다.")
+            page_items = checkpoint_data['pages']
+            total_count = checkpoint_data['total_count']
+            print(f"[재개] 완료된 {len(page_items)}개 페이지를 건너뛰고 계속 진행합니다.")
+    
+    rate_limiter = RateLimiter(rate_limit)
+    
+    def fetch_page(page_no: int) -> Dict:
+        data = get_hospital_list(
+            service_key=service_key,
+            use_encoded_key=use_encoded_key,
+            sido_cd=sido_cd,
+            sggu_cd=sggu_cd,
+            emdong_nm=emdong_nm,
+            yadm_nm=yadm_nm,
+            cl_cd=cl_cd,
+            dgsbj_cd=dgsbj_cd,
+            page_no=page_no,
+            num_of_rows=num_of_rows,
+            rate_limiter=rate_limiter,
+            refresh=refresh
+        )
+        return data
+    
+    # 저장기에 기록할 다음 페이지와 기록한 건수
+    sink_state = {'next_page': 1, 'written': 0}
+    
+    def write_ready_pages(total_pages: int, target_count: int):
+        # 앞 페이지가 모두 도착한 페이지만 순서대로 기록
+        while sink_state['next_page'] <= total_pages and sink_state['next_page'] in page_items:
+            items = page_items[sink_state['next_page']][:target_count - sink_state['written']]
+            sink.write(items)
+            sink_state['written'] += len(items)
+            sink_state['next_page'] += 1
     
-    num_of_rows = 100  # 한 번에 가져올 최대 개수
     start_time = time.time()
     
     try:
-        while True:
-            # API 호출
-            data = get_hospital_list(
-                service_key=service_key,
-                use_encoded_key=use_encoded_key,
-                sido_cd=sido_cd,
-                sggu_cd=sggu_cd,
-                emdong_nm=emdong_nm,
-                yadm_nm=yadm_nm,
-                cl_cd=cl_cd,
-                dgsbj_cd=dgsbj_cd,
-                page_no=page_no,
-                num_of_rows=num_of_rows
-            )
-            
-            # 응답 바디 확인
-            body = data['response']['body']
-            total_count = body.get('totalCount', 0)
-            
-            # 진행률 계산
-            progress_pct = (len(all_items) / total_count * 100) if total_count > 0 else 0
-            elapsed_time = time.time() - start_time
-            
-            if len(all_items) > 0 and elapsed_time > 0:
-                items_per_sec = len(all_items) / elapsed_time
-                remaining_items = total_count - len(all_items)
-                eta_seconds = remaining_items / items_per_sec if items_per_sec > 0 else 0
-                eta_str = f", 예상 남은 시간: {int(eta_seconds)}초"
-            else:
-                eta_str = ""
-            
-            print(f"[진행] 전체 {total_count}건 중 {len(all_items)}건 ({progress_pct:.1f}%){eta_str}")
-            
-            # 아이템 추출
-            items = body.get('items', {}).get('item', [])
-            
-            # 단일 결과인 경우 리스트로 변환
-            if isinstance(items, dict):
-                items = [items]
-            
-            # 결과가 없으면 종료
-            if not items:
-                break
-            
-            # 결과 추가
-            all_items.extend(items)
-            
-            # 체크포인트 저장 (일정 간격마다)
-            if enable_checkpoint and checkpoint_file and page_no % CHECKPOINT_INTERVAL == 0:
-                checkpoint_data = {
-                    'last_page': page_no,
-                    'total_items': len(all_items),
-                    'total_count': total_count,
-                    'timestamp': datetime.now().isoformat(),
-                    'items': all_items
-                }
-                save_checkpoint(checkpoint_data, checkpoint_file)
-            
-            # 최대 결과 수 확인
-            if max_results and len(all_items) >= max_results:
-                all_items = all_items[:max_results]
-                break
-            
-            # 모든 데이터를 가져왔는지 확인
-            if len(all_items) >= total_count:
-                break
-            
-            # 다음 페이지로
-            page_no += 1
+        # 1페이지 조회로 전체 건수(totalCount) 확인
+        if total_count is None or 1 not in page_items:
+            data = fetch_page(1)
+            total_count = data['response']['body'].get('totalCount', 0)
+            page_items[1] = extract_items(data)
+            if enable_checkpoint and checkpoint_file:
+                save_checkpoint(checkpoint_file, 1, page_items[1], total_count=total_count)
+        
+        target_count = min(total_count, max_results) if max_results else total_count
+        total_pages = math.ceil(target_count / num_of_rows)
+        pending_pages = [p for p in range(2, total_pages + 1) if p not in page_items]
+        
+        print(f"[계획] 전체 {total_count}건, {total_pages}페이지 "
+              f"(남은 페이지 {len(pending_pages)}개, 동시 조회 {max_workers}개)")
+        
+        if sink is not None:
+            write_ready_pages(total_pages, target_count)
+        
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {executor.submit(fetch_page, p): p for p in pending_pages}
+            try:
+                for completed, future in enumerate(as_completed(futures), 1):
+                    page_no = futures[future]
+                    page_items[page_no] = extract_items(future.result())
+                    
+                    # 완료된 페이지 결과만 체크포인트에 추가
+                    if enable_checkpoint and checkpoint_file:
+                        save_checkpoint(checkpoint_file, page_no, page_items[page_no])
+                    
+                    if sink is not None:
+                        write_ready_pages(total_pages, target_count)
+                    
+                    # 진행률 계산
+                    collected = min(sum(len(items) for items in page_items.values()), target_count)
+                    progress_pct = (collected / target_count * 100) if target_count > 0 else 0
+                    elapsed_time = time.time() - start_time
+                    
+                    if elapsed_time > 0:
+                        pages_per_sec = completed / elapsed_time
+                        remaining_pages = len(pending_pages) - completed
+                        eta_seconds = remaining_pages / pages_per_sec if pages_per_sec > 0 else 0
+                        eta_str = f", 예상 남은 시간: {int(eta_seconds)}초"
+                    else:
+                        eta_str = ""
+                    
+                    print(f"[진행] 전체 {target_count}건 중 {collected}건 ({progress_pct:.1f}%){eta_str}")
+                    
+                    # 진행 정보 기록 (일정 간격마다)
+                    if enable_checkpoint and checkpoint_file and completed % CHECKPOINT_INTERVAL == 0:
+                        save_checkpoint(checkpoint_file, completed_pages=len(page_items), total_items=collected)
+            except BaseException:
+                # 아직 시작하지 않은 페이지는 취소 (진행 중인 호출만 마무리)
+                for future in futures:
+                    future.cancel()
+                raise
+        
+        # 페이지 순서대로 병합
+        all_items = [item for page in sorted(page_items) for item in page_items[page]]
+        if max_results:
+            all_items = all_items[:max_results]
         
         print(f"[완료] 총 {len(all_items)}건 조회 완료")
         
@@ -481,25 +617,325 @@ def get_all_hospitals(
     except Exception as e:
         # 오류 발생 시 현재까지의 데이터 체크포인트 저장
         if enable_checkpoint and checkpoint_file:
-            checkpoint_data = {
-                'last_page': page_no - 1,
-                'total_items': len(all_items),
-                'timestamp': datetime.now().isoformat(),
-                'error': str(e),
-                'items': all_items
-            }
-            save_checkpoint(checkpoint_data, checkpoint_file)
+            save_checkpoint(checkpoint_file, total_count=total_count, error=str(e))
+            
+            # 재개 시 빠르게 읽도록 페이지별 최신 결과만 남김
+            try:
+                CheckpointLog(checkpoint_file).compact()
+            except Exception as compact_error:
+                print(f"[경고] 체크포인트 정리 실패: {compact_error}")
             print(f"\n[오류] 진행상황이 저장되었습니다. 다시 실행하면 이어서 진행됩니다.")
         raise
 
 
+# ============================================================================
+# 다중 조건 일괄 조회 (배치 모드)
+# ============================================================================
+
+BATCH_KEY_BASE = 100000  # 배치 체크포인트 키 = 조건 번호 * BATCH_KEY_BASE + 페이지 번호
+
+
+def expand_batch_spec(spec: Dict[str, List[str]]) -> List[Dict]:
+    """
+    배치 조회 명세를 개별 검색 조건 목록으로 펼치기 (교차곱)
+    
+    Parameters:
+    -----------
+    spec : dict
+        코드표 이름 목록. 생략한 항목은 조건 없이 조회합니다.
+        - 'sido': SIDO_CODES 이름 (예: ['서울'])
+        - 'sggu': SEOUL_SGGU_CODES 이름 (예: ['강남구', '서초구'], '*'이면 서울 25개 구 전체)
+          서울 구 코드만 있으므로 'sido'를 함께 지정할 때는 ['서울']만 허용
+        - 'cl': CL_CODES 이름 (예: ['의원', '병원'])
+        - 'dgsbj': DGSBJ_CODES 이름 (예: ['피부과'])
+    
+    Returns:
+    --------
+    list
+        검색 조건 목록 [{'label': ..., 'sido_cd': ..., 'sggu_cd': ..., 'cl_cd': ..., 'dgsbj_cd': ...}, ...]
+    
+    Raises:
+    -------
+    KeyError
+        코드표에 없는 이름이 포함된 경우
+    ValueError
+        'sggu'와 서울 이외의 'sido'를 함께 지정한 경우 (서울 구 코드와 다른 시도의 조합)
+    """
+    def names(key: str, table: Dict[str, str]) -> List[Optional[str]]:
+        values = spec.get(key)
+        if not values:
+            return [None]
+        if values == '*' or values == ['*']:
+            return list(table)
+        for name in values:
+            if name not in table:
+                raise KeyError(f"'{key}' 항목의 '{name}'을(를) 코드표에서 찾을 수 없습니다.")
+        return list(values)
+    
+    sidos = names('sido', SIDO_CODES)
+    sggus = names('sggu', SEOUL_SGGU_CODES)
+    if sggus != [None]:
+        other_sidos = [sido for sido in sidos if sido not in (None, '서울')]
+        if other_sidos:
+            raise ValueError(f"'sggu'는 서울 구 코드만 지원하므로 'sido' {other_sidos}와 함께 쓸 수 없습니다. "
+                             f"서울 이외 시도는 'sggu' 없이 따로 조회하세요.")
+    
+    queries = []
+    for sido in sidos:
+        for sggu in sggus:
+            for cl in names('cl', CL_CODES):
+                for dgsbj in names('dgsbj', DGSBJ_CODES):
+                    queries.append({
+                        'label': ' '.join(n for n in (sido, sggu, cl, dgsbj) if n) or '전체',
+                        'sido_cd': SIDO_CODES[sido] if sido else None,
+                        'sggu_cd': SEOUL_SGGU_CODES[sggu] if sggu else None,
+                        'cl_cd': CL_CODES[cl] if cl else None,
+                        'dgsbj_cd': DGSBJ_CODES[dgsbj] if dgsbj else None,
+                    })
+    return queries
+
+
+def hospital_key(item: Dict) -> str:
+    """
+    병원 중복 제거용 키 (ykiho, 없으면 병원명 + 주소)
+    """
+    return item.get('ykiho') or f"{item.get('yadmNm', '')}|{item.get('addr', '')}"
+
+
+def get_all_hospitals_batch(
+    service_key: str,
+    queries: List[Dict],
+    use_encoded_key: bool = False,
+    max_workers: int = MAX_WORKERS,
+    rate_limit: float = RATE_LIMIT_PER_SEC,
+    enable_checkpoint: bool = ENABLE_CHECKPOINT,
+    checkpoint_file: Optional[str] = None,
+    sink: Optional[HiraParquetSink] = None,
+    refresh: bool = False
+) -> List[Dict]:
+    """
+    여러 검색 조건을 하나의 작업 큐로 묶어 조회하고 ykiho 기준으로 병합
+    
+    모든 조건의 1페이지를 먼저 작업 큐에 넣고, 1페이지가 도착하면 totalCount로
+    나머지 (조건, 페이지) 작업을 같은 스레드 풀에 추가합니다.
+    호출 속도 제한은 모든 조건이 공유합니다.
+    
+    Parameters:
+    -----------
+    service_key : str
+        공공데이터포털에서 발급받은 인증키
+    queries : list
+        expand_batch_spec 결과 (검색 조건 목록)
+    use_encoded_key : bool
+        True: 인코딩 키 사용, False: 디코딩 키 사용
+    max_workers : int
+        동시에 조회할 최대 페이지 수 (기본값: 4)
+    rate_limit : float
+        전체 조건 합산 초당 최대 API 호출 수 (기본값: 10)
+    enable_checkpoint : bool
+        체크포인트 기능 활성화 여부
+    checkpoint_file : str, optional
+        체크포인트 파일 경로 (None이면 자동 생성)
+    sink : HiraParquetSink, optional
+        결과를 기록할 저장기 (조건 간 중복 제거가 끝난 뒤 한 번에 기록)
+    refresh : bool
+        True이면 응답 캐시를 건너뛰고 모든 페이지를 새로 조회 (get_all_hospitals 참조)
+    
+    Returns:
+    --------
+    list
+        ykiho 기준으로 중복 제거된 병원 정보 리스트
+        (각 항목의 '조회조건'에 해당 병원이 검색된 조건 라벨 목록 기록)
+    """
+    
+    # 체크포인트 파일 설정
+    if enable_checkpoint and checkpoint_file is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        checkpoint_file = f"checkpoint_batch_{timestamp}.jsonl"
+    
+    num_of_rows = 100
+    
+    # 이전 진행상황 로드 ((조건 번호, 페이지 번호) -> 결과)
+    task_items: Dict[Tuple[int, int], List[Dict]] = {}
+    total_counts: Dict[int, int] = {}
+    
+    if enable_checkpoint and checkpoint_file:
+        state = CheckpointLog(checkpoint_file).load()
+        if state:
+            for key, items in state['results'].items():
+                task_items[divmod(key, BATCH_KEY_BASE)] = items
+            total_counts = {int(q): c for q, c in state['progress'].get('total_counts', {}).items()}
+            print(f"[재개] 완료된 {len(task_items)}개 페이지를 건너뛰고 계속 진행합니다.")
+    
+    rate_limiter = RateLimiter(rate_limit)
+    
+    def fetch_task(query_idx: int, page_no: int) -> Dict:
+        query = queries[query_idx]
+        return get_hospital_list(
+            service_key=service_key,
+            use_encoded_key=use_encoded_key,
+            sido_cd=query['sido_cd'],
+            sggu_cd=query['sggu_cd'],
+            cl_cd=query['cl_cd'],
+            dgsbj_cd=query['dgsbj_cd'],
+            page_no=page_no,
+            num_of_rows=num_of_rows,
+            rate_limiter=rate_limiter,
+            refresh=refresh
+        )
+    
+    def remaining_pages(query_idx: int) -> List[int]:
+        total_pages = math.ceil(total_counts[query_idx] / num_of_rows)
+        return [p for p in range(2, total_pages + 1) if (query_idx, p) not in task_items]
+    
+    print(f"[배치] 검색 조건 {len(queries)}개, 동시 조회 {max_workers}개, 초당 {rate_limit}건 제한")
+    start_time = time.time()
+    completed = 0
+    
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {}
+            
+            def submit(query_idx: int, page_no: int):
+                futures[executor.submit(fetch_task, query_idx, page_no)] = (query_idx, page_no)
+            
+            # 1페이지 작업 (이미 전체 건수를 아는 조건은 남은 페이지 바로 추가)
+            for query_idx in range(len(queries)):
+                if query_idx in total_counts and (query_idx, 1) in task_items:
+                    for page_no in remaining_pages(query_idx):
+                        submit(query_idx, page_no)
+                else:
+                    submit(query_idx, 1)
+            
+            try:
+                while futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        query_idx, page_no = futures.pop(future)
+                        data = future.result()
+                        task_items[(query_idx, page_no)] = extract_items(data)
+                        completed += 1
+                        
+                        if enable_checkpoint and checkpoint_file:
+                            save_checkpoint(
+                                checkpoint_file,
+                                query_idx * BATCH_KEY_BASE + page_no,
+                                task_items[(query_idx, page_no)]
+                            )
+                        
+                        # 1페이지가 도착하면 나머지 페이지를 작업 큐에 추가
+                        if page_no == 1:
+                            total_counts[query_idx] = data['response']['body'].get('totalCount', 0)
+                            if enable_checkpoint and checkpoint_file:
+                                save_checkpoint(checkpoint_file, total_counts=total_counts)
+                            for next_page in remaining_pages(query_idx):
+                                submit(query_idx, next_page)
+                        
+                        if completed % CHECKPOINT_INTERVAL == 0:
+                            elapsed_time = time.time() - start_time
+                            print(f"[진행] 완료 {completed}페이지, 대기 {len(futures)}페이지 "
+                                  f"({completed / elapsed_time:.1f}페이지/초)")
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+    
+    except Exception as e:
+        if enable_checkpoint and checkpoint_file:
+            save_checkpoint(checkpoint_file, total_counts=total_counts, error=str(e))
+            try:
+                CheckpointLog(checkpoint_file).compact()
+            except Exception as compact_error:
+                print(f"[경고] 체크포인트 정리 실패: {compact_error}")
+            print(f"\n[오류] 진행상황이 저장되었습니다. 다시 실행하면 이어서 진행됩니다.")
+        raise
+    
+    # (조건, 페이지) 순서대로 병합하며 ykiho 기준 중복 제거
+    merged: Dict[str, Dict] = {}
+    total_raw = 0
+    for query_idx, page_no in sorted(task_items):
+        label = queries[query_idx]['label']
+        for item in task_items[(query_idx, page_no)]:
+            total_raw += 1
+            key = hospital_key(item)
+            if key not in merged:
+                merged[key] = dict(item, 조회조건=[label])
+            elif label not in merged[key]['조회조건']:
+                merged[key]['조회조건'].append(label)
+    
+    all_items = list(merged.values())
+    for item in all_items:
+        item['조회조건'] = ', '.join(item['조회조건'])
+    
+    print(f"[완료] 조회 {total_raw}건 → 중복 제거 후 {len(all_items)}건 "
+          f"(소요 시간: {time.time() - start_time:.1f}초)")
+    
+    if sink is not None:
+        sink.write(all_items)
+    
+    # 완료 후 체크포인트 파일 삭제
+    if enable_checkpoint and checkpoint_file and os.path.exists(checkpoint_file):
+        try:
+            os.remove(checkpoint_file)
+            print(f"[체크포인트 삭제] {checkpoint_file}")
+        except:
+            pass
+    
+    return all_items
+
+
 # ============================================================================
 # 데이터 처리 함수
 # ============================================================================
 
+# 엑셀 저장 시 주요 컬럼 (필요에 따라 수정)
+EXCEL_COLUMNS = [
+    'yadmNm',      # 병원명
+    'clCdNm',      # 종별명
+    'sidoCdNm',    # 시도명
+    'sgguCdNm',    # 시군구명
+    'emdongNm',    # 읍면동명
+    'addr',        # 주소
+    'postNo',      # 우편번호
+    'telno',       # 전화번호
+    'hospUrl',     # 홈페이지
+    'estbDd',      # 개설일자
+    'drTotCnt',    # 의사총수
+    'mdeptSdrCnt', # 의과전문의
+    'detySdrCnt',  # 치과전문의
+    'cmdcSdrCnt',  # 한방전문의
+    'XPos',        # 경도
+    'YPos',        # 위도
+    '조회조건'      # 배치 조회 시 검색된 조건
+]
+
+# 엑셀 컬럼명 한글화 (save_to_excel, parquet_to_excel 공용)
+EXCEL_COLUMN_NAMES = {
+    'yadmNm': '병원명',
+    'clCdNm': '종별',
+    'sidoCdNm': '시도',
+    'sgguCdNm': '시군구',
+    'emdongNm': '읍면동',
+    'addr': '주소',
+    'postNo': '우편번호',
+    'telno': '전화번호',
+    'hospUrl': '홈페이지',
+    'estbDd': '개설일자',
+    'drTotCnt': '의사총수',
+    'mdeptSdrCnt': '의과전문의',
+    'detySdrCnt': '치과전문의',
+    'cmdcSdrCnt': '한방전문의',
+    'XPos': '경도',
+    'YPos': '위도'
+}
+
+
 def save_to_excel(items: List[Dict], filename: str):
     """
-    병원 정보를 엑셀 파일로 저장
+    병원 정보(메모리의 조회 결과)를 엑셀 파일로 저장
+    
+    Parquet로 저장한 결과는 parquet_to_excel(..., columns=EXCEL_COLUMNS,
+    rename=EXCEL_COLUMN_NAMES)로 같은 형식의 엑셀을 만듭니다.
     
     Parameters:
     -----------
@@ -516,50 +952,12 @@ def save_to_excel(items: List[Dict], filename: str):
     # 데이터프레임 생성
     df = pd.DataFrame(items)
     
-    # 주요 컬럼만 선택 (필요에 따라 수정)
-    columns = [
-        'yadmNm',      # 병원명
-        'clCdNm',      # 종별명
-        'sidoCdNm',    # 시도명
-        'sgguCdNm',    # 시군구명
-        'emdongNm',    # 읍면동명
-        'addr',        # 주소
-        'postNo',      # 우편번호
-        'telno',       # 전화번호
-        'hospUrl',     # 홈페이지
-        'estbDd',      # 개설일자
-        'drTotCnt',    # 의사총수
-        'mdeptSdrCnt', # 의과전문의
-        'detySdrCnt',  # 치과전문의
-        'cmdcSdrCnt',  # 한방전문의
-        'XPos',        # 경도
-        'YPos'         # 위도
-    ]
-    
-    # 존재하는 컬럼만 선택
-    available_columns = [col for col in columns if col in df.columns]
+    # 존재하는 주요 컬럼만 선택
+    available_columns = [col for col in EXCEL_COLUMNS if col in df.columns]
     df_selected = df[available_columns]
     
     # 컬럼명 한글화
-    column_names = {
-        'yadmNm': '병원명',
-        'clCdNm': '종별',
-        'sidoCdNm': '시도',
-        'sgguCdNm': '시군구',
-        'emdongNm': '읍면동',
-        'addr': '주소',
-        'postNo': '우편번호',
-        'telno': '전화번호',
-        'hospUrl': '홈페이지',
-        'estbDd': '개설일자',
-        'drTotCnt': '의사총수',
-        'mdeptSdrCnt': '의과전문의',
-        'detySdrCnt': '치과전문의',
-        'cmdcSdrCnt': '한방전문의',
-        'XPos': '경도',
-        'YPos': '위도'
-    }
-    df_selected = df_selected.rename(columns=column_names)
+    df_selected = df_selected.rename(columns=EXCEL_COLUMN_NAMES)
     
     # 엑셀 저장
     df_selected.to_excel(filename, index=False, engine='openpyxl')
@@ -644,14 +1042,25 @@ def main():
     # 3. API 호출
     # ========================================
     try:
-        # 모든 결과 조회
-        hospitals = get_all_hospitals(
-            service_key=SERVICE_KEY,
-            use_encoded_key=USE_ENCODED_KEY,
-            sido_cd=sido_cd,
-            sggu_cd=sggu_cd,
-            dgsbj_cd=dgsbj_cd
-        )
+        # 파일명 생성 (현재 날짜시간 포함)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base_name = f"서울_강남구_피부과_{timestamp}"
+        
+        # 모든 결과 조회 (페이지가 도착하는 대로 Parquet에 기록)
+        with HiraParquetSink(
+            f"{base_name}.parquet",
+            BASIS_FIELD_TYPES,
+            csv_path=f"{base_name}.csv" if SAVE_CSV else None
+        ) as sink:
+            hospitals = get_all_hospitals(
+                service_key=SERVICE_KEY,
+                use_encoded_key=USE_ENCODED_KEY,
+                sido_cd=sido_cd,
+                sggu_cd=sggu_cd,
+                dgsbj_cd=dgsbj_cd,
+                sink=sink,
+                refresh=SYNC_REGISTRY  # 동기화할 결과는 캐시가 아닌 최신 응답이어야 함
+            )
         
         # ========================================
         # 4. 결과 출력
@@ -659,14 +1068,19 @@ def main():
         print_hospital_info(hospitals, max_display=10)
         
         # ========================================
-        # 5. 엑셀 저장
+        # 5. 엑셀 저장 (선택)
         # ========================================
-        if hospitals:
-            # 파일명 생성 (현재 날짜시간 포함)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"서울_강남구_피부과_{timestamp}.xlsx"
-            
-            save_to_excel(hospitals, filename)
+        if SAVE_EXCEL and hospitals:
+            parquet_to_excel(f"{base_name}.parquet", f"{base_name}.xlsx",
+                             columns=EXCEL_COLUMNS, rename=EXCEL_COLUMN_NAMES)
+        
+        # ========================================
+        # 6. 마스터 테이블 동기화
+        # ========================================
+        # 빈 결과로 동기화하면 범위 내 병원이 모두 폐업 처리되므로 건너뜀
+        if SYNC_REGISTRY and hospitals:
+            with HospitalRegistry() as registry:
+                registry.sync(hospitals, scope="서울 강남구 피부과")
         
     except Exception as e:
         print(f"[오류 발생] {e}")
@@ -675,6 +1089,14 @@ def main():
         print("1. 인증키가 올바른지 확인 (디코딩 키 사용)")
         print("2. 인터넷 연결 확인")
         print("3. 인증키 발급 후 30분 이상 경과했는지 확인")
+    
+    # ========================================
+    # 캐시 적중/미적중 요약
+    # ========================================
+    cache = get_default_cache()
+    if cache is not None:
+        print()
+        print(cache.summary())
 
 
 # ============================================================================
@@ -720,6 +1142,38 @@ def example_search_pediatrics():
     print_hospital_info(hospitals)
 
 
+def example_batch_seoul_dermatology():
+    """
+    예시: 서울 25개 구 × {의원, 병원} × 피부과 일괄 조회 후 하나의 파일로 저장
+    """
+    queries = expand_batch_spec({
+        'sido': ['서울'],
+        'sggu': '*',
+        'cl': ['의원', '병원'],
+        'dgsbj': ['피부과']
+    })
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    base_name = f"서울_전체구_피부과_배치_{timestamp}"
+    
+    with HiraParquetSink(f"{base_name}.parquet", BASIS_FIELD_TYPES) as sink:
+        hospitals = get_all_hospitals_batch(
+            service_key=SERVICE_KEY,
+            queries=queries,
+            use_encoded_key=USE_ENCODED_KEY,
+            sink=sink,
+            refresh=SYNC_REGISTRY
+        )
+    print_hospital_info(hospitals)
+    
+    if SAVE_EXCEL and hospitals:
+        parquet_to_excel(f"{base_name}.parquet", f"{base_name}.xlsx",
+                         columns=EXCEL_COLUMNS, rename=EXCEL_COLUMN_NAMES)
+    
+    if SYNC_REGISTRY and hospitals:
+        with HospitalRegistry() as registry:
+            registry.sync(hospitals, scope="서울 전체구 의원·병원 피부과")
+
+
 # ============================================================================
 # 프로그램 실행
 # ============================================================================
@@ -732,3 +1186,4 @@ if __name__ == "__main__":
     # example_search_by_name()
     # example_search_by_location()
     # example_search_pediatrics()
+    # example_batch_seoul_dermatology()
@@ -4,18 +4,27 @@
 작성일: 2026-01-15
 목적: 건강보험심사평가원 의료기관별상세정보서비스 API를 사용하여 병원 상세정보 조회
 입력: 병원기본목록 Excel 파일 (암호화된 요양기호 포함)
-출력: 병원 상세정보 Excel 파일
+출력: 병원 상세정보 Parquet 파일 (선택: CSV, Excel)
 ================================================================================
 """
 
-import requests
 import json
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import pandas as pd
 from datetime import datetime
 import time
 import os
+import asyncio
 from pathlib import Path
+import sys
+
+# 공용 HTTP 클라이언트 (openapi/hira_client.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from hira_client import AsyncHiraClient, AsyncTokenBucket, HiraClient, get_default_client
+from hira_checkpoint import CheckpointLog
+from hira_cache import get_default_cache
+from hira_sink import DETAIL_FIELD_TYPES, HiraParquetSink, parquet_to_excel
+from hira_registry import DETAIL_NO_DATA, DETAIL_OK, HospitalRegistry
 
 # ============================================================================
 # 설정 (Configuration)
@@ -43,22 +52,72 @@ READ_TIMEOUT = 60        # 읽기 타임아웃 (초)
 
 # 체크포인트 설정
 ENABLE_CHECKPOINT = True # 진행상황 저장 활성화
-CHECKPOINT_INTERVAL = 5  # 체크포인트 저장 간격 (건수 단위)
+CHECKPOINT_INTERVAL = 5  # 진행 정보 기록 간격 (건수 단위, 결과는 건마다 추가 기록)
+LEGACY_RESULT_KEY = -1   # 이전 JSON 체크포인트에서 옮겨온 결과의 키
+
+# 동시 조회 설정 (공공데이터포털 계정의 트래픽 한도에 맞춰 조정)
+MAX_CONCURRENCY = 8      # 동시에 진행할 최대 요청 수
+RATE_LIMIT_PER_SEC = 10  # 초당 최대 API 호출 수 (0이면 제한 없음)
+
+# 저장 설정 (결과는 항상 Parquet으로 저장)
+SAVE_CSV = False         # Parquet과 함께 CSV도 저장
+SAVE_EXCEL = False       # Parquet 저장 후 엑셀 파일도 생성 (대용량에서는 느림)
+
+# 증분 조회 설정 (openapi/hira_registry.py)
+USE_REGISTRY = True      # 병원 마스터 테이블 기준으로 변경된 병원만 상세정보 조회
 
 # 입력 파일 설정
 INPUT_EXCEL_FILE = "D:/git_rk/openapi/getHospBasisList/data/서울_강남구_피부과_20260113_205835.xlsx"
-YKIHO_COLUMN = "암호화요양기호"  # Excel 파일에서 요양기호가 저장된 컬럼명 (실제 컬럼명으로 수정 필요)
+YKIHO_COLUMN = "암호화요양기호"  # Excel/Parquet 파일에서 요양기호가 저장된 컬럼명 (실제 컬럼명으로 수정 필요)
 
 # ============================================================================
 # API 호출 함수
 # ============================================================================
 
+def build_detail_request(service_key: str, use_encoded_key: bool, ykiho: str) -> Tuple[str, Dict]:
+    """
+    상세정보 API 요청 주소와 파라미터 구성
+    
+    Parameters:
+    -----------
+    service_key : str
+        공공데이터포털에서 발급받은 인증키 (인코딩 또는 디코딩)
+    use_encoded_key : bool
+        True: 인코딩 키 사용 (URL에 직접 포함)
+        False: 디코딩 키 사용 (params로 전달)
+    ykiho : str
+        암호화된 요양기호
+    
+    Returns:
+    --------
+    tuple
+        (API 주소, 요청 파라미터)
+    """
+    # 요청 파라미터 구성
+    params = {
+        'ykiho': ykiho,      # 암호화된 요양기호
+        '_type': 'json'      # JSON 형식으로 응답 받기
+    }
+    
+    # API 키 처리 방식 결정
+    if use_encoded_key:
+        # 인코딩 키: URL에 직접 포함
+        api_url = f"{API_BASE_URL}?ServiceKey={service_key}"
+    else:
+        # 디코딩 키: params로 전달 (requests가 자동 인코딩)
+        api_url = API_BASE_URL
+        params['ServiceKey'] = service_key
+    
+    return api_url, params
+
+
 def get_hospital_detail(
     service_key: str,
     use_encoded_key: bool = False,
     ykiho: str = None,
     max_retries: int = MAX_RETRIES,
-    retry_delay: int = RETRY_DELAY
+    retry_delay: int = RETRY_DELAY,
+    client: Optional[HiraClient] = None
 ) -> Dict:
     """
     병원 상세정보 API 호출 함수 (재시도 로직 포함)
@@ -76,6 +135,8 @@ def get_hospital_detail(
         최대 재시도 횟수 (기본값: 3)
     retry_delay : int
         초기 재시도 대기 시간 (기본값: 1초)
+    client : HiraClient, optional
+        HTTP 클라이언트 (None이면 공용 기본 클라이언트 사용)
     
     Returns:
     --------
@@ -88,100 +149,49 @@ def get_hospital_detail(
         API 호출 실패 시 예외 발생
     """
     
-    # 요청 파라미터 구성
-    params = {
-        'ykiho': ykiho,      # 암호화된 요양기호
-        '_type': 'json'      # JSON 형식으로 응답 받기
-    }
-    
-    # API 키 처리 방식 결정
-    if use_encoded_key:
-        # 인코딩 키: URL에 직접 포함
-        api_url = f"{API_BASE_URL}?ServiceKey={service_key}"
-    else:
-        # 디코딩 키: params로 전달 (requests가 자동 인코딩)
-        api_url = API_BASE_URL
-        params['ServiceKey'] = service_key
-    
-    # 재시도 로직
-    last_exception = None
-    for attempt in range(max_retries + 1):
-        try:
-            if attempt > 0:
-                wait_time = retry_delay * (2 ** (attempt - 1))  # 지수 백오프
-                print(f"[재시도 {attempt}/{max_retries}] {wait_time}초 대기 중...")
-                time.sleep(wait_time)
-            
-            # API 호출
-            response = requests.get(
-                api_url, 
-                params=params, 
-                timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
-            )
-            
-            # HTTP 상태 코드 확인
-            response.raise_for_status()
-            
-            # JSON 파싱
-            data = response.json()
-            
-            # API 응답 헤더 확인
-            header = data['response']['header']
-            if header['resultCode'] != '00':
-                raise Exception(f"API 오류 [{header['resultCode']}]: {header['resultMsg']}")
-            
-            return data
-            
-        except requests.exceptions.Timeout as e:
-            last_exception = Exception(f"API 호출 시간 초과 (연결: {CONNECT_TIMEOUT}초, 읽기: {READ_TIMEOUT}초)")
-            if attempt < max_retries:
-                print(f"[경고] {last_exception}")
-                continue
-        except requests.exceptions.ConnectionError as e:
-            last_exception = Exception("네트워크 연결 오류. 인터넷 연결을 확인하세요.")
-            if attempt < max_retries:
-                print(f"[경고] {last_exception}")
-                continue
-        except requests.exceptions.HTTPError as e:
-            # HTTP 에러 발생 시 응답 내용 출력
-            error_msg = f"HTTP 오류: {e}"
-            try:
-                error_response = e.response.text
-                print(f"\n[API 응답 내용]\n{error_response}\n")
-                error_msg += f"\n응답 내용: {error_response}"
-            except:
-                pass
-            last_exception = Exception(error_msg)
-            # HTTP 에러는 재시도하지 않음 (인증 오류 등)
-            break
-        except KeyError as e:
-            last_exception = Exception(f"응답 데이터 형식 오류: {e}")
-            break
-        except Exception as e:
-            last_exception = Exception(f"예상치 못한 오류: {e}")
-            if attempt < max_retries:
-                print(f"[경고] {last_exception}")
-                continue
-    
-    # 모든 재시도 실패
-    raise last_exception
+    api_url, params = build_detail_request(service_key, use_encoded_key, ykiho)
+    
+    # API 호출 (공용 세션 재사용, 재시도 로직 포함)
+    client = client or get_default_client()
+    return client.get_json(
+        api_url,
+        params,
+        max_retries=max_retries,
+        retry_delay=retry_delay,
+        timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+    )
 
 
-def save_checkpoint(data: Dict, checkpoint_file: str):
+def save_checkpoint(
+    checkpoint_file: str,
+    index: Optional[int] = None,
+    items: Optional[List[Dict]] = None,
+    **progress
+):
     """
-    체크포인트 저장
+    체크포인트 저장 (추가 전용 JSONL)
+    
+    전체 결과를 다시 쓰지 않고 새로 처리된 인덱스의 결과와
+    작은 진행 정보 레코드만 파일 끝에 추가합니다.
     
     Parameters:
     -----------
-    data : dict
-        저장할 데이터
     checkpoint_file : str
         체크포인트 파일 경로
+    index : int, optional
+        처리 완료된 행 인덱스 (None이면 결과 레코드를 기록하지 않음)
+    items : list, optional
+        해당 인덱스의 상세정보 리스트 (없음/오류는 빈 리스트)
+    **progress
+        진행 정보 (total_count, processed_count, error 등)
     """
     try:
-        with open(checkpoint_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        print(f"[체크포인트 저장] {checkpoint_file}")
+        log = CheckpointLog(checkpoint_file)
+        if index is not None:
+            log.append_result(index, items or [])
+        if progress:
+            log.append_progress(**progress)
+            print(f"[체크포인트 저장] {checkpoint_file}")
     except Exception as e:
         print(f"[경고] 체크포인트 저장 실패: {e}")
 
@@ -190,6 +200,10 @@ def load_checkpoint(checkpoint_file: str) -> Optional[Dict]:
     """
     체크포인트 로드
     
+    JSONL 로그를 한 줄씩 읽어 인덱스별 결과를 복원합니다.
+    이전 형식(JSON 한 덩어리) 체크포인트는 읽은 뒤 같은 경로에 JSONL로 변환합니다.
+    이전 형식의 items는 인덱스 정보가 없으므로 LEGACY_RESULT_KEY 아래에 보관합니다.
+    
     Parameters:
     -----------
     checkpoint_file : str
@@ -198,17 +212,33 @@ def load_checkpoint(checkpoint_file: str) -> Optional[Dict]:
     Returns:
     --------
     dict or None
-        저장된 데이터 또는 None
+        {'results': {인덱스: 상세정보 리스트}, 'processed_indices': set} 또는 None
     """
     if not os.path.exists(checkpoint_file):
         return None
     
     try:
-        with open(checkpoint_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if CheckpointLog(checkpoint_file).is_legacy_json():
+            # 이전 형식: json.dump로 저장된 단일 JSON
+            with open(checkpoint_file, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+            processed_indices = set(legacy.get('processed_indices', []))
+            results = {idx: [] for idx in processed_indices}
+            results[LEGACY_RESULT_KEY] = legacy.get('items', [])
+            
+            # 임시 파일에 쓴 뒤 교체 (변환 도중 중단되어도 이전 체크포인트 보존)
+            CheckpointLog(checkpoint_file).rewrite(results, {
+                'timestamp': datetime.now().isoformat(),
+                'total_count': legacy.get('total_count')
+            })
+            print(f"[체크포인트 변환] 이전 JSON 형식을 JSONL로 변환했습니다.")
+        else:
+            results = CheckpointLog(checkpoint_file).load()['results']
+            processed_indices = {idx for idx in results if idx != LEGACY_RESULT_KEY}
+        
         print(f"[체크포인트 로드] {checkpoint_file}")
-        print(f"  - 이전 진행: {data.get('processed_count', 0)}건 처리 완료")
-        return data
+        print(f"  - 이전 진행: {len(processed_indices)}건 처리 완료")
+        return {'results': results, 'processed_indices': processed_indices}
     except Exception as e:
         print(f"[경고] 체크포인트 로드 실패: {e}")
         return None
@@ -216,12 +246,12 @@ def load_checkpoint(checkpoint_file: str) -> Optional[Dict]:
 
 def load_hospital_list_from_excel(filename: str, ykiho_column: str = None) -> pd.DataFrame:
     """
-    Excel 파일에서 병원 목록 읽기
+    Excel 파일(또는 병원정보 조회 스크립트가 저장한 Parquet 파일)에서 병원 목록 읽기
     
     Parameters:
     -----------
     filename : str
-        Excel 파일 경로
+        Excel 또는 Parquet 파일 경로
     ykiho_column : str, optional
         요양기호 컬럼명 (None이면 자동 탐지)
     
@@ -230,8 +260,12 @@ def load_hospital_list_from_excel(filename: str, ykiho_column: str = None) -> pd
     pd.DataFrame
         병원 목록 데이터프레임
     """
-    print(f"[Excel 읽기] {filename}")
-    df = pd.read_excel(filename)
+    if str(filename).lower().endswith('.parquet'):
+        print(f"[Parquet 읽기] {filename}")
+        df = pd.read_parquet(filename)
+    else:
+        print(f"[Excel 읽기] {filename}")
+        df = pd.read_excel(filename)
     
     print(f"  - 총 {len(df)}건")
     print(f"  - 컬럼: {', '.join(df.columns.tolist())}")
@@ -255,6 +289,73 @@ def load_hospital_list_from_excel(filename: str, ykiho_column: str = None) -> pd
     return df
 
 
+def parse_detail_items(data: Dict, row: pd.Series, ykiho: Optional[str] = None) -> List[Dict]:
+    """
+    상세정보 응답에서 item 추출 후 원본 병원 정보 병합
+    
+    Parameters:
+    -----------
+    data : dict
+        get_hospital_detail 응답 데이터
+    row : pd.Series
+        병원 목록의 원본 행
+    ykiho : str, optional
+        조회한 요양기호 (지정하면 '원본_요양기호'로 기록)
+    
+    Returns:
+    --------
+    list
+        상세정보 리스트 (결과가 없으면 빈 리스트)
+    """
+    body = data['response']['body']
+    items = (body.get('items') or {}).get('item', {})
+    
+    # 단일 결과인 경우 처리
+    if isinstance(items, dict):
+        items = [items] if items else []
+    
+    # 원본 행의 데이터 추가
+    for item in items:
+        item['원본_병원명'] = row.get('yadmNm', '')
+        item['원본_주소'] = row.get('addr', '')
+        if ykiho is not None:
+            item['원본_요양기호'] = ykiho
+    return items
+
+
+def filter_changed_hospitals(
+    hospital_df: pd.DataFrame,
+    ykiho_column: str,
+    registry: HospitalRegistry
+) -> pd.DataFrame:
+    """
+    마스터 테이블 기준으로 상세정보를 다시 조회해야 하는 병원만 남기기
+    
+    신규 병원과 마지막 상세 조회 이후 기본정보가 바뀐 병원만 반환하고,
+    변경 없는 병원과 폐업 처리된 병원은 건너뜁니다.
+    
+    Parameters:
+    -----------
+    hospital_df : pd.DataFrame
+        병원 목록 데이터프레임
+    ykiho_column : str
+        요양기호 컬럼명
+    registry : HospitalRegistry
+        병원 마스터 테이블
+    
+    Returns:
+    --------
+    pd.DataFrame
+        조회 대상 병원 목록 (인덱스 재설정)
+    """
+    ykihos = hospital_df[ykiho_column].dropna().astype(str).tolist()
+    targets = set(registry.needs_detail(ykihos))
+    filtered = hospital_df[hospital_df[ykiho_column].astype(str).isin(targets)].reset_index(drop=True)
+    print(f"[증분 조회] 전체 {len(hospital_df)}건 중 {len(filtered)}건 조회 "
+          f"(변경 없음 {len(hospital_df) - len(filtered)}건 건너뜀)")
+    return filtered
+
+
 def get_all_hospital_details(
     service_key: str,
     use_encoded_key: bool = False,
@@ -262,10 +363,21 @@ def get_all_hospital_details(
     ykiho_column: str = 'ykiho',
     max_results: Optional[int] = None,
     enable_checkpoint: bool = ENABLE_CHECKPOINT,
-    checkpoint_file: Optional[str] = None
+    checkpoint_file: Optional[str] = None,
+    max_concurrency: int = MAX_CONCURRENCY,
+    rate_limit: float = RATE_LIMIT_PER_SEC,
+    transport=None,
+    sink: Optional[HiraParquetSink] = None,
+    registry: Optional[HospitalRegistry] = None,
+    refresh: bool = False
 ) -> List[Dict]:
     """
-    모든 병원의 상세정보를 가져오는 함수 (체크포인트 지원)
+    모든 병원의 상세정보를 가져오는 함수 (체크포인트, 비동기 동시 조회 지원)
+    
+    asyncio 작업자 max_concurrency개가 요청을 동시에 유지하고,
+    토큰 버킷(rate_limit)으로 초당 호출 수를 제한합니다.
+    체크포인트의 processed_indices에 있는 인덱스는 다시 조회하지 않습니다.
+    sink를 지정하면 앞 인덱스까지 모두 처리된 결과를 순서대로 바로 기록합니다.
     
     Parameters:
     -----------
@@ -283,117 +395,160 @@ def get_all_hospital_details(
         체크포인트 기능 활성화 여부
     checkpoint_file : str, optional
         체크포인트 파일 경로 (None이면 자동 생성)
+    max_concurrency : int
+        동시에 진행할 최대 요청 수 (기본값: 8)
+    rate_limit : float
+        초당 최대 API 호출 수 (0이면 제한 없음, 기본값: 10)
+    transport : httpx.AsyncBaseTransport, optional
+        HTTP 전송 계층 (테스트 시 로컬 스텁 지정, None이면 실제 네트워크)
+    sink : HiraParquetSink, optional
+        처리 즉시 결과를 기록할 저장기 (닫기는 호출한 쪽에서 처리)
+    registry : HospitalRegistry, optional
+        조회에 성공한 요양기호를 바로 조회 완료로 기록할 마스터 테이블
+        (상세정보 0건도 기록, 오류로 실패한 요양기호는 다음 실행에서 다시 조회)
+    refresh : bool
+        True이면 응답 캐시를 건너뛰고 새로 조회 (캐시는 새 응답으로 갱신)
+        needs_detail로 고른 변경 병원을 다시 조회할 때 사용
     
     Returns:
     --------
     list
-        모든 병원 상세정보 리스트
+        모든 병원 상세정보 리스트 (인덱스 순서)
     """
     
     # 체크포인트 파일 설정
     if enable_checkpoint and checkpoint_file is None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        checkpoint_file = f"checkpoint_detail_{timestamp}.json"
+        checkpoint_file = f"checkpoint_detail_{timestamp}.jsonl"
     
     # 이전 진행상황 로드
-    all_items = []
+    results: Dict[int, List[Dict]] = {}
     processed_indices = set()
-    start_index = 0
     
     if enable_checkpoint and checkpoint_file:
         checkpoint_data = load_checkpoint(checkpoint_file)
         if checkpoint_data:
-            all_items = checkpoint_data.get('items', [])
-            processed_indices = set(checkpoint_data.get('processed_indices', []))
-            start_index = checkpoint_data.get('last_index', 0) + 1
-            print(f"[재개] 인덱스 {start_index}부터 계속 진행합니다.")
+            results = checkpoint_data['results']
+            processed_indices = checkpoint_data['processed_indices']
+            print(f"[재개] 처리 완료된 {len(processed_indices)}건을 건너뛰고 계속 진행합니다.")
     
     total_count = len(hospital_df)
     if max_results:
         total_count = min(total_count, max_results)
     
+    pending_indices = [idx for idx in range(total_count) if idx not in processed_indices]
+    
+    def collect_items() -> List[Dict]:
+        return [item for idx in sorted(results) for item in results[idx]]
+    
+    # 저장기에 기록할 다음 인덱스
+    sink_state = {'next_idx': 0}
+    
+    def write_ready_results():
+        # 앞 인덱스가 모두 처리된 결과만 순서대로 기록
+        while sink_state['next_idx'] < total_count and sink_state['next_idx'] in processed_indices:
+            sink.write(results.get(sink_state['next_idx'], []))
+            sink_state['next_idx'] += 1
+    
+    if sink is not None:
+        # 이전 JSON 체크포인트에서 옮겨온 결과를 먼저 기록
+        sink.write(results.get(LEGACY_RESULT_KEY, []))
+        write_ready_results()
+    
     start_time = time.time()
     
-    try:
-        for idx in range(start_index, total_count):
-            # 이미 처리된 인덱스는 건너뛰기
-            if idx in processed_indices:
-                continue
-            
-            row = hospital_df.iloc[idx]
-            ykiho = row[ykiho_column]
-            
-            # 요양기호 유효성 확인
-            if pd.isna(ykiho) or str(ykiho).strip() == '':
-                print(f"[경고] 인덱스 {idx}: 요양기호가 비어있습니다. 건너뜁니다.")
-                processed_indices.add(idx)
-                continue
-            
-            # 진행률 계산
-            processed_count = len(processed_indices)
-            progress_pct = (processed_count / total_count * 100) if total_count > 0 else 0
-            elapsed_time = time.time() - start_time
-            
-            if processed_count > 0 and elapsed_time > 0:
-                items_per_sec = processed_count / elapsed_time
-                remaining_items = total_count - processed_count
-                eta_seconds = remaining_items / items_per_sec if items_per_sec > 0 else 0
-                eta_str = f", 예상 남은 시간: {int(eta_seconds)}초"
-            else:
-                eta_str = ""
+    async def fetch_one(client: AsyncHiraClient, bucket: AsyncTokenBucket, idx: int) -> List[Dict]:
+        row = hospital_df.iloc[idx]
+        ykiho = row[ykiho_column]
+        
+        # 요양기호 유효성 확인
+        if pd.isna(ykiho) or str(ykiho).strip() == '':
+            print(f"[경고] 인덱스 {idx}: 요양기호가 비어있습니다. 건너뜁니다.")
+            return []
+        
+        print(f"  - 인덱스 {idx}: {row.get('yadmNm', '알 수 없음')} (요양기호: {str(ykiho)[:20]}...)")
+        
+        try:
+            api_url, params = build_detail_request(service_key, use_encoded_key, ykiho)
+            # 캐시 미적중으로 실제 호출할 때만 토큰 소비
+            data = await client.get_json(api_url, params, limiter=bucket, refresh=refresh)
+            items = parse_detail_items(data, row, str(ykiho))
+            if not items:
+                print(f"  - 인덱스 {idx}: 상세정보 없음")
+            if registry is not None:
+                registry.mark_detail_fetched([str(ykiho)], DETAIL_OK if items else DETAIL_NO_DATA)
+            return items
+        except Exception as e:
+            # 오류가 발생해도 다음 항목으로 계속 진행
+            print(f"  - 인덱스 {idx}: 오류 발생: {e}")
+            return []
+    
+    async def crawl():
+        queue: asyncio.Queue = asyncio.Queue()
+        for idx in pending_indices:
+            queue.put_nowait(idx)
+        
+        bucket = AsyncTokenBucket(rate_limit)
+        async with AsyncHiraClient(
+            max_connections=max_concurrency,
+            max_retries=MAX_RETRIES,
+            retry_delay=RETRY_DELAY,
+            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+            transport=transport,
+            cache=get_default_cache()
+        ) as client:
             
-            print(f"[진행] {processed_count}/{total_count}건 ({progress_pct:.1f}%){eta_str}")
-            print(f"  - 인덱스 {idx}: {row.get('yadmNm', '알 수 없음')} (요양기호: {ykiho[:20]}...)")
+            async def worker():
+                while True:
+                    try:
+                        idx = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    items = await fetch_one(client, bucket, idx)
+                    results[idx] = items
+                    processed_indices.add(idx)
+                    
+                    # 처리된 인덱스의 결과만 체크포인트에 추가
+                    if enable_checkpoint and checkpoint_file:
+                        save_checkpoint(checkpoint_file, idx, items)
+                    
+                    if sink is not None:
+                        write_ready_results()
+                    
+                    # 진행률 계산
+                    processed_count = len(processed_indices)
+                    progress_pct = (processed_count / total_count * 100) if total_count > 0 else 0
+                    elapsed_time = time.time() - start_time
+                    done_this_run = processed_count - (total_count - len(pending_indices))
+                    
+                    if done_this_run > 0 and elapsed_time > 0:
+                        items_per_sec = done_this_run / elapsed_time
+                        remaining_items = total_count - processed_count
+                        eta_str = f", 예상 남은 시간: {int(remaining_items / items_per_sec)}초"
+                    else:
+                        eta_str = ""
+                    
+                    print(f"[진행] {processed_count}/{total_count}건 ({progress_pct:.1f}%){eta_str}")
+                    
+                    # 진행 정보 기록 (일정 간격마다)
+                    if enable_checkpoint and checkpoint_file and processed_count % CHECKPOINT_INTERVAL == 0:
+                        save_checkpoint(checkpoint_file, total_count=total_count, processed_count=processed_count)
             
-            # API 호출
+            workers = [asyncio.create_task(worker()) for _ in range(max(1, max_concurrency))]
             try:
-                data = get_hospital_detail(
-                    service_key=service_key,
-                    use_encoded_key=use_encoded_key,
-                    ykiho=ykiho
-                )
-                
-                # 응답 바디 확인
-                body = data['response']['body']
-                items = body.get('items', {}).get('item', {})
-                
-                # 단일 결과인 경우 처리
-                if isinstance(items, dict):
-                    items = [items]
-                
-                if items:
-                    # 원본 데이터와 병합
-                    for item in items:
-                        # 원본 행의 데이터 추가
-                        item['원본_병원명'] = row.get('yadmNm', '')
-                        item['원본_주소'] = row.get('addr', '')
-                        all_items.append(item)
-                else:
-                    print(f"  - 상세정보 없음")
-                
-                processed_indices.add(idx)
-                
-            except Exception as e:
-                print(f"  - 오류 발생: {e}")
-                # 오류가 발생해도 다음 항목으로 계속 진행
-                processed_indices.add(idx)
-                continue
-            
-            # 체크포인트 저장 (일정 간격마다)
-            if enable_checkpoint and checkpoint_file and len(processed_indices) % CHECKPOINT_INTERVAL == 0:
-                checkpoint_data = {
-                    'last_index': idx,
-                    'processed_count': len(processed_indices),
-                    'processed_indices': list(processed_indices),
-                    'total_count': total_count,
-                    'timestamp': datetime.now().isoformat(),
-                    'items': all_items
-                }
-                save_checkpoint(checkpoint_data, checkpoint_file)
-            
-            # API 호출 간격 (초당 요청 제한 고려)
-            time.sleep(0.1)
+                await asyncio.gather(*workers)
+            except BaseException:
+                for task in workers:
+                    task.cancel()
+                raise
+    
+    print(f"[계획] 전체 {total_count}건 중 {len(pending_indices)}건 조회 "
+          f"(동시 요청 {max_concurrency}개, 초당 {rate_limit}건 제한)")
+    
+    try:
+        asyncio.run(crawl())
         
+        all_items = collect_items()
         print(f"[완료] 총 {len(all_items)}건 조회 완료")
         
         # 완료 후 체크포인트 파일 삭제
@@ -406,19 +561,21 @@ def get_all_hospital_details(
         
         return all_items
         
-    except Exception as e:
-        # 오류 발생 시 현재까지의 데이터 체크포인트 저장
+    except BaseException as e:
+        # 오류(또는 Ctrl+C 중단) 발생 시 현재까지의 데이터 체크포인트 저장
         if enable_checkpoint and checkpoint_file:
-            checkpoint_data = {
-                'last_index': idx if 'idx' in locals() else 0,
-                'processed_count': len(processed_indices),
-                'processed_indices': list(processed_indices),
-                'total_count': total_count,
-                'timestamp': datetime.now().isoformat(),
-                'error': str(e),
-                'items': all_items
-            }
-            save_checkpoint(checkpoint_data, checkpoint_file)
+            save_checkpoint(
+                checkpoint_file,
+                total_count=total_count,
+                processed_count=len(processed_indices),
+                error=str(e) or type(e).__name__
+            )
+            
+            # 재개 시 빠르게 읽도록 인덱스별 최신 결과만 남김
+            try:
+                CheckpointLog(checkpoint_file).compact()
+            except Exception as compact_error:
+                print(f"[경고] 체크포인트 정리 실패: {compact_error}")
             print(f"\n[오류] 진행상황이 저장되었습니다. 다시 실행하면 이어서 진행됩니다.")
         raise
 
@@ -507,29 +664,46 @@ def main():
         print("3. Excel 파일이 열려있지 않은지 확인")
         return
     
+    # 변경된 병원만 조회 (병원정보 조회 스크립트의 동기화 결과 기준)
+    registry = HospitalRegistry() if USE_REGISTRY else None
+    if registry is not None:
+        hospital_df = filter_changed_hospitals(hospital_df, YKIHO_COLUMN, registry)
+        if hospital_df.empty:
+            print("[완료] 상세정보를 다시 조회할 병원이 없습니다.")
+            registry.close()
+            return
+    
     # ========================================
     # 3. API 호출
     # ========================================
     try:
-        # 모든 병원 상세정보 조회
-        details = get_all_hospital_details(
-            service_key=SERVICE_KEY,
-            use_encoded_key=USE_ENCODED_KEY,
-            hospital_df=hospital_df,
-            ykiho_column=YKIHO_COLUMN if YKIHO_COLUMN in hospital_df.columns else None
-        )
+        # 파일명 생성 (현재 날짜시간 포함)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_dir = Path("data")
+        output_dir.mkdir(exist_ok=True)
+        base_path = output_dir / f"병원상세정보_{timestamp}"
+        
+        # 모든 병원 상세정보 조회 (처리되는 대로 Parquet에 기록)
+        with HiraParquetSink(
+            base_path.with_suffix('.parquet'),
+            DETAIL_FIELD_TYPES,
+            csv_path=base_path.with_suffix('.csv') if SAVE_CSV else None
+        ) as sink:
+            details = get_all_hospital_details(
+                service_key=SERVICE_KEY,
+                use_encoded_key=USE_ENCODED_KEY,
+                hospital_df=hospital_df,
+                ykiho_column=YKIHO_COLUMN if YKIHO_COLUMN in hospital_df.columns else None,
+                sink=sink,
+                registry=registry,
+                refresh=registry is not None  # 변경된 병원은 캐시가 아닌 최신 상세정보로 조회
+            )
         
         # ========================================
-        # 4. 엑셀 저장
+        # 4. 엑셀 저장 (선택)
         # ========================================
-        if details:
-            # 파일명 생성 (현재 날짜시간 포함)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_dir = Path("data")
-            output_dir.mkdir(exist_ok=True)
-            filename = output_dir / f"병원상세정보_{timestamp}.xlsx"
-            
-            save_to_excel(details, str(filename))
+        if SAVE_EXCEL and details:
+            parquet_to_excel(base_path.with_suffix('.parquet'), base_path.with_suffix('.xlsx'))
         
     except Exception as e:
         print(f"[오류 발생] {e}")
@@ -539,6 +713,17 @@ def main():
         print("2. 인터넷 연결 확인")
         print("3. API 엔드포인트가 올바른지 확인")
         print("4. 체크포인트 파일이 있다면 삭제 후 재시도")
+    
+    if registry is not None:
+        registry.close()
+    
+    # ========================================
+    # 캐시 적중/미적중 요약
+    # ========================================
+    cache = get_default_cache()
+    if cache is not None:
+        print()
+        print(cache.summary())
 
 
 # ============================================================================
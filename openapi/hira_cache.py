@@ -0,0 +1,229 @@
+"""
+HIRA OpenAPI 응답 로컬 캐시 (SQLite)
+================================================================================
+작성일: 2026-10-18
+목적: 지역/진료과목이 겹치는 재실행에서 같은 페이지/요양기호를 다시 받지 않도록
+      정상 응답(JSON)을 디스크에 저장하고 재사용
+      - 키: 엔드포인트 + 정규화된 파라미터 (sidoCd, sgguCd, clCd, dgsbjtCd, pageNo, ykiho 등)
+      - 인증키(ServiceKey)와 응답 형식(_type)은 키에서 제외
+      - TTL 만료 항목은 조회 시 무시/삭제 (전체 정리는 주기적으로), 전체 크기 초과 시 오래 사용하지 않은 항목부터 삭제
+      - 전체 크기는 열 때 한 번 집계한 뒤 저장/삭제마다 누적 갱신 (저장 1건당 전체 테이블을 다시 합산하지 않음)
+      - 적중/미적중 건수 집계 (실행 종료 시 요약 출력)
+================================================================================
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+# ============================================================================
+# 설정 (Configuration)
+# ============================================================================
+
+CACHE_ENABLED = True                                          # 응답 캐시 사용 여부
+CACHE_PATH = Path(__file__).resolve().parent / "cache" / "hira_responses.sqlite"
+CACHE_TTL_SEC = 24 * 60 * 60                                  # 캐시 유효 시간 (초, 기본 1일)
+CACHE_MAX_BYTES = 512 * 1024 * 1024                           # 캐시 최대 크기 (바이트, 기본 512MB)
+CACHE_SWEEP_INTERVAL_SEC = 10 * 60                            # 만료 항목 일괄 삭제 주기 (초)
+
+# 캐시 키에서 제외할 파라미터 (인증 정보, 응답 형식)
+EXCLUDED_PARAMS = {'ServiceKey', 'serviceKey', '_type'}
+
+
+def make_cache_key(api_url: str, params: Dict) -> str:
+    """
+    엔드포인트와 정규화된 파라미터로 캐시 키 생성
+
+    Parameters:
+    -----------
+    api_url : str
+        API 주소 (URL에 포함된 ServiceKey 등 쿼리는 무시)
+    params : dict
+        요청 파라미터
+
+    Returns:
+    --------
+    str
+        예: 'http://.../getHospBasisList?dgsbjtCd=14&numOfRows=100&pageNo=1&sidoCd=110000'
+    """
+    endpoint = api_url.split('?', 1)[0]
+    normalized = sorted(
+        (key, str(value).strip())
+        for key, value in params.items()
+        if key not in EXCLUDED_PARAMS and value is not None and str(value).strip() != ''
+    )
+    return endpoint + '?' + '&'.join(f"{key}={value}" for key, value in normalized)
+
+
+class ResponseCache:
+    """
+    SQLite 기반 API 응답 캐시 (여러 스레드에서 공유 가능)
+
+    Parameters:
+    -----------
+    path : str or Path
+        SQLite 파일 경로
+    ttl_sec : float
+        캐시 유효 시간 (초)
+    max_bytes : int
+        저장된 응답의 최대 합계 크기 (바이트)
+    """
+
+    def __init__(
+        self,
+        path=CACHE_PATH,
+        ttl_sec: float = CACHE_TTL_SEC,
+        max_bytes: int = CACHE_MAX_BYTES
+    ):
+        self.path = Path(path)
+        self.ttl_sec = ttl_sec
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON responses(accessed_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_created ON responses(created_at)")
+        self._conn.commit()
+
+        # 저장된 응답 크기 합계 (열 때 한 번만 집계, 이후 저장/삭제 시 갱신)
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        self._last_sweep = 0.0
+        with self._lock:
+            self._sweep_expired()
+            self._conn.commit()
+
+    def get(self, api_url: str, params: Dict) -> Optional[Dict]:
+        """
+        캐시된 응답 조회 (만료된 항목은 삭제 후 None)
+
+        Returns:
+        --------
+        dict or None
+            캐시된 API 응답 또는 None
+        """
+        key = make_cache_key(api_url, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or now - row[1] > self.ttl_sec:
+                if row is not None:
+                    self._delete(key)
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, api_url: str, params: Dict, data: Dict):
+        """
+        응답 저장 후 최대 크기를 넘으면 오래 사용하지 않은 항목부터 삭제
+        """
+        key = make_cache_key(api_url, params)
+        body = json.dumps(data, ensure_ascii=False)
+        size = len(body.encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, body, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, body, size, now, now)
+            )
+            self._total_bytes += size - (old[0] if old else 0)
+            if now - self._last_sweep >= CACHE_SWEEP_INTERVAL_SEC:
+                self._sweep_expired()
+            self._evict()
+            self._conn.commit()
+
+    def _delete(self, key: str):
+        """항목 하나 삭제 및 크기 합계 갱신 (락 보유 상태에서 호출)"""
+        row = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._total_bytes -= row[0]
+
+    def _sweep_expired(self):
+        """만료 항목 일괄 삭제 (CACHE_SWEEP_INTERVAL_SEC마다, 락 보유 상태에서 호출)"""
+        cutoff = time.time() - self.ttl_sec
+        expired = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses WHERE created_at < ?", (cutoff,)
+        ).fetchone()[0]
+        if expired:
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (cutoff,))
+            self._total_bytes -= expired
+        self._last_sweep = time.time()
+
+    def _evict(self):
+        """크기 제한 초과분을 LRU 순으로 삭제 (락 보유 상태에서 호출)"""
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        excess = self._total_bytes - self.max_bytes
+        removed = 0
+        keys = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            keys.append((key,))
+            removed += size
+            if removed >= excess:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", keys)
+        self._total_bytes -= removed
+
+    def summary(self) -> str:
+        """적중/미적중 요약 문자열"""
+        total = self.hits + self.misses
+        hit_pct = (self.hits / total * 100) if total > 0 else 0
+        return (f"[캐시 요약] 요청 {total}건 중 적중 {self.hits}건 ({hit_pct:.1f}%), "
+                f"미적중 {self.misses}건 - 절약한 API 호출 {self.hits}건")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[ResponseCache]:
+    """
+    프로세스 전체에서 공유하는 기본 캐시 반환 (CACHE_ENABLED가 False이면 None)
+
+    Returns:
+    --------
+    ResponseCache or None
+        공용 캐시
+    """
+    global _default_cache
+    if not CACHE_ENABLED:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
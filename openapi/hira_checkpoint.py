@@ -0,0 +1,157 @@
+"""
+HIRA OpenAPI 크롤러용 추가 전용(append-only) JSONL 체크포인트
+================================================================================
+작성일: 2026-10-18
+목적: 체크포인트 저장 시 전체 items를 다시 쓰지 않고 새 결과만 한 줄씩 추가
+      - result 레코드: 페이지 번호(또는 인덱스)별 조회 결과
+      - progress 레코드: 전체 건수, 시각, 오류 메시지 등 작은 진행 정보
+      - load: 로그를 한 줄씩 읽어 상태 복원 (마지막 줄이 잘려 있으면 무시)
+      - compact: 키별 최신 결과 + 최종 진행 정보만 남기도록 로그 재작성
+      - rewrite: 주어진 상태로 로그 전체를 원자적으로 교체 (이전 형식 변환 등)
+================================================================================
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class CheckpointLog:
+    """
+    추가 전용 JSONL 체크포인트 로그
+
+    레코드 형식 (한 줄에 하나):
+        {"type": "result", "key": 3, "items": [...]}
+        {"type": "progress", "timestamp": "...", "total_count": 1234, ...}
+
+    같은 key가 여러 번 기록되면 마지막 레코드가 유효합니다.
+
+    Parameters:
+    -----------
+    path : str
+        체크포인트 파일 경로 (.jsonl)
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+
+    def _append(self, record: Dict):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+
+    def append_result(self, key: int, items: List[Dict]):
+        """
+        조회 결과 한 건(페이지 또는 인덱스) 추가
+
+        Parameters:
+        -----------
+        key : int
+            페이지 번호 또는 행 인덱스
+        items : list
+            해당 키의 조회 결과 (결과 없음은 빈 리스트)
+        """
+        self._append({'type': 'result', 'key': key, 'items': items})
+
+    def append_progress(self, **fields):
+        """
+        진행 정보 레코드 추가 (total_count, error 등)
+        """
+        record = {'type': 'progress', 'timestamp': datetime.now().isoformat()}
+        record.update(fields)
+        self._append(record)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def is_legacy_json(self) -> bool:
+        """
+        이전 형식(json.dump로 저장한 단일 JSON 객체) 체크포인트인지 확인
+
+        첫 줄이 type 필드를 가진 JSONL 레코드가 아니면 이전 형식으로 판단합니다.
+        """
+        if not self.exists():
+            return False
+        with open(self.path, 'r', encoding='utf-8') as f:
+            first_line = f.readline().strip()
+        if not first_line:
+            return False
+        try:
+            return 'type' not in json.loads(first_line)
+        except json.JSONDecodeError:
+            return True
+
+    def load(self) -> Optional[Dict]:
+        """
+        로그를 스트리밍으로 읽어 상태 복원
+
+        Returns:
+        --------
+        dict or None
+            {'results': {key: items}, 'progress': 마지막 진행 정보(누적)}
+            파일이 없으면 None
+        """
+        if not self.exists():
+            return None
+
+        results: Dict[int, List[Dict]] = {}
+        progress: Dict = {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 기록 도중 중단되어 잘린 줄은 건너뜀
+                    continue
+
+                if record.get('type') == 'result':
+                    results[int(record['key'])] = record.get('items', [])
+                elif record.get('type') == 'progress':
+                    progress.update({k: v for k, v in record.items() if k != 'type'})
+
+        return {'results': results, 'progress': progress}
+
+    def compact(self):
+        """
+        키별 최신 결과와 누적 진행 정보만 남기도록 로그 재작성
+
+        임시 파일에 쓴 뒤 교체하므로 도중에 중단되어도 기존 로그는 보존됩니다.
+        """
+        state = self.load()
+        if state is None:
+            return
+        self.rewrite(state['results'], state['progress'])
+
+    def rewrite(self, results: Dict[int, List[Dict]], progress: Optional[Dict] = None):
+        """
+        로그 전체를 주어진 결과와 진행 정보로 교체
+
+        임시 파일에 쓴 뒤 os.replace로 교체하므로 도중에 중단되어도
+        기존 파일(이전 형식 체크포인트 포함)은 그대로 남습니다.
+
+        Parameters:
+        -----------
+        results : dict
+            키 -> 조회 결과
+        progress : dict, optional
+            진행 정보 (total_count 등)
+        """
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for key in sorted(results):
+                record = {'type': 'result', 'key': key, 'items': results[key]}
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            if progress:
+                record = {'type': 'progress'}
+                record.update(progress)
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        os.replace(tmp_path, self.path)
+
+    def remove(self):
+        """체크포인트 파일 삭제"""
+        if self.exists():
+            os.remove(self.path)
@@ -0,0 +1,475 @@
+"""
+건강보험심사평가원(HIRA) OpenAPI 공용 HTTP 클라이언트
+================================================================================
+작성일: 2026-10-18
+목적: getHospBasisList / getHospDetailList 스크립트가 공유하는 HTTP 세션 관리
+      - requests.Session + HTTPAdapter 연결 풀 (keep-alive로 TCP 연결 재사용)
+      - 기존 스크립트의 재시도/지수 백오프 정책을 한 곳에서 처리
+      - 응답 헤더(resultCode) 검증
+      - httpx 기반 비동기 클라이언트 + 토큰 버킷 속도 제한 (대량 상세정보 조회용)
+      - 로컬 응답 캐시(hira_cache.ResponseCache) 연동
+================================================================================
+"""
+
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from hira_cache import ResponseCache, get_default_cache
+
+# ============================================================================
+# 설정 (Configuration)
+# ============================================================================
+
+# 재시도 설정
+MAX_RETRIES = 3          # 최대 재시도 횟수
+RETRY_DELAY = 1          # 초기 재시도 대기 시간 (초)
+
+# 타임아웃 설정
+CONNECT_TIMEOUT = 10     # 연결 타임아웃 (초)
+READ_TIMEOUT = 60        # 읽기 타임아웃 (초)
+
+# 연결 풀 설정
+POOL_CONNECTIONS = 4     # 호스트별 연결 풀 개수
+POOL_MAXSIZE = 16        # 풀당 최대 유지 연결 수 (동시 조회 수 이상으로 설정)
+
+
+def check_response_header(data: Dict) -> Dict:
+    """
+    API 응답 헤더(resultCode) 확인
+
+    Parameters:
+    -----------
+    data : dict
+        JSON 파싱된 API 응답
+
+    Returns:
+    --------
+    dict
+        정상 응답이면 data를 그대로 반환
+
+    Raises:
+    -------
+    KeyError
+        응답에 response.header가 없을 때
+    Exception
+        resultCode가 '00'이 아닐 때
+    """
+    header = data['response']['header']
+    if header['resultCode'] != '00':
+        raise Exception(f"API 오류 [{header['resultCode']}]: {header['resultMsg']}")
+    return data
+
+
+def parse_response(response) -> Dict:
+    """
+    HTTP 상태 코드 확인 후 JSON 파싱 및 API 응답 헤더 확인
+    (requests.Response, httpx.Response 공용)
+    """
+    response.raise_for_status()
+    return check_response_header(response.json())
+
+
+def classify_error(
+    error: Exception,
+    error_types: Tuple[type, type, type],
+    timeout: Tuple[int, int]
+) -> Tuple[Exception, bool]:
+    """
+    get_json 호출 중 발생한 예외를 사용자용 오류 메시지와 재시도 여부로 변환
+    (HiraClient, AsyncHiraClient 공용)
+
+    Parameters:
+    -----------
+    error : Exception
+        발생한 예외
+    error_types : tuple
+        HTTP 라이브러리별 (타임아웃, 연결 오류, HTTP 상태 오류) 예외 클래스
+    timeout : tuple
+        (연결 타임아웃, 읽기 타임아웃) 초 단위 (메시지용)
+
+    Returns:
+    --------
+    tuple
+        (오류 예외, 재시도 가능 여부)
+        HTTP 상태 오류(인증 오류 등)와 응답 형식 오류는 재시도하지 않음
+    """
+    timeout_error, connection_error, http_error = error_types
+    if isinstance(error, timeout_error):
+        connect_timeout, read_timeout = timeout
+        return Exception(f"API 호출 시간 초과 (연결: {connect_timeout}초, 읽기: {read_timeout}초)"), True
+    if isinstance(error, connection_error):
+        return Exception("네트워크 연결 오류. 인터넷 연결을 확인하세요."), True
+    if isinstance(error, http_error):
+        # HTTP 에러 발생 시 응답 내용 출력
+        error_msg = f"HTTP 오류: {error}"
+        try:
+            error_response = error.response.text
+            print(f"\n[API 응답 내용]\n{error_response}\n")
+            error_msg += f"\n응답 내용: {error_response}"
+        except:
+            pass
+        return Exception(error_msg), False
+    if isinstance(error, KeyError):
+        return Exception(f"응답 데이터 형식 오류: {error}"), False
+    return Exception(f"예상치 못한 오류: {error}"), True
+
+
+# ============================================================================
+# 클라이언트
+# ============================================================================
+
+class HiraClient:
+    """
+    HIRA OpenAPI 호출용 공용 클라이언트
+
+    하나의 requests.Session을 유지하여 페이지/요양기호마다 새 TCP 연결을
+    맺지 않고 연결 풀의 keep-alive 연결을 재사용합니다.
+    여러 스레드에서 동시에 get_json을 호출해도 됩니다.
+
+    Parameters:
+    -----------
+    pool_connections : int
+        호스트별 연결 풀 개수 (기본값: 4)
+    pool_maxsize : int
+        풀당 최대 유지 연결 수 (기본값: 16)
+    max_retries : int
+        최대 재시도 횟수 (기본값: 3)
+    retry_delay : int
+        초기 재시도 대기 시간 (기본값: 1초)
+    timeout : tuple
+        (연결 타임아웃, 읽기 타임아웃) 초 단위
+    cache : ResponseCache, optional
+        응답 캐시 (None이면 캐시 사용 안 함)
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = POOL_CONNECTIONS,
+        pool_maxsize: int = POOL_MAXSIZE,
+        max_retries: int = MAX_RETRIES,
+        retry_delay: int = RETRY_DELAY,
+        timeout: Tuple[int, int] = (CONNECT_TIMEOUT, READ_TIMEOUT),
+        cache: Optional[ResponseCache] = None
+    ):
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+        self.cache = cache
+
+        # 재시도는 get_json에서 직접 처리하므로 어댑터 재시도는 끔
+        # pool_block=True: 풀이 가득 차면 새 연결을 버리지 않고 반납을 기다림
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=0,
+            pool_block=True
+        )
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Connection': 'keep-alive'})
+
+    def get_json(
+        self,
+        api_url: str,
+        params: Dict,
+        max_retries: Optional[int] = None,
+        retry_delay: Optional[int] = None,
+        timeout: Optional[Tuple[int, int]] = None,
+        throttle: Optional[Callable[[], None]] = None,
+        refresh: bool = False
+    ) -> Dict:
+        """
+        GET 요청 후 JSON 응답 반환 (재시도 로직 포함)
+
+        Parameters:
+        -----------
+        api_url : str
+            API 주소 (인코딩 키 사용 시 ServiceKey 포함)
+        params : dict
+            요청 파라미터
+        max_retries, retry_delay, timeout : optional
+            None이면 클라이언트 기본값 사용
+        throttle : callable, optional
+            실제 API를 호출하기 직전(재시도 포함 매 시도)에 부르는 속도 제한 함수
+            (예: RateLimiter.wait). 캐시 적중 시에는 부르지 않음
+        refresh : bool
+            True이면 캐시를 읽지 않고 API를 호출한 뒤 캐시를 새 응답으로 갱신
+            (변경 감지용 동기화처럼 최신 응답이 필요한 경우)
+
+        Returns:
+        --------
+        dict
+            API 응답 데이터 (JSON 형식)
+
+        Raises:
+        -------
+        Exception
+            API 호출 실패 시 예외 발생
+        """
+        max_retries = self.max_retries if max_retries is None else max_retries
+        retry_delay = self.retry_delay if retry_delay is None else retry_delay
+        connect_timeout, read_timeout = self.timeout if timeout is None else timeout
+
+        # 캐시 적중 시 API를 호출하지 않음 (속도 제한도 거치지 않음)
+        if self.cache is not None and not refresh:
+            cached = self.cache.get(api_url, params)
+            if cached is not None:
+                return cached
+
+        error_types = (
+            requests.exceptions.Timeout,
+            requests.exceptions.ConnectionError,
+            requests.exceptions.HTTPError
+        )
+        last_exception = None
+        for attempt in range(max_retries + 1):
+            if attempt > 0:
+                wait_time = retry_delay * (2 ** (attempt - 1))  # 지수 백오프
+                print(f"[재시도 {attempt}/{max_retries}] {wait_time}초 대기 중...")
+                time.sleep(wait_time)
+            # 재시도도 실제 호출이므로 매번 속도 제한을 거침
+            if throttle is not None:
+                throttle()
+
+            try:
+                response = self.session.get(
+                    api_url,
+                    params=params,
+                    timeout=(connect_timeout, read_timeout)
+                )
+
+                data = parse_response(response)
+                if self.cache is not None:
+                    self.cache.put(api_url, params, data)
+                return data
+
+            except Exception as e:
+                last_exception, retryable = classify_error(e, error_types, (connect_timeout, read_timeout))
+                if not retryable:
+                    break
+                if attempt < max_retries:
+                    print(f"[경고] {last_exception}")
+
+        # 모든 재시도 실패
+        raise last_exception
+
+    def close(self):
+        """연결 풀 정리"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+_default_client: Optional[HiraClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> HiraClient:
+    """
+    프로세스 전체에서 공유하는 기본 클라이언트 반환 (최초 호출 시 생성)
+
+    CACHE_ENABLED이면 공용 응답 캐시(hira_cache.get_default_cache)를 사용합니다.
+
+    Returns:
+    --------
+    HiraClient
+        공용 클라이언트
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HiraClient(cache=get_default_cache())
+        return _default_client
+
+
+# ============================================================================
+# 비동기 클라이언트
+# ============================================================================
+
+class AsyncTokenBucket:
+    """
+    asyncio용 토큰 버킷 속도 제한기
+
+    초당 rate개의 토큰이 채워지고, 최대 capacity개까지 쌓입니다.
+    호출 전 acquire()로 토큰 1개를 소비합니다.
+    이벤트 루프 안에서 생성해야 합니다.
+
+    Parameters:
+    -----------
+    rate : float
+        초당 허용 호출 수 (0 이하이면 제한 없음)
+    capacity : int, optional
+        순간 최대 호출 수 (None이면 rate와 같음)
+    """
+
+    def __init__(self, rate: float, capacity: Optional[int] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """토큰 1개를 얻을 때까지 대기"""
+        if not self.rate or self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncHiraClient:
+    """
+    httpx.AsyncClient 기반 HIRA OpenAPI 비동기 클라이언트
+
+    HiraClient와 같은 재시도/지수 백오프 정책을 따릅니다.
+    transport를 지정하면 실제 네트워크 대신 로컬 스텁(httpx.MockTransport 등)으로
+    요청을 보낼 수 있습니다. 이벤트 루프 안에서 생성해야 합니다.
+
+    Parameters:
+    -----------
+    max_connections : int
+        최대 동시 연결 수 (기본값: 16)
+    max_retries : int
+        최대 재시도 횟수 (기본값: 3)
+    retry_delay : int
+        초기 재시도 대기 시간 (기본값: 1초)
+    timeout : tuple
+        (연결 타임아웃, 읽기 타임아웃) 초 단위
+    transport : httpx.AsyncBaseTransport, optional
+        요청 전송 계층 (None이면 기본 네트워크 전송)
+    cache : ResponseCache, optional
+        응답 캐시 (None이면 캐시 사용 안 함)
+    """
+
+    def __init__(
+        self,
+        max_connections: int = POOL_MAXSIZE,
+        max_retries: int = MAX_RETRIES,
+        retry_delay: int = RETRY_DELAY,
+        timeout: Tuple[int, int] = (CONNECT_TIMEOUT, READ_TIMEOUT),
+        transport=None,
+        cache: Optional[ResponseCache] = None
+    ):
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("비동기 조회에는 httpx가 필요합니다. 'pip install httpx'로 설치하세요.")
+
+        self._httpx = httpx
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+        self.cache = cache
+
+        connect_timeout, read_timeout = timeout
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            transport=transport
+        )
+
+    async def get_json(
+        self,
+        api_url: str,
+        params: Dict,
+        max_retries: Optional[int] = None,
+        retry_delay: Optional[int] = None,
+        limiter: Optional[AsyncTokenBucket] = None,
+        refresh: bool = False
+    ) -> Dict:
+        """
+        비동기 GET 요청 후 JSON 응답 반환 (재시도 로직 포함)
+
+        Parameters:
+        -----------
+        api_url : str
+            API 주소 (인코딩 키 사용 시 ServiceKey 포함)
+        params : dict
+            요청 파라미터
+        max_retries, retry_delay : optional
+            None이면 클라이언트 기본값 사용
+        limiter : AsyncTokenBucket, optional
+            실제 API를 호출하기 직전(재시도 포함 매 시도)에 토큰을 얻는 속도 제한기
+            (캐시 적중 시에는 소비하지 않음)
+        refresh : bool
+            True이면 캐시를 읽지 않고 API를 호출한 뒤 캐시를 새 응답으로 갱신
+
+        Returns:
+        --------
+        dict
+            API 응답 데이터 (JSON 형식)
+
+        Raises:
+        -------
+        Exception
+            API 호출 실패 시 예외 발생
+        """
+        httpx = self._httpx
+        max_retries = self.max_retries if max_retries is None else max_retries
+        retry_delay = self.retry_delay if retry_delay is None else retry_delay
+        connect_timeout, read_timeout = self.timeout
+
+        # 캐시 적중 시 API를 호출하지 않음 (속도 제한 토큰도 소비하지 않음)
+        if self.cache is not None and not refresh:
+            cached = self.cache.get(api_url, params)
+            if cached is not None:
+                return cached
+
+        error_types = (httpx.TimeoutException, httpx.TransportError, httpx.HTTPStatusError)
+        last_exception = None
+        for attempt in range(max_retries + 1):
+            if attempt > 0:
+                wait_time = retry_delay * (2 ** (attempt - 1))  # 지수 백오프
+                print(f"[재시도 {attempt}/{max_retries}] {wait_time}초 대기 중...")
+                await asyncio.sleep(wait_time)
+            # 재시도도 실제 호출이므로 매번 토큰을 얻음 (백오프 중 초당 호출 한도 초과 방지)
+            if limiter is not None:
+                await limiter.acquire()
+
+            try:
+                response = await self.client.get(api_url, params=params)
+
+                data = parse_response(response)
+                if self.cache is not None:
+                    self.cache.put(api_url, params, data)
+                return data
+
+            except Exception as e:
+                last_exception, retryable = classify_error(e, error_types, (connect_timeout, read_timeout))
+                if not retryable:
+                    break
+                if attempt < max_retries:
+                    print(f"[경고] {last_exception}")
+
+        # 모든 재시도 실패
+        raise last_exception
+
+    async def aclose(self):
+        """연결 풀 정리"""
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
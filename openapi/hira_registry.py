@@ -0,0 +1,274 @@
+"""
+HIRA 병원 목록 증분 동기화 (로컬 마스터 테이블, SQLite)
+================================================================================
+작성일: 2026-10-18
+목적: 매일 전체 목록을 새로 저장하는 대신 ykiho 기준 마스터 테이블과 비교하여
+      변경분만 기록하고, 변경 없는 병원은 상세정보 재조회를 건너뜀
+      - 신규(insert) / 변경(update) / 폐업·조회 범위 이탈(close) / 재등장(reopen) 이력 기록
+      - 폐업 판단은 같은 조회 범위(scope)의 이전 목록과 비교 (예: '서울 강남구 피부과')
+      - 상세정보는 마지막 상세 조회 이후 내용이 바뀐 병원만 다시 조회
+        (상세정보가 없는 병원, 마스터 테이블에 없는 ykiho도 조회 완료로 기록)
+================================================================================
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# ============================================================================
+# 설정 (Configuration)
+# ============================================================================
+
+REGISTRY_PATH = Path(__file__).resolve().parent / "cache" / "hira_registry.sqlite"
+
+# 상세 조회 결과 상태
+DETAIL_OK = 'ok'            # 상세정보 수신
+DETAIL_NO_DATA = 'no_data'  # 정상 응답이지만 항목 0건
+
+# 변경 비교에서 제외할 항목 (조회 조건에 따라 달라지는 값)
+VOLATILE_FIELDS = {'distance', '조회조건'}
+
+
+def content_hash(item: Dict) -> str:
+    """
+    병원 항목의 내용 해시 (항목 순서 무관, VOLATILE_FIELDS 제외)
+    """
+    stable = {k: v for k, v in item.items() if k not in VOLATILE_FIELDS}
+    body = json.dumps(stable, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(body.encode('utf-8')).hexdigest()
+
+
+class HospitalRegistry:
+    """
+    ykiho 기준 병원 마스터 테이블과 변경 이력
+
+    Parameters:
+    -----------
+    path : str or Path
+        SQLite 파일 경로
+    """
+
+    def __init__(self, path=REGISTRY_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS hospitals (
+                ykiho TEXT PRIMARY KEY,
+                body TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                closed_at TEXT,
+                detail_hash TEXT,
+                detail_fetched_at TEXT,
+                detail_status TEXT
+            );
+            CREATE TABLE IF NOT EXISTS unlisted_details (
+                ykiho TEXT PRIMARY KEY,
+                detail_status TEXT NOT NULL,
+                detail_fetched_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS scope_members (
+                scope TEXT NOT NULL,
+                ykiho TEXT NOT NULL,
+                PRIMARY KEY (scope, ykiho)
+            );
+            CREATE TABLE IF NOT EXISTS changes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ykiho TEXT NOT NULL,
+                scope TEXT,
+                change_type TEXT NOT NULL,
+                changed_at TEXT NOT NULL,
+                old_hash TEXT,
+                new_hash TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_changes_at ON changes(changed_at);
+            """
+        )
+        # 이전 버전에서 만든 파일에는 detail_status 컬럼이 없음
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(hospitals)")}
+        if 'detail_status' not in columns:
+            self._conn.execute("ALTER TABLE hospitals ADD COLUMN detail_status TEXT")
+        self._conn.commit()
+
+    def sync(self, items: Iterable[Dict], scope: str) -> Dict[str, int]:
+        """
+        새로 조회한 목록을 마스터 테이블과 비교하여 반영
+
+        Parameters:
+        -----------
+        items : iterable
+            get_all_hospitals 결과 (ykiho 없는 항목은 무시)
+        scope : str
+            조회 범위 이름 (예: '서울 강남구 피부과'). 같은 범위의 이전 목록에 있었는데
+            이번 목록에 없는 병원은 close로 기록합니다.
+
+        Returns:
+        --------
+        dict
+            {'insert': n, 'update': n, 'reopen': n, 'close': n, 'unchanged': n}
+        """
+        now = datetime.now().isoformat(timespec='seconds')
+        counts = {'insert': 0, 'update': 0, 'reopen': 0, 'close': 0, 'unchanged': 0}
+
+        with self._lock:
+            conn = self._conn
+            previous = {row[0] for row in conn.execute(
+                "SELECT ykiho FROM scope_members WHERE scope = ?", (scope,))}
+            seen = set()
+
+            for item in items:
+                ykiho = item.get('ykiho')
+                if not ykiho or ykiho in seen:
+                    continue
+                seen.add(ykiho)
+                new_hash = content_hash(item)
+                body = json.dumps(item, ensure_ascii=False, default=str)
+
+                row = conn.execute(
+                    "SELECT content_hash, closed_at FROM hospitals WHERE ykiho = ?", (ykiho,)
+                ).fetchone()
+
+                if row is None:
+                    change_type = 'insert'
+                    conn.execute(
+                        "INSERT INTO hospitals (ykiho, body, content_hash, first_seen, last_seen, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (ykiho, body, new_hash, now, now, now)
+                    )
+                elif row[1] is not None or row[0] != new_hash:
+                    change_type = 'reopen' if row[1] is not None else 'update'
+                    conn.execute(
+                        "UPDATE hospitals SET body = ?, content_hash = ?, last_seen = ?, updated_at = ?, "
+                        "closed_at = NULL WHERE ykiho = ?",
+                        (body, new_hash, now, now, ykiho)
+                    )
+                else:
+                    change_type = 'unchanged'
+                    conn.execute("UPDATE hospitals SET last_seen = ? WHERE ykiho = ?", (now, ykiho))
+
+                counts[change_type] += 1
+                if change_type != 'unchanged':
+                    conn.execute(
+                        "INSERT INTO changes (ykiho, scope, change_type, changed_at, old_hash, new_hash) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (ykiho, scope, change_type, now, row[0] if row else None, new_hash)
+                    )
+                if ykiho not in previous:
+                    conn.execute("INSERT OR IGNORE INTO scope_members (scope, ykiho) VALUES (?, ?)", (scope, ykiho))
+
+            # 이번 조회에서 사라진 병원: 범위에서 제외하고, 어느 범위에도 없으면 폐업 처리
+            for ykiho in previous - seen:
+                conn.execute("DELETE FROM scope_members WHERE scope = ? AND ykiho = ?", (scope, ykiho))
+                conn.execute(
+                    "INSERT INTO changes (ykiho, scope, change_type, changed_at) VALUES (?, ?, 'close', ?)",
+                    (ykiho, scope, now)
+                )
+                remaining = conn.execute(
+                    "SELECT 1 FROM scope_members WHERE ykiho = ? LIMIT 1", (ykiho,)
+                ).fetchone()
+                if remaining is None:
+                    conn.execute("UPDATE hospitals SET closed_at = ? WHERE ykiho = ?", (now, ykiho))
+                counts['close'] += 1
+
+            conn.commit()
+
+        print(f"[동기화] {scope}: 신규 {counts['insert']}건, 변경 {counts['update']}건, "
+              f"재등장 {counts['reopen']}건, 제외 {counts['close']}건, 변경 없음 {counts['unchanged']}건")
+        return counts
+
+    def needs_detail(self, ykihos: Iterable[str]) -> List[str]:
+        """
+        상세정보를 다시 조회해야 하는 ykiho 목록
+
+        상세 조회 기록이 없거나, 상세 조회 이후 내용이 바뀐 병원만 반환합니다.
+        (폐업 처리된 병원, 마스터 테이블에 없지만 이미 조회한 ykiho는 제외)
+        """
+        result = []
+        with self._lock:
+            for ykiho in ykihos:
+                row = self._conn.execute(
+                    "SELECT content_hash, detail_hash, closed_at FROM hospitals WHERE ykiho = ?", (ykiho,)
+                ).fetchone()
+                if row is None:
+                    fetched = self._conn.execute(
+                        "SELECT 1 FROM unlisted_details WHERE ykiho = ?", (ykiho,)
+                    ).fetchone()
+                    if fetched is None:
+                        result.append(ykiho)
+                elif row[2] is None and row[0] != row[1]:
+                    result.append(ykiho)
+        return result
+
+    def mark_detail_fetched(self, ykihos: Iterable[str], status: str = DETAIL_OK):
+        """
+        상세정보 조회 완료 기록 (현재 내용 해시 기준)
+
+        Parameters:
+        -----------
+        ykihos : iterable
+            조회를 마친 ykiho (오류로 실패한 ykiho는 넣지 않음)
+        status : str
+            DETAIL_OK(상세정보 수신) 또는 DETAIL_NO_DATA(항목 0건)
+            마스터 테이블에 없는 ykiho는 unlisted_details에 기록하여 다시 조회하지 않습니다.
+        """
+        now = datetime.now().isoformat(timespec='seconds')
+        with self._lock:
+            for ykiho in ykihos:
+                updated = self._conn.execute(
+                    "UPDATE hospitals SET detail_hash = content_hash, detail_fetched_at = ?, detail_status = ? "
+                    "WHERE ykiho = ?",
+                    (now, status, ykiho)
+                ).rowcount
+                if not updated:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO unlisted_details (ykiho, detail_status, detail_fetched_at) "
+                        "VALUES (?, ?, ?)",
+                        (ykiho, status, now)
+                    )
+            self._conn.commit()
+
+    def changes_since(self, since: Optional[str] = None) -> List[Dict]:
+        """
+        변경 이력 조회
+
+        Parameters:
+        -----------
+        since : str, optional
+            ISO 형식 시각 (예: '2026-10-18T00:00:00'), None이면 전체
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ykiho, scope, change_type, changed_at FROM changes "
+                "WHERE changed_at >= ? ORDER BY id",
+                (since or '',)
+            ).fetchall()
+        return [dict(zip(('ykiho', 'scope', 'change_type', 'changed_at'), row)) for row in rows]
+
+    def active_hospitals(self) -> List[Dict]:
+        """폐업 처리되지 않은 병원 목록 (마지막으로 조회된 내용)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT body FROM hospitals WHERE closed_at IS NULL ORDER BY ykiho"
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
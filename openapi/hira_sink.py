@@ -0,0 +1,359 @@
+"""
+HIRA OpenAPI 조회 결과 스트리밍 저장 (Parquet, 선택적으로 CSV)
+================================================================================
+작성일: 2026-10-18
+목적: 전체 결과로 DataFrame을 만든 뒤 openpyxl로 한 번에 쓰는 대신
+      페이지가 도착하는 대로 Parquet row group 단위로 기록
+      - 요양기호(ykiho), 좌표(XPos/YPos), 인원수(drTotCnt 등)에 타입 지정
+      - 스키마에 없는 항목은 문자열 컬럼으로 추가
+        (첫 row group 이후에 처음 나타난 항목은 값만 모아 두었다가 close 시 1회 추가)
+      - Excel 저장은 Parquet 파일을 읽어 변환하는 선택 단계 (parquet_to_excel)
+================================================================================
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# ============================================================================
+# 설정 (Configuration)
+# ============================================================================
+
+ROW_GROUP_SIZE = 5000       # row group 당 행 수 (이 수만큼 모이면 파일에 기록)
+PARQUET_COMPRESSION = 'zstd'
+
+# 병원기본목록(getHospBasisList) 항목 타입 (API 가이드 기준, 순서 = 컬럼 순서)
+BASIS_FIELD_TYPES = {
+    'ykiho': 'string',          # 암호화된 요양기호
+    'yadmNm': 'string',         # 병원명
+    'clCd': 'string',           # 종별코드
+    'clCdNm': 'string',         # 종별명
+    'sidoCd': 'string',         # 시도코드
+    'sidoCdNm': 'string',       # 시도명
+    'sgguCd': 'string',         # 시군구코드
+    'sgguCdNm': 'string',       # 시군구명
+    'emdongNm': 'string',       # 읍면동명
+    'postNo': 'string',         # 우편번호 (앞자리 0 보존)
+    'addr': 'string',           # 주소
+    'telno': 'string',          # 전화번호
+    'hospUrl': 'string',        # 홈페이지
+    'estbDd': 'string',         # 개설일자 (YYYYMMDD)
+    'drTotCnt': 'int32',        # 의사총수
+    'mdeptGdrCnt': 'int32',     # 의과일반의
+    'mdeptIntnCnt': 'int32',    # 의과인턴
+    'mdeptResdntCnt': 'int32',  # 의과레지던트
+    'mdeptSdrCnt': 'int32',     # 의과전문의
+    'detyGdrCnt': 'int32',      # 치과일반의
+    'detyIntnCnt': 'int32',     # 치과인턴
+    'detyResdntCnt': 'int32',   # 치과레지던트
+    'detySdrCnt': 'int32',      # 치과전문의
+    'cmdcGdrCnt': 'int32',      # 한방일반의
+    'cmdcIntnCnt': 'int32',     # 한방인턴
+    'cmdcResdntCnt': 'int32',   # 한방레지던트
+    'cmdcSdrCnt': 'int32',      # 한방전문의
+    'XPos': 'float64',          # 경도
+    'YPos': 'float64',          # 위도
+    'distance': 'int32',        # 거리 (미터)
+}
+
+# 의료기관별상세정보(getDtlInfo) 항목 타입
+# 선택 항목이 많아 응답마다 키가 다르므로 알려진 항목을 모두 미리 선언 (나머지 항목은 문자열로 추가)
+DETAIL_FIELD_TYPES = {
+    '원본_병원명': 'string',
+    '원본_주소': 'string',
+    '원본_요양기호': 'string',
+    'yadmNm': 'string',
+    'addr': 'string',
+    'telno': 'string',
+    'hospUrl': 'string',
+    'clCdNm': 'string',
+    'sidoCdNm': 'string',
+    'sgguCdNm': 'string',
+    'emdongNm': 'string',
+    'postNo': 'string',
+    'XPos': 'float64',
+    'YPos': 'float64',
+    'plcNm': 'string',          # 위치 (가까운 건물/역)
+    'plcDir': 'string',         # 위치 방향
+    'plcDist': 'string',        # 위치 거리
+    'parkQty': 'int32',         # 주차 가능 대수
+    'parkXpnsYn': 'string',     # 주차 비용 부담 여부
+    'parkEtc': 'string',        # 주차 기타 안내
+    'emyDayYn': 'string',       # 응급실 주간 운영 여부
+    'emyDayTelNo1': 'string',   # 응급실 주간 전화번호 1
+    'emyDayTelNo2': 'string',   # 응급실 주간 전화번호 2
+    'emyNgtYn': 'string',       # 응급실 야간 운영 여부
+    'emyNgtTelNo1': 'string',   # 응급실 야간 전화번호 1
+    'emyNgtTelNo2': 'string',   # 응급실 야간 전화번호 2
+    'lunchWeek': 'string',      # 점심시간 (평일)
+    'lunchSat': 'string',       # 점심시간 (토요일)
+    'rcvWeek': 'string',        # 접수시간 (평일)
+    'rcvSat': 'string',         # 접수시간 (토요일)
+    'noTrmtSun': 'string',      # 일요일 휴진 안내
+    'noTrmtHoli': 'string',     # 공휴일 휴진 안내
+    'trmtMonStart': 'string',   # 진료 시작/종료 시각 (HHMM, 앞자리 0 보존)
+    'trmtMonEnd': 'string',
+    'trmtTueStart': 'string',
+    'trmtTueEnd': 'string',
+    'trmtWedStart': 'string',
+    'trmtWedEnd': 'string',
+    'trmtThuStart': 'string',
+    'trmtThuEnd': 'string',
+    'trmtFriStart': 'string',
+    'trmtFriEnd': 'string',
+    'trmtSatStart': 'string',
+    'trmtSatEnd': 'string',
+    'trmtSunStart': 'string',
+    'trmtSunEnd': 'string',
+}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet 저장에는 pyarrow 패키지가 필요합니다. (pip install pyarrow)") from e
+    return pa, pq
+
+
+def _coerce(value, type_name: str):
+    """API 응답 값(문자열/숫자/빈 값)을 컬럼 타입에 맞게 변환 (변환 불가 시 None)"""
+    if value is None or (isinstance(value, str) and value.strip() == ''):
+        return None
+    try:
+        if type_name.startswith('int'):
+            return int(float(value))
+        if type_name.startswith('float'):
+            return float(value)
+    except (TypeError, ValueError):
+        return None
+    return str(value)
+
+
+class HiraParquetSink:
+    """
+    조회 결과를 row group 단위로 Parquet(선택적으로 CSV)에 기록하는 저장기
+
+    Parameters:
+    -----------
+    path : str or Path
+        Parquet 파일 경로
+    field_types : dict
+        컬럼명 -> 타입 ('string', 'int32', 'int64', 'float64')
+    csv_path : str or Path, optional
+        함께 기록할 CSV 파일 경로 (UTF-8 BOM, Excel에서 바로 열림)
+    row_group_size : int
+        row group 당 행 수
+    extra_columns : bool
+        True: field_types에 없는 항목을 문자열 컬럼으로 추가
+              (첫 row group 이후에 처음 나타난 항목은 값만 모아 두었다가 close 시
+               row group 단위로 한 번 다시 써서 추가)
+        False: field_types 컬럼만 기록 (나머지 항목은 dropped_fields에 기록)
+
+    사용 예:
+        with HiraParquetSink("hospitals.parquet", BASIS_FIELD_TYPES) as sink:
+            sink.write(page_items)
+    """
+
+    def __init__(
+        self,
+        path,
+        field_types: Dict[str, str],
+        csv_path=None,
+        row_group_size: int = ROW_GROUP_SIZE,
+        extra_columns: bool = True
+    ):
+        self._pa, self._pq = _import_pyarrow()
+        self.path = Path(path)
+        self.csv_path = Path(csv_path) if csv_path else None
+        self.field_types = dict(field_types)
+        self.row_group_size = max(1, row_group_size)
+        self.extra_columns = extra_columns
+        self.rows_written = 0
+        self.dropped_fields = set()
+
+        self._late_values: Dict[str, Dict[int, str]] = {}  # 늦게 나타난 항목 -> {행 번호: 값}
+        self._buffer: List[Dict] = []
+        self._schema = None
+        self._writer = None
+        self._csv_file = None
+        self._csv_writer = None
+
+    def _build_schema(self, items: List[Dict]):
+        pa = self._pa
+        if self.extra_columns:
+            for item in items:
+                for key in item:
+                    if key not in self.field_types:
+                        self.field_types[key] = 'string'
+        return pa.schema([pa.field(name, pa.type_for_alias(type_name))
+                          for name, type_name in self.field_types.items()])
+
+    def _open_writers(self, path: Path, csv_path: Optional[Path], schema):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        writer = self._pq.ParquetWriter(str(path), schema, compression=PARQUET_COMPRESSION)
+        csv_file = csv_writer = None
+        if csv_path:
+            import pyarrow.csv as pa_csv
+            csv_path.parent.mkdir(parents=True, exist_ok=True)
+            csv_file = open(csv_path, 'wb')
+            csv_file.write(b'\xef\xbb\xbf')  # UTF-8 BOM (Excel 한글 깨짐 방지)
+            csv_writer = pa_csv.CSVWriter(csv_file, schema)
+        return writer, csv_file, csv_writer
+
+    def _open(self, items: List[Dict]):
+        self._schema = self._build_schema(items)
+        self._writer, self._csv_file, self._csv_writer = self._open_writers(self.path, self.csv_path, self._schema)
+
+    def _close_writers(self):
+        if self._csv_writer is not None:
+            self._csv_writer.close()
+            self._csv_file.close()
+            self._csv_writer = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _add_late_columns(self):
+        """
+        첫 row group 이후 처음 나타난 항목을 문자열 컬럼으로 추가 (close 시 1회)
+        - 기록된 파일을 row group 단위로 읽어 새 컬럼을 붙여 임시 파일에 쓴 뒤 교체
+        - 해당 항목이 없던 행의 값은 null
+        """
+        pa, pq = self._pa, self._pq
+        late = list(self._late_values)
+        schema = pa.schema(list(self._schema) + [pa.field(key, pa.string()) for key in late])
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        tmp_csv_path = self.csv_path.with_name(self.csv_path.name + '.tmp') if self.csv_path else None
+
+        writer, csv_file, csv_writer = self._open_writers(tmp_path, tmp_csv_path, schema)
+        offset = 0
+        with open(self.path, 'rb') as f:
+            source = pq.ParquetFile(f)
+            for i in range(source.num_row_groups):
+                table = source.read_row_group(i)
+                rows = range(offset, offset + table.num_rows)
+                for key in late:
+                    values = self._late_values[key]
+                    table = table.append_column(key, pa.array([values.get(row) for row in rows], pa.string()))
+                writer.write_table(table)
+                if csv_writer is not None:
+                    csv_writer.write_table(table)
+                offset += table.num_rows
+        writer.close()
+        if csv_writer is not None:
+            csv_writer.close()
+            csv_file.close()
+            os.replace(tmp_csv_path, self.csv_path)
+        os.replace(tmp_path, self.path)
+
+        for key in late:
+            self.field_types[key] = 'string'
+        self._schema = schema
+        self._late_values = {}
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        if self._writer is None:
+            self._open(self._buffer)
+
+        # 스키마 확정 후 처음 나타난 항목: extra_columns이면 값을 모아 두고, 아니면 버림
+        for offset, item in enumerate(self._buffer, self.rows_written):
+            for key, value in item.items():
+                if key in self.field_types:
+                    continue
+                if self.extra_columns:
+                    self._late_values.setdefault(key, {})[offset] = _coerce(value, 'string')
+                else:
+                    self.dropped_fields.add(key)
+
+        columns = {
+            name: [_coerce(item.get(name), type_name) for item in self._buffer]
+            for name, type_name in self.field_types.items()
+        }
+        table = self._pa.Table.from_pydict(columns, schema=self._schema)
+        self._writer.write_table(table)
+        if self._csv_writer is not None:
+            self._csv_writer.write_table(table)
+
+        self.rows_written += len(self._buffer)
+        self._buffer = []
+
+    def write(self, items: List[Dict]):
+        """
+        결과 추가 (row_group_size만큼 모이면 파일에 기록)
+
+        Parameters:
+        -----------
+        items : list
+            페이지(또는 요양기호) 단위 조회 결과
+        """
+        self._buffer.extend(items)
+        while len(self._buffer) >= self.row_group_size:
+            pending = self._buffer[self.row_group_size:]
+            self._buffer = self._buffer[:self.row_group_size]
+            self._flush()
+            self._buffer = pending
+
+    def close(self) -> int:
+        """
+        남은 결과를 기록하고 파일 닫기
+
+        Returns:
+        --------
+        int
+            기록된 전체 행 수
+        """
+        self._flush()
+        if self._writer is not None:
+            self._close_writers()
+            if self._late_values:
+                self._add_late_columns()
+            print(f"[저장 완료] {self.path} ({self.rows_written}건, 컬럼 {len(self._schema)}개)")
+            if self.csv_path:
+                print(f"  - CSV: {self.csv_path}")
+        if self.dropped_fields:
+            print(f"[경고] 스키마에 없어 저장하지 않은 항목: {', '.join(sorted(self.dropped_fields))}")
+        return self.rows_written
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def parquet_to_excel(
+    parquet_path,
+    excel_path,
+    columns: Optional[List[str]] = None,
+    rename: Optional[Dict[str, str]] = None
+):
+    """
+    Parquet 파일을 엑셀 파일로 변환 (선택 단계)
+
+    Parameters:
+    -----------
+    parquet_path : str or Path
+        HiraParquetSink로 저장한 Parquet 파일
+    excel_path : str or Path
+        저장할 엑셀 파일명
+    columns : list, optional
+        저장할 컬럼 (순서대로, 파일에 없는 컬럼은 무시 / None이면 전체)
+    rename : dict, optional
+        엑셀 컬럼명 변경 (API 항목명 -> 한글 컬럼명, 예: {'yadmNm': '병원명'})
+    """
+    import pandas as pd
+    _, pq = _import_pyarrow()
+
+    if columns is not None:
+        available = set(pq.read_schema(str(parquet_path)).names)
+        columns = [col for col in columns if col in available]
+
+    df = pd.read_parquet(parquet_path, columns=columns)
+    if rename:
+        df = df.rename(columns=rename)
+    df.to_excel(excel_path, index=False, engine='openpyxl')
+    print(f"[엑셀 저장 완료] {excel_path} ({len(df)}건)")
@@ -12,8 +12,10 @@ import json
 import shutil
 import hashlib
 import datetime
+import time
 import subprocess
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 import tkinter as tk
 from tkinter import filedialog
 from pathlib import Path
@@ -28,6 +30,9 @@ except ImportError:
     print("pip install PyMuPDF pdfplumber tabula-py pandas")
     sys.exit(1)
 
+# 페이지 캐시 형식 버전 (추출 로직 변경 시 올려서 기존 캐시 무효화)
+PAGE_CACHE_VERSION = 1
+
 class PDFDocumentProcessor:
     def __init__(self, pdf_path, args):
         self.pdf_path = Path(pdf_path).resolve()
@@ -53,6 +58,7 @@ class PDFDocumentProcessor:
             "Images_Embedded": self.base_dir / "Images" / "embedded",
             "Images_Rendered": self.base_dir / "Images" / "rendered",
             "Manifest": self.base_dir / "Manifest",
+            "Cache": self.base_dir / "Cache",
             "Backup": Path.cwd() / "GEMINI" / "code"
         }
         
@@ -64,6 +70,11 @@ class PDFDocumentProcessor:
         
         # 렌더링 검사 키워드
         self.render_keywords = ["그림", "그래프", "차트", "도표", "Figure", "Chart"]
+        
+        # 표 사전 필터 처리 통계 (페이지 수, 단계별 누적 소요 시간)
+        self.page_stats = {}
+        self.pdf_hash = ""
+        self.cache_hit_pages = []
 
     def _check_java(self):
         """Tabula-py 사용을 위한 Java 구동 환경 백그라운드 확인"""
@@ -118,6 +129,49 @@ class PDFDocumentProcessor:
         
         return (filled_cells / total_cells) >= 0.2
 
+    def _table_likelihood(self, blocks, drawings):
+        """
+        PyMuPDF 기하 정보 기반 표 존재 가능성 판별 (pdfplumber/tabula 사전 필터)
+        - 괘선 표: 수평/수직 선분, 셀 테두리 사각형이 일정 개수 이상
+        - 무괘선 표: 같은 기준선 위에 좌우로 떨어진 텍스트 조각이 3행 이상 반복
+        """
+        h_rules = v_rules = 0
+        for d in drawings:
+            for item in d["items"]:
+                if item[0] == "l":
+                    p1, p2 = item[1], item[2]
+                    if abs(p1.y - p2.y) < 1 and abs(p1.x - p2.x) > 10:
+                        h_rules += 1
+                    elif abs(p1.x - p2.x) < 1 and abs(p1.y - p2.y) > 10:
+                        v_rules += 1
+                elif item[0] == "re":
+                    r = item[1]
+                    if r.width > 10 and r.height > 10:  # 셀 테두리
+                        h_rules += 2
+                        v_rules += 2
+                    elif r.width > 10:  # 얇은 사각형으로 그린 수평 괘선
+                        h_rules += 1
+                    elif r.height > 10:
+                        v_rules += 1
+        if h_rules >= 3 or h_rules + v_rules >= 6:
+            return True
+
+        # 기준선(baseline)별 텍스트 조각 x 구간 수집
+        rows = {}
+        for b in blocks:
+            if b['type'] != 0:
+                continue
+            for l in b["lines"]:
+                for sp in l["spans"]:
+                    if sp["text"].strip():
+                        rows.setdefault(round(sp["origin"][1]), []).append((sp["bbox"][0], sp["bbox"][2]))
+        aligned_rows = 0
+        for spans in rows.values():
+            spans.sort()
+            if any(x0 - prev_x1 > 15 for (_, prev_x1), (x0, _) in zip(spans, spans[1:])):
+                aligned_rows += 1
+        return aligned_rows >= 3
+
     def _normalize_table(self, table):
         """불규칙한(가변 길이) 표 행 정규화 알고리즘"""
         if not table: return []
@@ -171,65 +225,286 @@ class PDFDocumentProcessor:
             "bbox_unit(pt)": [], "coord_origin(top-left)": True
         })
 
+    def _page_shards(self, workers):
+        """페이지 범위를 연속 구간 [start, end) 목록으로 분할 (직렬: 1개, 병렬: 워커당 2개로 부하 균형)"""
+        n_shards = min(self.page_count, 1 if workers == 1 else workers * 2)
+        if n_shards == 0:
+            return []
+        size, extra = divmod(self.page_count, n_shards)
+        shards, start = [], 0
+        for i in range(n_shards):
+            end = start + size + (1 if i < extra else 0)
+            shards.append((start, end))
+            start = end
+        return shards
+
+    def _read_tabula_batch(self, pages):
+        """
+        폴백 대상 페이지 전체를 tabula 1회 호출(JVM 1회 기동, PDF 1회 파싱)로 처리
+        - JSON 출력의 page_number로 각 표를 원래 페이지에 매핑
+        - 일괄 호출이 실패하거나(한 페이지 오류로 전체 실패) page_number가 없는
+          구버전 tabula-java는 페이지별 호출로 대체
+        - 반환: [(page_num, table_list)] (셀 값은 문자열, 빈 셀은 "")
+        """
+        options = dict(multiple_tables=True, guess=True,
+                       lattice=self.args.tabula_mode == "lattice", stream=self.args.tabula_mode == "stream")
+        try:
+            raw_tables = tabula.read_pdf(str(self.pdf_path), pages=pages, output_format="json", **options)
+        except Exception:
+            raw_tables = None
+
+        if raw_tables is not None and all("page_number" in t for t in raw_tables):
+            return [(t["page_number"], [[cell.get("text", "") for cell in row] for row in t["data"]])
+                    for t in raw_tables]
+
+        results = []
+        for page_num in pages:
+            try:
+                dfs = tabula.read_pdf(
+                    str(self.pdf_path), pages=page_num,
+                    pandas_options={'header': None, 'dtype': str}, **options # 첫 행 데이터 소실 방어
+                )
+            except Exception:
+                continue
+            for df in dfs:
+                df.fillna("", inplace=True)
+                results.append((page_num, df.values.tolist()))
+        return results
+
+    def _file_sha256(self):
+        """PDF 원본 내용 해시 (페이지 캐시 키의 기준)"""
+        digest = hashlib.sha256()
+        with open(self.pdf_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _page_cache_key(self, page_num, render_pages_set):
+        """페이지 결과에 영향을 주는 입력(내용 해시, 페이지, 관련 인자)만으로 만든 캐시 키"""
+        settings = {
+            "version": PAGE_CACHE_VERSION,
+            "pdf_sha256": self.pdf_hash,
+            "page": page_num,
+            "tabula_mode": self.args.tabula_mode,
+            "render_requested": self.args.render_all or page_num in render_pages_set,
+            "csv_encoding": self.args.csv_encoding,
+            "scan_all_tables": self.args.scan_all_tables,
+            "java_available": self.java_available,
+        }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:24]
+
+    def _load_page_cache(self, key):
+        """캐시 항목(page.json) 로드. 없거나 손상되었으면 None"""
+        entry_path = self.dirs["Cache"] / key / "page.json"
+        if self.args.no_cache or not entry_path.exists():
+            return None
+        try:
+            with open(entry_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _export_cached_file(self, src, dst):
+        """캐시 파일을 출력 경로로 연결 (하드링크 우선, 불가 시 복사)"""
+        try:
+            if dst.exists():
+                dst.unlink()
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
+    def _extract_shard(self, start, end):
+        """
+        [start, end) 페이지 구간의 텍스트·이미지·렌더링·표 추출 (워커 단위 작업)
+        - 구간마다 fitz/pdfplumber 핸들을 새로 열어 프로세스 간 공유 없이 동작
+        - 페이지 캐시 적중 페이지는 재계산 없이 이전 결과(텍스트, 이미지, 렌더링, 표)를 재사용
+        - 결과는 병합을 위해 반환 (텍스트 메타데이터와 표 메타데이터를 분리)
+        """
+        render_pages_set = self._parse_render_pages(self.args.render_pages)
+        keys = {}
+        entries = {}  # page_num -> 실행 시각(ts)과 무관한 페이지 결과 (캐시 저장 단위)
+        computed = []
+        for page_num in range(start + 1, end + 1):
+            keys[page_num] = self._page_cache_key(page_num, render_pages_set)
+            entry = self._load_page_cache(keys[page_num])
+            if entry is None:
+                computed.append(page_num)
+            else:
+                entries[page_num] = entry
+        table_pages = []
+        t0 = time.perf_counter()
+        
+        # 1. 텍스트 추출, 이미지 임베딩, 고해상도 렌더링 (PyMuPDF) - 캐시 미적중 페이지만
+        if computed:
+            with fitz.open(self.pdf_path) as doc:
+                for page_num in computed:
+                    page = doc[page_num - 1]
+                    page_height = page.rect.height
+                    cache_dir = self.dirs["Cache"] / keys[page_num]
+                    if cache_dir.exists():
+                        shutil.rmtree(cache_dir)
+                    cache_dir.mkdir(parents=True)
+                    entry = entries[page_num] = {"text": "", "blocks": [], "images": [], "rendered": False, "tables": []}
+                    
+                    # [텍스트 추출 및 정제]
+                    blocks = page.get_text("dict", sort=True)["blocks"]
+                    page_text_builder = []
+                    
+                    for b in blocks:
+                        if b['type'] == 0:  # Text Block
+                            y0, y1 = b["bbox"][1], b["bbox"][3]
+                            block_text = "".join(s["text"] for l in b["lines"] for s in l["spans"])
+                            
+                            # 머리말/꼬리말(Noise) 스마트 필터링 로직 (상하단 5% 및 길이 50자 이하)
+                            if (y0 < page_height * 0.05 or y1 > page_height * 0.95) and len(block_text) < 50:
+                                continue
+                                
+                            block_text = re.sub(r'-\s*\n\s*', '', block_text).strip()  # 하이픈 줄바꿈 결합
+                            
+                            if block_text:
+                                page_text_builder.append(block_text)
+                                entry["blocks"].append([round(c, 2) for c in b["bbox"]])
+                                
+                    clean_page_text = "\n".join(page_text_builder)
+                    entry["text"] = clean_page_text
+
+                    # [순수 이미지 객체 추출]
+                    for img_idx, img in enumerate(page.get_images(full=True)):
+                        base_image = doc.extract_image(img[0])
+                        with open(cache_dir / f"img_{img_idx+1}.{base_image['ext']}", "wb") as f_img:
+                            f_img.write(base_image["image"])
+                        entry["images"].append(base_image["ext"])
+
+                    # [키워드 감지 기반 스마트 렌더링]
+                    has_keywords = any(kw in clean_page_text for kw in self.render_keywords)
+                    vectors = page.get_drawings()
+                    
+                    if self.args.render_all or (page_num in render_pages_set) or has_keywords or len(vectors) >= 50:
+                        pix = page.get_pixmap(dpi=300)
+                        pix.save(cache_dir / "render.png")
+                        entry["rendered"] = True
+
+                    # [표 존재 가능성 사전 판별] 렌더링 판단에 쓴 벡터·블록 기하를 그대로 재사용
+                    if self.args.scan_all_tables or self._table_likelihood(blocks, vectors):
+                        table_pages.append(page_num)
+
+        t1 = time.perf_counter()
+
+        # 2. 표(Table) 추출 (pdfplumber + tabula-py 결함 허용 구조) - 표 후보 페이지만 파싱
+        fallback_pages = []
+        if table_pages:
+            with pdfplumber.open(self.pdf_path, pages=table_pages) as pdf:
+                for page in pdf.pages:
+                    valid_tables = [t for t in (page.extract_tables() or []) if self._is_valid_table(t)]
+                    entries[page.page_number]["tables"] = [[t, "pdfplumber"] for t in valid_tables]
+                    if not valid_tables:
+                        fallback_pages.append(page.page_number)
+                            
+        # 폴백 시스템 (pdfplumber가 실패하거나 품질이 미달일 때 Tabula 개입) - 대상 페이지 일괄 처리
+        if fallback_pages and self.java_available:
+            for page_num, table_list in self._read_tabula_batch(fallback_pages):
+                if page_num in fallback_pages and self._is_valid_table(table_list):
+                    entries[page_num]["tables"].append([table_list, "tabula"])
+
+        # 캐시 항목 기록 (page.json은 마지막에 기록: 중단된 페이지는 다음 실행에서 재계산)
+        for page_num in computed:
+            with open(self.dirs["Cache"] / keys[page_num] / "page.json", "w", encoding="utf-8") as f:
+                json.dump(entries[page_num], f, ensure_ascii=False)
+        t2 = time.perf_counter()
+
+        # 3. 이번 실행(ts) 이름으로 산출물 구성 (페이지 순서: 전체 텍스트 블록 -> 전체 표)
+        self.metadata_log = []
+        self.tables_index = []
+        page_texts = []
+        for page_num in range(start + 1, end + 1):
+            entry = entries[page_num]
+            cache_dir = self.dirs["Cache"] / keys[page_num]
+            page_texts.append((page_num, entry["text"]))
+            for bbox in entry["blocks"]:
+                self.metadata_log.append({
+                    "doc_id": self.doc_id, "ts": self.ts, "element_type": "text_block",
+                    "page": page_num, "method": "PyMuPDF", 
+                    "output_path": f"Text/full_text_{self.ts}.txt",
+                    "bbox_unit(pt)": bbox, "coord_origin(top-left)": True
+                })
+            for img_idx, ext in enumerate(entry["images"], start=1):
+                self._export_cached_file(cache_dir / f"img_{img_idx}.{ext}",
+                                         self.dirs["Images_Embedded"] / f"img_p{page_num}_{img_idx}_{self.ts}.{ext}")
+            if entry["rendered"]:
+                self._export_cached_file(cache_dir / "render.png",
+                                         self.dirs["Images_Rendered"] / f"render_p{page_num}_{self.ts}.png")
+        text_log = self.metadata_log
+        self.metadata_log = []
+        for page_num in range(start + 1, end + 1):
+            for t_idx, (table, method) in enumerate(entries[page_num]["tables"], start=1):
+                self._save_table(table, page_num, t_idx, method)
+
+        stats = {
+            "pages": end - start,
+            "cache_hits": (end - start) - len(computed),
+            "table_pages": len(table_pages),
+            "skipped_pages": len(computed) - len(table_pages),
+            "pymupdf_sec": t1 - t0,
+            "table_sec": t2 - t1,
+        }
+        return {
+            "stats": stats,
+            "cache_keys": list(keys.values()),
+            "cache_hit_pages": [p for p in keys if p not in computed],
+            "page_texts": page_texts,
+            "text_log": text_log,
+            "table_log": self.metadata_log,
+            "tables_index": self.tables_index,
+        }
+
     def run_pipeline(self):
         print(f"\n🚀 분석 및 추출 파이프라인 시작: {self.pdf_path.name}")
         self._setup_directories_and_backup()
         
-        full_text_lines = []
-        total_text_length = 0
-        render_pages_set = self._parse_render_pages(self.args.render_pages)
-        
-        # 1. 텍스트 추출, 이미지 임베딩, 고해상도 렌더링 (PyMuPDF)
         with fitz.open(self.pdf_path) as doc:
             self.page_count = len(doc)
-            for page_num in range(self.page_count):
-                page = doc[page_num]
-                page_height = page.rect.height
-                
-                # [텍스트 추출 및 정제]
-                blocks = page.get_text("dict", sort=True)["blocks"]
-                page_text_builder = []
-                
-                for b in blocks:
-                    if b['type'] == 0:  # Text Block
-                        y0, y1 = b["bbox"][1], b["bbox"][3]
-                        block_text = "".join(s["text"] for l in b["lines"] for s in l["spans"])
-                        
-                        # 머리말/꼬리말(Noise) 스마트 필터링 로직 (상하단 5% 및 길이 50자 이하)
-                        if (y0 < page_height * 0.05 or y1 > page_height * 0.95) and len(block_text) < 50:
-                            continue
-                            
-                        block_text = re.sub(r'-\s*\n\s*', '', block_text).strip()  # 하이픈 줄바꿈 결합
-                        
-                        if block_text:
-                            page_text_builder.append(block_text)
-                            self.metadata_log.append({
-                                "doc_id": self.doc_id, "ts": self.ts, "element_type": "text_block",
-                                "page": page_num + 1, "method": "PyMuPDF", 
-                                "output_path": f"Text/full_text_{self.ts}.txt",
-                                "bbox_unit(pt)": [round(c, 2) for c in b["bbox"]], "coord_origin(top-left)": True
-                            })
-                            
-                clean_page_text = "\n".join(page_text_builder)
+        self.pdf_hash = self._file_sha256()
+        
+        workers = max(1, min(self.args.workers, self.page_count or 1))
+        shards = self._page_shards(workers)
+        print("📊 텍스트·이미지 추출 및 표 데이터 구조화(이중 폴백) 처리 중...")
+        if workers == 1:
+            results = [self._extract_shard(start, end) for start, end in shards]
+        else:
+            # 페이지 구간 병렬 처리 (워커마다 독립 프로세스, 결과는 페이지 순서대로 수집)
+            print(f"⚙️ 페이지 병렬 처리: {workers}개 워커, {len(shards)}개 구간")
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(self._extract_shard, start, end) for start, end in shards]
+                results = [f.result() for f in futures]
+        
+        # 페이지 순서 병합 (직렬 실행과 동일: 전체 텍스트 블록 로그 -> 전체 표 로그)
+        full_text_lines = []
+        total_text_length = 0
+        self.metadata_log = []
+        self.tables_index = []
+        for result in results:
+            for page_num, clean_page_text in result["page_texts"]:
                 if clean_page_text:
-                    full_text_lines.append(f"--- Page {page_num + 1} ---\n{clean_page_text}")
+                    full_text_lines.append(f"--- Page {page_num} ---\n{clean_page_text}")
                     total_text_length += len(clean_page_text)
-
-                # [순수 이미지 객체 추출]
-                for img_idx, img in enumerate(page.get_images(full=True)):
-                    base_image = doc.extract_image(img[0])
-                    img_path = self.dirs["Images_Embedded"] / f"img_p{page_num+1}_{img_idx+1}_{self.ts}.{base_image['ext']}"
-                    with open(img_path, "wb") as f_img:
-                        f_img.write(base_image["image"])
-
-                # [키워드 감지 기반 스마트 렌더링]
-                has_keywords = any(kw in clean_page_text for kw in self.render_keywords)
-                vectors = page.get_drawings()
-                
-                if self.args.render_all or ((page_num + 1) in render_pages_set) or has_keywords or len(vectors) >= 50:
-                    pix = page.get_pixmap(dpi=300)
-                    render_path = self.dirs["Images_Rendered"] / f"render_p{page_num+1}_{self.ts}.png"
-                    pix.save(render_path)
+            self.metadata_log.extend(result["text_log"])
+        for result in results:
+            self.metadata_log.extend(result["table_log"])
+            self.tables_index.extend(result["tables_index"])
+        self.page_stats = {key: sum(r["stats"][key] for r in results)
+                           for key in ["pages", "cache_hits", "table_pages", "skipped_pages", "pymupdf_sec", "table_sec"]}
+        self.page_stats["pymupdf_sec"] = round(self.page_stats["pymupdf_sec"], 3)
+        self.page_stats["table_sec"] = round(self.page_stats["table_sec"], 3)
+        print(f"⏱️ 표 사전 필터: {self.page_stats['pages']}쪽 중 {self.page_stats['skipped_pages']}쪽 표 추출 생략 "
+              f"(누적 소요: PyMuPDF {self.page_stats['pymupdf_sec']:.1f}초, 표 추출 {self.page_stats['table_sec']:.1f}초)")
+        
+        # 페이지 캐시: 적중 기록 및 이번 실행에서 쓰이지 않은(설정 변경 등) 항목 정리
+        self.cache_hit_pages = [p for r in results for p in r["cache_hit_pages"]]
+        print(f"♻️ 페이지 캐시: {self.page_count}쪽 중 {len(self.cache_hit_pages)}쪽 재사용")
+        used_keys = {k for r in results for k in r["cache_keys"]}
+        for entry_dir in self.dirs["Cache"].iterdir():
+            if entry_dir.name not in used_keys:
+                shutil.rmtree(entry_dir, ignore_errors=True)
 
         # 스캔본 판별 (평균 50자 미만)
         if self.page_count > 0 and (total_text_length / self.page_count) < 50:
@@ -239,36 +514,6 @@ class PDFDocumentProcessor:
         # 통합 텍스트 파일 생성
         with open(self.dirs["Text"] / f"full_text_{self.ts}.txt", "w", encoding="utf-8") as f:
             f.write("\n\n".join(full_text_lines))
-
-        # 2. 표(Table) 추출 (pdfplumber + tabula-py 결함 허용 구조)
-        print("📊 표 데이터 구조화 및 이중 폴백 처리 중...")
-        with pdfplumber.open(self.pdf_path) as pdf:
-            for page_num, page in enumerate(pdf.pages, start=1):
-                tables = page.extract_tables()
-                valid_tables_found = 0
-                
-                if tables:
-                    for t_idx, table in enumerate(tables, start=1):
-                        if self._is_valid_table(table):
-                            self._save_table(table, page_num, valid_tables_found + 1, "pdfplumber")
-                            valid_tables_found += 1
-                            
-                # 폴백 시스템 (pdfplumber가 실패하거나 품질이 미달일 때 Tabula 개입)
-                if valid_tables_found == 0 and self.java_available:
-                    try:
-                        dfs = tabula.read_pdf(
-                            self.pdf_path, pages=page_num, multiple_tables=True, 
-                            guess=True, mode=self.args.tabula_mode,
-                            pandas_options={'header': None, 'dtype': str} # 첫 행 데이터 소실 방어
-                        )
-                        for t_idx, df in enumerate(dfs):
-                            df.fillna("", inplace=True)
-                            table_list = df.values.tolist()
-                            if self._is_valid_table(table_list):
-                                self._save_table(table_list, page_num, valid_tables_found + 1, "tabula")
-                                valid_tables_found += 1
-                    except Exception:
-                        pass
         
         self._generate_manifest()
         print(f"\n✅ 파이프라인 구동 완료! 결과물이 다음 경로에 저장되었습니다.\n📂 {self.base_dir.resolve()}")
@@ -303,7 +548,14 @@ class PDFDocumentProcessor:
             "args": vars(self.args),
             "render_policy": "selective_auto(keywords,vectors) or manual",
             "java_available": self.java_available,
-            "scanned_suspect": self.scanned_suspect
+            "scanned_suspect": self.scanned_suspect,
+            "page_stats": self.page_stats,
+            "page_cache": {
+                "pdf_sha256": self.pdf_hash,
+                "hits": len(self.cache_hit_pages),
+                "misses": self.page_count - len(self.cache_hit_pages),
+                "hit_pages": self.cache_hit_pages
+            }
         }
         with open(self.dirs["Manifest"] / "run_manifest.json", "w", encoding="utf-8") as f:
             json.dump(run_manifest, f, indent=4, ensure_ascii=False)
@@ -322,6 +574,100 @@ def select_file_gui():
     return file_path
 
 
+def process_document(pdf_path, args, page_workers):
+    """
+    배치 모드 문서 단위 작업 (프로세스 풀 워커에서 실행)
+    - 문서별 페이지 병렬도(page_workers)는 전체 워커 상한에서 배분된 값 사용
+    - 반환: 처리량 요약 및 문서별 tables_index (실패 시 오류 메시지)
+    """
+    doc_args = argparse.Namespace(**{**vars(args), "workers": page_workers})
+    started = time.perf_counter()
+    summary = {"source_pdf_path": str(pdf_path), "doc_id": "", "status": "완료", "error": "",
+               "page_workers": page_workers, "pages": 0, "tables": 0, "cache_hits": 0}
+    tables_index = []
+    try:
+        processor = PDFDocumentProcessor(pdf_path, doc_args)
+        summary["doc_id"] = processor.doc_id
+        processor.run_pipeline()
+        summary.update(pages=processor.page_count, tables=len(processor.tables_index),
+                       cache_hits=len(processor.cache_hit_pages))
+        # 통합 인덱스에서는 csv_path를 Exports 기준 상대 경로로 변환
+        tables_index = [{**row, "csv_path": str(Path(processor.slugified_name) / row["csv_path"]),
+                         "source_pdf_path": str(processor.pdf_path)} for row in processor.tables_index]
+    except Exception as e:
+        summary.update(status="실패", error=f"{type(e).__name__}: {e}")
+    elapsed = time.perf_counter() - started
+    summary["elapsed_sec"] = round(elapsed, 2)
+    summary["pages_per_sec"] = round(summary["pages"] / elapsed, 3) if elapsed > 0 else 0.0
+    summary["tables_per_sec"] = round(summary["tables"] / elapsed, 3) if elapsed > 0 else 0.0
+    return summary, tables_index
+
+
+def run_batch(args):
+    """
+    디렉토리/글롭 일괄 처리 모드 (Tkinter 미사용)
+    - 문서 단위 프로세스 풀, 파일 크기가 큰 문서부터 배정
+    - --workers는 전체 상한: 문서 동시 처리 수 x 문서별 페이지 워커 수 <= workers
+    - Exports/_batch 하위에 문서 통합 tables_index 및 문서별 처리량 요약 저장
+    """
+    input_dir = Path(args.input_dir)
+    pdf_paths = sorted((p for p in input_dir.glob(args.glob) if p.is_file()),
+                       key=lambda p: p.stat().st_size, reverse=True)
+    
+    # 같은 파일명은 같은 Exports 폴더(slug)로 매핑되므로 첫 파일만 처리
+    seen_names, docs = set(), []
+    for p in pdf_paths:
+        if p.name in seen_names:
+            print(f"⚠️ [건너뜀] 파일명 중복으로 출력 폴더가 겹칩니다: {p}")
+            continue
+        seen_names.add(p.name)
+        docs.append(p)
+    if not docs:
+        print(f"❌ 처리할 PDF가 없습니다: {input_dir / args.glob}")
+        return
+    
+    total_workers = max(1, args.workers)
+    doc_workers = min(total_workers, len(docs))
+    page_workers = max(1, total_workers // doc_workers)
+    print(f"📚 일괄 처리: 문서 {len(docs)}개, 동시 처리 {doc_workers}개 x 페이지 워커 {page_workers}개")
+    
+    started = time.perf_counter()
+    summaries, tables_index = [], []
+    if doc_workers == 1:
+        for p in docs:
+            summary, rows = process_document(p, args, page_workers)
+            summaries.append(summary)
+            tables_index.extend(rows)
+    else:
+        with ProcessPoolExecutor(max_workers=doc_workers) as executor:
+            futures = [executor.submit(process_document, p, args, page_workers) for p in docs]
+            for future in futures:
+                summary, rows = future.result()
+                summaries.append(summary)
+                tables_index.extend(rows)
+    elapsed = time.perf_counter() - started
+    
+    ts = datetime.datetime.now().strftime("%m%d%H%M")
+    batch_dir = Path.cwd() / "Exports" / "_batch"
+    batch_dir.mkdir(parents=True, exist_ok=True)
+    if tables_index:
+        pd.DataFrame(tables_index).to_csv(batch_dir / f"tables_index_{ts}.csv", index=False, encoding=args.csv_encoding)
+    df_summary = pd.DataFrame(summaries)
+    df_summary.to_csv(batch_dir / f"batch_summary_{ts}.csv", index=False, encoding=args.csv_encoding)
+    
+    print("\n" + "=" * 65)
+    print(f" 📊 일괄 처리 요약 (총 {elapsed:.1f}초)")
+    print("=" * 65)
+    for row in summaries:
+        name = row["doc_id"] or Path(row["source_pdf_path"]).name
+        if row["status"] == "완료":
+            print(f"  ✅ {name}: {row['pages']}쪽, 표 {row['tables']}개, {row['elapsed_sec']:.1f}초 "
+                  f"({row['pages_per_sec']:.2f} pages/sec, {row['tables_per_sec']:.2f} tables/sec)")
+        else:
+            print(f"  ❌ {name}: {row['error']}")
+    print(f"📂 {batch_dir.resolve()}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="PDF 데이터 무손실 구조화 시스템")
     parser.add_argument("--pdf", type=str, default="", help="처리할 PDF 파일 경로 (미지정 시 탐색기 창 열림)")
@@ -330,6 +676,11 @@ def main():
     parser.add_argument("--render-all", action="store_true", help="모든 페이지 강제 렌더링")
     parser.add_argument("--render-pages", type=str, default="", help="특정 페이지 범위 지정 렌더링 (예: 1,3,5-8)")
     parser.add_argument("--csv-encoding", type=str, choices=["utf-8-sig", "utf-8"], default="utf-8-sig", help="CSV 저장 인코딩 형식")
+    parser.add_argument("--scan-all-tables", action="store_true", help="표 사전 필터를 끄고 모든 페이지에서 표 추출 시도")
+    parser.add_argument("--no-cache", action="store_true", help="기존 페이지 캐시를 무시하고 모든 페이지 재계산 (캐시는 새로 기록)")
+    parser.add_argument("--workers", type=int, default=1, help="병렬 처리 프로세스 수 상한 (1이면 직렬 실행, 일괄 모드에서는 문서·페이지 병렬 합계)")
+    parser.add_argument("--input-dir", type=str, default="", help="일괄 처리할 PDF 폴더 (지정 시 탐색기 창 없이 실행)")
+    parser.add_argument("--glob", type=str, default="*.pdf", help="일괄 처리 파일 패턴 (예: *.pdf, **/*.pdf)")
     
     args = parser.parse_args()
     
@@ -337,6 +688,13 @@ def main():
     print(" 📑 로컬 PDF 비정형 데이터 정밀 추출 파이프라인 (Windows) ")
     print("=" * 65)
     
+    if args.input_dir:
+        if not os.path.isdir(args.input_dir):
+            print(f"❌ 입력 폴더가 존재하지 않습니다: {args.input_dir}")
+            sys.exit(1)
+        run_batch(args)
+        return
+    
     pdf_path = args.pdf
     if not pdf_path:
         print("💡 분석할 PDF를 시스템 파일 탐색기에서 선택해 주세요...")
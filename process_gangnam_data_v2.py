@@ -1,71 +1,257 @@
+"""
+서울시 상권 CSV에서 지정한 장소/자치구의 상권만 추출
+- 장소 목록(예: 서울시 주요 82장소 목록) 또는 자치구 이름으로 상권_코드 집합을 만든 뒤
+  pyarrow.dataset 스캔 단계에서 상권_코드 필터를 적용 (전체 파일을 DataFrame으로 올리지 않음)
+- Parquet 레이크(sangkwon_lake.py)가 원본과 같은 버전이면 해당 자치구 파티션만 읽고, 아니면 원본 CSV를 스캔
+  (레이크에서 읽어도 컬럼 구성/순서와 행 순서는 원본 CSV 스캔 결과와 동일)
+- 10개 파일을 동시에 처리하고, 필터된 배치는 읽는 즉시 결과 CSV에 추가
 
-import pandas as pd
-import os
+사용 예:
+    python process_gangnam_data_v2.py                                   # 강남구 82장소 목록 (기본)
+    python process_gangnam_data_v2.py --districts 서초구 --label Seocho
+    python process_gangnam_data_v2.py --places-file "목록(송파구).csv" --label Songpa --quarters 20221-20244
+"""
+import argparse
 import glob
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+import pandas as pd
+
+import sangkwon_lake
+
 # 1. 설정
 DATA_DIR = r'd:\git_rk\data\서울시 상권'
 GANGNAM_LIST_FILE = r'd:\git_rk\data\서울시 주요 82장소 영역\서울시 주요 82장소 목록(강남구).csv'
-TIMESTAMP = datetime.now().strftime('%Y%m%d_%H%M%S')
-REPORT_DIR = os.path.join(r'd:\git_rk', 'REPORT', f'Gangnam_CSV_{TIMESTAMP}')
+PLACE_COLUMN = 'AREA_NM'            # 장소 목록 파일의 장소명 컬럼
+DEFAULT_DISTRICTS = ['강남구']       # 장소명 매칭 결과가 없을 때 사용할 자치구
+DEFAULT_LABEL = 'Gangnam'           # 결과 폴더/파일 접두어 (Gangnam_CSV_..., gangnam_...)
+REPORT_ROOT = os.path.join(r'd:\git_rk', 'REPORT')
+MAX_WORKERS = None                  # 동시에 처리할 파일 수 (None이면 파일 수만큼)
 
-os.makedirs(REPORT_DIR, exist_ok=True)
 
-print(f"작업 시작... 저장 경로: {REPORT_DIR}")
+def default_lake_dir(data_dir):
+    """원본 폴더에 대응하는 레이크 폴더 (sangkwon_lake 기본 구성과 같이 {data_dir}/parquet)"""
+    return os.path.join(data_dir, 'parquet')
 
-# 2. 강남구 목록에서 상권 코드 추출
-try:
-    # 사용자 제공 목록 읽기
-    df_list = pd.read_csv(GANGNAM_LIST_FILE, encoding='utf-8')
-    target_names = df_list['AREA_NM'].dropna().unique().tolist()
-    print(f"필터링 기준 명칭 추출 완료: {len(target_names)}개")
 
-    # 상권 영역 데이터에서 코드 매칭
-    area_file = os.path.join(DATA_DIR, '서울시 상권분석서비스(영역-상권).csv')
-    
-    # 인코딩 자동 시도 로직
-    try:
-        df_area = pd.read_csv(area_file, encoding='utf-8-sig')
-    except UnicodeDecodeError:
-        df_area = pd.read_csv(area_file, encoding='cp949')
-    
-    # 명칭 매칭을 통한 코드 리스트 생성
-    gangnam_codes = df_area[df_area['상권_코드_명'].isin(target_names)]['상권_코드'].unique().tolist()
-    print(f"매칭된 상권 코드 개수: {len(gangnam_codes)}개")
-    
-    if not gangnam_codes:
-        print("경고: 명칭 매칭 결과가 없습니다. '자치구_코드_명' 기준 강남구 데이터를 탐색합니다.")
-        gangnam_codes = df_area[df_area['자치구_코드_명'] == '강남구']['상권_코드'].unique().tolist()
-        print(f"행정구역 기준 추출된 강남구 상권 코드 개수: {len(gangnam_codes)}개")
-
-except Exception as e:
-    print(f"필터링 기준 확보 실패: {e}")
-    gangnam_codes = []
-
-# 3. 10개 CSV 파일 필터링
-if gangnam_codes:
-    csv_files = glob.glob(os.path.join(DATA_DIR, '*.csv'))
-    for f in csv_files:
-        filename = os.path.basename(f)
-        print(f"처리 중: {filename}...")
-        try:
-            # 개별 파일도 인코딩 자동 시도
+def load_area(data_dir=DATA_DIR, lake_dir=None):
+    """영역-상권 테이블 (레이크가 최신이면 레이크, 아니면 원본 CSV)"""
+    lake_dir = lake_dir or default_lake_dir(data_dir)
+    area_file = os.path.join(data_dir, sangkwon_lake.DATASETS[sangkwon_lake.AREA_DATASET])
+    if sangkwon_lake.is_current(sangkwon_lake.AREA_DATASET, data_dir, lake_dir):
+        return sangkwon_lake.read_dataset(sangkwon_lake.AREA_DATASET, lake_dir=lake_dir,
+                                          columns=sangkwon_lake.source_columns(area_file))
+    return sangkwon_lake.open_csv_dataset(area_file, lake_dir=lake_dir).to_table().to_pandas()
+
+
+def read_place_names(places_file):
+    """장소 목록 파일에서 장소명 목록 읽기"""
+    df_list = pd.read_csv(places_file, encoding='utf-8')
+    return df_list[PLACE_COLUMN].dropna().unique().tolist()
+
+
+def resolve_codes(df_area, places=None, districts=None):
+    """
+    장소명 / 자치구 목록을 상권_코드 목록으로 변환
+
+    Parameters:
+    -----------
+    places : list, optional
+        상권_코드_명과 일치시킬 장소명 목록
+    districts : list, optional
+        자치구_코드_명 목록. 장소명과 함께 주면 두 결과를 합칩니다.
+
+    Returns:
+    --------
+    (list, list)
+        상권_코드 목록, 해당 상권들이 속한 자치구 목록
+    """
+    code_column = sangkwon_lake.CODE_COLUMN
+    district_column = sangkwon_lake.DISTRICT_COLUMN
+    mask = pd.Series(False, index=df_area.index)
+    if places:
+        mask |= df_area['상권_코드_명'].isin(places)
+        print(f"장소명 매칭 상권 코드 개수: {df_area.loc[mask, code_column].nunique()}개")
+    if districts:
+        mask |= df_area[district_column].isin(districts)
+    matched = df_area[mask]
+    return matched[code_column].unique().tolist(), matched[district_column].unique().tolist()
+
+
+def source_dataset(source_file, data_dir=DATA_DIR, lake_dir=None):
+    """
+    원본 파일에 대응하는 스캔 대상 (Dataset, 레이크 여부)
+
+    레이크에 같은 버전이 적재되어 있으면 파티션 Dataset, 아니면 원본 CSV Dataset을 반환합니다.
+    """
+    lake_dir = lake_dir or default_lake_dir(data_dir)
+    filename = os.path.basename(source_file)
+    for name, dataset_file in sangkwon_lake.DATASETS.items():
+        if dataset_file == filename and sangkwon_lake.is_current(name, data_dir, lake_dir):
+            return sangkwon_lake.open_dataset(name, lake_dir), True
+    return sangkwon_lake.open_csv_dataset(source_file, lake_dir=lake_dir), False
+
+
+def _lake_batches(dataset, columns, expr):
+    """
+    레이크 스캔 결과를 원본 CSV와 같은 형태로 복원한 배치
+
+    파티션 컬럼은 원본 헤더 위치로 되돌리고 (원본에 없던 자치구_코드_명은 제외), 파티션별로 묶여 나오는
+    행은 적재 시 저장한 원본 행 번호로 다시 정렬합니다. 필터 결과(해당 자치구 파티션)만 메모리에 올립니다.
+    """
+    pa, pc = sangkwon_lake._import_pyarrow()[:2]
+    table = dataset.to_table(columns=columns + [sangkwon_lake.ROW_COLUMN], filter=expr)
+    table = table.sort_by(sangkwon_lake.ROW_COLUMN).drop([sangkwon_lake.ROW_COLUMN])
+    if sangkwon_lake.DISTRICT_COLUMN in columns:
+        # 적재 시 빈 자치구를 파티션 값 '미상'으로 채웠으므로 원본처럼 빈 값으로 복원
+        i = table.schema.get_field_index(sangkwon_lake.DISTRICT_COLUMN)
+        district = table.column(i)
+        unknown = pc.equal(district, sangkwon_lake.UNKNOWN_DISTRICT)
+        table = table.set_column(i, sangkwon_lake.DISTRICT_COLUMN,
+                                 pc.if_else(unknown, pa.scalar(None, pa.string()), district))
+    return table.to_batches()
+
+
+def filter_file(source_file, out_path, codes, districts=None, quarters=None, data_dir=DATA_DIR, lake_dir=None):
+    """
+    파일 하나를 상권_코드 필터로 스캔하여 일치하는 배치를 바로 결과 CSV에 추가
+
+    Returns:
+    --------
+    dict
+        file, rows, lake, seconds (상권_코드 컬럼이 없으면 rows는 None)
+    """
+    started = time.perf_counter()
+    dataset, from_lake = source_dataset(source_file, data_dir, lake_dir)
+    columns = sangkwon_lake.source_columns(source_file)
+    result = {'file': os.path.basename(source_file), 'rows': None, 'lake': from_lake}
+    if sangkwon_lake.CODE_COLUMN not in columns:
+        result['seconds'] = time.perf_counter() - started
+        return result
+
+    # 레이크에서는 자치구 파티션 단위로 먼저 걸러냄
+    expr = sangkwon_lake.partition_filter(
+        dataset, districts=districts if from_lake else None, quarters=quarters, codes=codes
+    )
+    if from_lake:
+        batches = _lake_batches(dataset, columns, expr)
+    else:
+        batches = dataset.to_batches(columns=columns, filter=expr)
+
+    rows = 0
+    with open(out_path, 'w', encoding='utf-8-sig', newline='') as out:
+        pd.DataFrame(columns=columns).to_csv(out, index=False)
+        for batch in batches:
+            if batch.num_rows:
+                batch.to_pandas().to_csv(out, index=False, header=False)
+                rows += batch.num_rows
+    result['rows'] = rows
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+
+def filter_files(source_files, output_dir, prefix, codes, districts=None, quarters=None,
+                 data_dir=DATA_DIR, workers=MAX_WORKERS, lake_dir=None):
+    """
+    여러 파일을 동시에 필터링 (파일마다 {prefix}_{원본파일명}으로 저장)
+
+    Returns:
+    --------
+    list
+        filter_file 결과(dict) 목록 (실패한 파일 제외)
+    """
+    results = []
+    with ThreadPoolExecutor(max_workers=workers or max(len(source_files), 1)) as executor:
+        futures = {
+            executor.submit(
+                filter_file, f, os.path.join(output_dir, f'{prefix}_{os.path.basename(f)}'),
+                codes, districts, quarters, data_dir, lake_dir
+            ): os.path.basename(f)
+            for f in source_files
+        }
+        for future in as_completed(futures):
+            filename = futures[future]
             try:
-                df = pd.read_csv(f, encoding='utf-8-sig')
-            except UnicodeDecodeError:
-                df = pd.read_csv(f, encoding='cp949')
-                
-            if '상권_코드' in df.columns:
-                filtered_df = df[df['상권_코드'].astype(str).isin([str(c) for c in gangnam_codes])]
-                out_path = os.path.join(REPORT_DIR, f'gangnam_{filename}')
-                filtered_df.to_csv(out_path, index=False, encoding='utf-8-sig')
-                print(f"  -> 저장됨: {len(filtered_df)}행")
-            else:
-                print(f"  -> '상권_코드' 컬럼이 없어 건너뜁니다.")
-        except Exception as e:
-            print(f"  -> 처리 실패: {e}")
-else:
-    print("처리할 상권 코드가 없어 중단합니다.")
-
-print("모든 작업이 완료되었습니다.")
+                result = future.result()
+            except Exception as e:
+                print(f"  -> 처리 실패: {filename}: {e}")
+                continue
+            if result['rows'] is None:
+                print(f"  -> '상권_코드' 컬럼이 없어 건너뜁니다: {filename}")
+                continue
+            results.append(result)
+            print(f"  -> 저장됨: {filename} ({result['rows']}행, "
+                  f"{'레이크' if result['lake'] else 'CSV'}, {result['seconds']:.1f}초)")
+    return results
+
+
+def parse_quarters(text):
+    """'20221-20244' → (20221, 20244), '20221,20222' → [20221, 20222]"""
+    if not text:
+        return None
+    if '-' in text:
+        start, end = text.split('-', 1)
+        return int(start), int(end)
+    return [int(q) for q in text.split(',')]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="서울시 상권 CSV에서 지정한 장소/자치구의 상권만 추출")
+    parser.add_argument('--places-file', help=f"장소 목록 CSV ({PLACE_COLUMN} 컬럼)")
+    parser.add_argument('--places', nargs='+', help="장소명 목록 (상권_코드_명과 일치)")
+    parser.add_argument('--districts', nargs='+', help="자치구 이름 목록 (예: 강남구 서초구)")
+    parser.add_argument('--quarters', help="분기 범위 (예: 20221-20244) 또는 목록 (예: 20241,20242)")
+    parser.add_argument('--label', default=DEFAULT_LABEL, help="결과 폴더/파일 접두어")
+    parser.add_argument('--data-dir', default=DATA_DIR, help="원본 CSV 폴더")
+    parser.add_argument('--lake-dir', help="Parquet 레이크 폴더 (기본: {data-dir}/parquet)")
+    parser.add_argument('--output-dir', help="결과 폴더 (기본: REPORT/{label}_CSV_{시각})")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help="동시에 처리할 파일 수")
+    args = parser.parse_args(argv)
+
+    # 아무 조건도 주지 않으면 기존과 같이 강남구 82장소 목록 (매칭 없으면 강남구 전체)
+    default_mode = not (args.places_file or args.places or args.districts)
+    places_file = GANGNAM_LIST_FILE if default_mode else args.places_file
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    output_dir = args.output_dir or os.path.join(REPORT_ROOT, f'{args.label}_CSV_{timestamp}')
+    os.makedirs(output_dir, exist_ok=True)
+    print(f"작업 시작... 저장 경로: {output_dir}")
+
+    # 2. 장소/자치구 목록에서 상권 코드 추출
+    try:
+        places = list(args.places or [])
+        if places_file:
+            places += read_place_names(places_file)
+            print(f"필터링 기준 명칭 추출 완료: {len(places)}개")
+
+        df_area = load_area(args.data_dir, args.lake_dir)
+        codes, districts = resolve_codes(df_area, places, args.districts)
+        print(f"매칭된 상권 코드 개수: {len(codes)}개")
+
+        if not codes and default_mode:
+            print(f"경고: 명칭 매칭 결과가 없습니다. '자치구_코드_명' 기준 {DEFAULT_DISTRICTS} 데이터를 탐색합니다.")
+            codes, districts = resolve_codes(df_area, districts=DEFAULT_DISTRICTS)
+            print(f"행정구역 기준 추출된 상권 코드 개수: {len(codes)}개")
+    except Exception as e:
+        print(f"필터링 기준 확보 실패: {e}")
+        codes, districts = [], []
+
+    # 3. 10개 파일 동시 필터링
+    if not codes:
+        print("처리할 상권 코드가 없어 중단합니다.")
+        return
+
+    source_files = glob.glob(os.path.join(args.data_dir, '*.csv'))
+    print(f"처리 중: {len(source_files)}개 파일 (자치구 {districts})...")
+    started = time.perf_counter()
+    results = filter_files(source_files, output_dir, args.label.lower(), codes, districts,
+                           parse_quarters(args.quarters), args.data_dir, args.workers, args.lake_dir)
+    print(f"모든 작업이 완료되었습니다. ({len(results)}개 파일, {sum(r['rows'] for r in results)}행, "
+          f"{time.perf_counter() - started:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()
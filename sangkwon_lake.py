@@ -0,0 +1,432 @@
+"""
+서울시 상권분석서비스 CSV → 파티션 Parquet 레이크 변환 (1회 적재 후 재사용)
+- 데이터셋별 폴더에 기준_년분기_코드 / 자치구_코드_명 기준 hive 파티션으로 저장
+- 자치구_코드_명이 없는 데이터셋은 영역-상권의 상권_코드 → 자치구 매핑으로 컬럼 추가
+- 컬럼 타입 고정 (기준_년분기_코드: int32, *_명: 문자열, 나머지: 파일 전체를 훑어 int64/float64/문자열 결정)
+- 원본 행 순서(_row)를 함께 저장해 조회 결과를 원본 CSV와 같은 순서로 복원
+- 원본 파일 크기/수정 시각이 같으면 다시 적재하지 않음
+  (영역-상권 매핑으로 자치구를 붙인 데이터셋은 영역-상권이 다시 적재되면 함께 다시 적재)
+- 조회 시 필요한 파티션만 읽음 (예: 강남구, 2022년 1분기~2024년 4분기)
+
+사용 예:
+    python sangkwon_lake.py                  # 전체 데이터셋 적재 (변경된 파일만)
+    python sangkwon_lake.py --force          # 전체 다시 적재
+
+    from sangkwon_lake import read_dataset
+    df = read_dataset('추정매출-상권', districts=['강남구'], quarters=(20221, 20244))
+"""
+import argparse
+import csv
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from csv_transcoder import detect_encoding
+
+# 원본 디렉토리와 레이크 디렉토리 설정
+SOURCE_DIR = Path(r"d:\git_rk\data\서울시 상권")
+LAKE_DIR = Path(r"d:\git_rk\data\서울시 상권\parquet")
+
+# 데이터셋 이름 → 원본 파일명
+DATASETS = {
+    '영역-상권': "서울시 상권분석서비스(영역-상권).csv",
+    '길단위인구-상권': "서울시 상권분석서비스(길단위인구-상권).csv",
+    '상권변화지표-상권': "서울시 상권분석서비스(상권변화지표-상권).csv",
+    '상주인구-상권': "서울시 상권분석서비스(상주인구-상권).csv",
+    '소득소비-상권': "서울시 상권분석서비스(소득소비-상권).csv",
+    '점포-상권': "서울시 상권분석서비스(점포-상권)_2022년 1분기~2024년 4분기.csv",
+    '직장인구-상권': "서울시 상권분석서비스(직장인구-상권).csv",
+    '직장인구-상권배후지': "서울시 상권분석서비스(직장인구-상권배후지).csv",
+    '집객시설-상권': "서울시 상권분석서비스(집객시설-상권).csv",
+    '추정매출-상권': "서울시 상권분석서비스(추정매출-상권)__2022년 1분기~2024년 4분기.csv",
+}
+
+AREA_DATASET = '영역-상권'          # 상권_코드 → 자치구_코드_명 매핑 원천
+QUARTER_COLUMN = '기준_년분기_코드'
+DISTRICT_COLUMN = '자치구_코드_명'
+CODE_COLUMN = '상권_코드'
+UNKNOWN_DISTRICT = '미상'           # 영역-상권에 없는 상권_코드의 자치구 파티션 값
+BLOCK_SIZE = 64 << 20               # CSV 읽기 블록 크기 (64MB)
+ROW_COLUMN = '_row'                # 원본 CSV 행 번호 (0부터, 순서 복원용)
+MANIFEST_NAME = '_ingest.json'
+LAKE_VERSION = 2                   # 적재 형식 버전 (올리면 기존 레이크는 최신이 아닌 것으로 판정)
+SCHEMA_DIR_NAME = '_schemas'       # 파일별 컬럼 타입 캐시 (레이크 폴더 하위)
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.csv as pa_csv
+        import pyarrow.dataset as ds
+    except ImportError as e:
+        raise ImportError("Parquet 레이크에는 pyarrow 패키지가 필요합니다. (pip install pyarrow)") from e
+    return pa, pc, pa_csv, ds
+
+
+def fixed_types(header):
+    """이름으로 타입이 정해지는 컬럼 (기준_년분기_코드, *_명, *_구분_코드)"""
+    pa = _import_pyarrow()[0]
+    types = {}
+    for name in header:
+        if name == QUARTER_COLUMN:
+            types[name] = pa.int32()
+        elif name.endswith('_명') or name.endswith('_구분_코드'):
+            types[name] = pa.string()
+    return types
+
+
+def _read_header(source_file):
+    encoding = detect_encoding(source_file)
+    with open(source_file, 'r', encoding=encoding, newline='') as f:
+        header = next(csv.reader(f))
+    return 'utf8' if encoding.startswith('utf-8') else encoding, header
+
+
+def source_columns(source_file):
+    """원본 CSV 헤더의 컬럼 목록 (원래 순서)"""
+    return _read_header(source_file)[1]
+
+
+def infer_column_types(source_file, block_size=BLOCK_SIZE):
+    """
+    파일 전체를 한 번 훑어 컬럼별 타입 결정
+
+    pyarrow 스트리밍 읽기는 첫 블록만 보고 타입을 고정하므로, 뒤쪽 블록에 소수나 문자가 나오면
+    적재가 중간에 실패합니다. 모든 값을 문자열로 읽은 뒤 컬럼마다 int64 → float64 → 문자열 순으로
+    전체 값이 변환되는 첫 타입을 고릅니다 (빈 값은 결측).
+    """
+    pa, pc, pa_csv, _ = _import_pyarrow()
+    encoding, header = _read_header(source_file)
+    types = fixed_types(header)
+    candidates = [pa.int64(), pa.float64(), pa.string()]
+    level = {name: 0 for name in header if name not in types}
+    reader = pa_csv.open_csv(
+        source_file,
+        read_options=pa_csv.ReadOptions(encoding=encoding, block_size=block_size),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.string() for name in header}, strings_can_be_null=True
+        )
+    )
+    for batch in reader:
+        for name in level:
+            column = batch.column(header.index(name))
+            while level[name] < len(candidates) - 1:
+                try:
+                    pc.cast(column, candidates[level[name]])
+                    break
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                    level[name] += 1
+    types.update({name: candidates[i] for name, i in level.items()})
+    return types
+
+
+def column_types(source_file, lake_dir=LAKE_DIR):
+    """
+    원본 파일의 컬럼 타입 (레이크 폴더의 _schemas 캐시 사용, 원본 크기/수정 시각이 바뀌면 다시 계산)
+
+    캐시는 레이크 폴더가 이미 있을 때만 저장합니다 (레이크 없이 원본 CSV만 스캔할 때 폴더를 만들지 않음).
+    """
+    pa = _import_pyarrow()[0]
+    source_file = Path(source_file)
+    cache_file = Path(lake_dir) / SCHEMA_DIR_NAME / f'{source_file.name}.json'
+    signature = _source_signature(source_file)
+    if cache_file.exists():
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if all(cached.get(key) == signature[key] for key in ('size', 'mtime')):
+            return {name: pa.type_for_alias(alias) for name, alias in cached['types'].items()}
+    types = infer_column_types(source_file)
+    if Path(lake_dir).is_dir():
+        cache_file.parent.mkdir(exist_ok=True)
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(dict(signature, types={name: str(t) for name, t in types.items()}), f,
+                      ensure_ascii=False, indent=2)
+    return types
+
+
+def _csv_options(source_file, block_size=BLOCK_SIZE, lake_dir=LAKE_DIR):
+    pa_csv = _import_pyarrow()[2]
+    encoding, _ = _read_header(source_file)
+    read_options = pa_csv.ReadOptions(encoding=encoding, block_size=block_size)
+    return read_options, pa_csv.ConvertOptions(column_types=column_types(source_file, lake_dir))
+
+
+def _open_csv(source_file, lake_dir=LAKE_DIR):
+    pa_csv = _import_pyarrow()[2]
+    read_options, convert_options = _csv_options(source_file, lake_dir=lake_dir)
+    return pa_csv.open_csv(source_file, read_options=read_options, convert_options=convert_options)
+
+
+def open_csv_dataset(source_file, block_size=BLOCK_SIZE, lake_dir=LAKE_DIR):
+    """
+    원본 CSV를 레이크와 같은 컬럼 타입의 pyarrow Dataset으로 열기 (레이크 적재 전에도 필터 스캔 가능)
+    """
+    ds = _import_pyarrow()[3]
+    read_options, convert_options = _csv_options(source_file, block_size, lake_dir)
+    return ds.dataset(
+        str(source_file),
+        format=ds.CsvFileFormat(read_options=read_options, convert_options=convert_options)
+    )
+
+
+def _manifest_path(name, lake_dir):
+    return Path(lake_dir) / name / MANIFEST_NAME
+
+
+def _source_signature(source_file):
+    stat = Path(source_file).stat()
+    return {'source': str(source_file), 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+
+def _read_manifest(name, lake_dir):
+    manifest = _manifest_path(name, lake_dir)
+    if not manifest.exists():
+        return None
+    with open(manifest, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def is_current(name, source_dir=SOURCE_DIR, lake_dir=LAKE_DIR):
+    """
+    레이크에 적재된 데이터셋이 원본 파일과 같은 버전인지 확인
+
+    자치구_코드_명을 영역-상권 매핑으로 붙인 데이터셋은 영역-상권도 최신이고 적재 당시의 영역-상권이
+    지금 레이크의 영역-상권과 같아야 최신으로 판정합니다 (매핑이 바뀌면 파티션도 바뀜).
+    """
+    saved = _read_manifest(name, lake_dir)
+    if saved is None:
+        return False
+    current = _source_signature(Path(source_dir) / DATASETS[name])
+    if saved.get('version') != LAKE_VERSION or any(saved.get(key) != current[key] for key in ('size', 'mtime')):
+        return False
+    if 'area' in saved:
+        if not is_current(AREA_DATASET, source_dir, lake_dir):
+            return False
+        area = _read_manifest(AREA_DATASET, lake_dir)
+        return all(saved['area'].get(key) == area.get(key) for key in ('size', 'mtime'))
+    return True
+
+
+def load_district_map(lake_dir=LAKE_DIR):
+    """영역-상권 레이크에서 상권_코드(문자열) → 자치구_코드_명 매핑 읽기"""
+    ds = _import_pyarrow()[3]
+    table = ds.dataset(Path(lake_dir) / AREA_DATASET, format='parquet', partitioning='hive') \
+        .to_table(columns=[CODE_COLUMN, DISTRICT_COLUMN])
+    codes = [str(c) for c in table.column(CODE_COLUMN).to_pylist()]
+    return dict(zip(codes, table.column(DISTRICT_COLUMN).to_pylist()))
+
+
+def ingest_dataset(name, source_dir=SOURCE_DIR, lake_dir=LAKE_DIR, district_map=None):
+    """
+    데이터셋 하나를 배치 단위로 읽어 파티션 Parquet으로 저장
+
+    Parameters:
+    -----------
+    name : str
+        DATASETS의 데이터셋 이름
+    district_map : dict, optional
+        상권_코드(문자열) → 자치구_코드_명. 원본에 자치구_코드_명이 없을 때 사용
+        (레이크의 영역-상권에서 읽은 매핑. 그 버전을 매니페스트에 함께 기록)
+
+    Returns:
+    --------
+    dict
+        name, rows, partitions, seconds
+    """
+    pa, pc, pa_csv, ds = _import_pyarrow()
+    started = time.perf_counter()
+    source_file = Path(source_dir) / DATASETS[name]
+    target_dir = Path(lake_dir) / name
+
+    Path(lake_dir).mkdir(parents=True, exist_ok=True)  # 컬럼 타입 캐시(_schemas)도 이 폴더에 저장
+    reader = _open_csv(source_file, lake_dir)
+    schema = reader.schema
+    partition_fields = []
+    if QUARTER_COLUMN in schema.names:
+        partition_fields.append(schema.field(QUARTER_COLUMN))
+
+    add_district = DISTRICT_COLUMN not in schema.names
+    if add_district:
+        if CODE_COLUMN not in schema.names or district_map is None:
+            raise ValueError(f"{name}: '{DISTRICT_COLUMN}'도 '{CODE_COLUMN}' 매핑도 없어 자치구 파티션을 만들 수 없음")
+        codes = pa.array(list(district_map.keys()), type=pa.string())
+        districts = pa.array(list(district_map.values()), type=pa.string())
+        schema = schema.append(pa.field(DISTRICT_COLUMN, pa.string()))
+    partition_fields.append(schema.field(DISTRICT_COLUMN))
+    schema = schema.append(pa.field(ROW_COLUMN, pa.int64()))
+
+    manifest = dict(_source_signature(source_file), version=LAKE_VERSION)
+    if add_district:
+        area = _read_manifest(AREA_DATASET, lake_dir) or {}
+        manifest['area'] = {key: area.get(key) for key in ('size', 'mtime')}
+
+    rows = [0]
+
+    def batches():
+        for batch in reader:
+            columns = batch.columns
+            if add_district:
+                index = pc.index_in(pc.cast(batch.column(CODE_COLUMN), pa.string()), value_set=codes)
+                columns = columns + [pc.fill_null(pc.take(districts, index), UNKNOWN_DISTRICT)]
+            else:
+                i = schema.get_field_index(DISTRICT_COLUMN)
+                columns[i] = pc.fill_null(columns[i], UNKNOWN_DISTRICT)
+            row = pa.array(range(rows[0], rows[0] + batch.num_rows), type=pa.int64())
+            rows[0] += batch.num_rows
+            yield pa.RecordBatch.from_arrays(columns + [row], schema=schema)
+
+    # 기존 적재본은 통째로 교체 (파티션 값이 바뀐 경우 남은 파일이 섞이지 않도록)
+    tmp_dir = target_dir.with_name(target_dir.name + '.tmp')
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    ds.write_dataset(
+        batches(),
+        tmp_dir,
+        schema=schema,
+        format='parquet',
+        partitioning=ds.partitioning(pa.schema(partition_fields), flavor='hive'),
+        existing_data_behavior='overwrite_or_ignore',
+        max_partitions=100000,
+    )
+    with open(tmp_dir / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(dict(manifest, rows=rows[0]), f, ensure_ascii=False, indent=2)
+    if target_dir.exists():
+        shutil.rmtree(target_dir)
+    os.replace(tmp_dir, target_dir)
+
+    partitions = sum(1 for _ in target_dir.rglob('*.parquet'))
+    return {'name': name, 'rows': rows[0], 'partitions': partitions, 'seconds': time.perf_counter() - started}
+
+
+def ingest_all(names=None, source_dir=SOURCE_DIR, lake_dir=LAKE_DIR, workers=None, force=False):
+    """
+    영역-상권을 먼저 적재해 자치구 매핑을 만든 뒤 나머지 데이터셋을 프로세스 풀에서 병렬 적재
+
+    영역-상권이 다시 적재되면 그 매핑으로 자치구를 붙인 데이터셋도 최신이 아니게 되어 함께 다시 적재합니다.
+
+    Returns:
+    --------
+    list
+        적재 결과(dict) 목록 (건너뛴 데이터셋 제외)
+    """
+    names = list(names or DATASETS)
+    results = []
+
+    if (force and AREA_DATASET in names) or not is_current(AREA_DATASET, source_dir, lake_dir):
+        results.append(ingest_dataset(AREA_DATASET, source_dir, lake_dir))
+        print(f"  - 적재 완료: {AREA_DATASET} ({results[-1]['rows']:,}행)")
+    elif AREA_DATASET in names:
+        print(f"  - 변경 없음, 건너뜀: {AREA_DATASET}")
+    district_map = load_district_map(lake_dir)
+
+    # 영역-상권 적재 후에 판정 (매핑이 바뀐 데이터셋 포함)
+    others = []
+    for name in names:
+        if name == AREA_DATASET:
+            continue
+        if force or not is_current(name, source_dir, lake_dir):
+            others.append(name)
+        else:
+            print(f"  - 변경 없음, 건너뜀: {name}")
+    others.sort(key=lambda n: (Path(source_dir) / DATASETS[n]).stat().st_size, reverse=True)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(ingest_dataset, n, source_dir, lake_dir, district_map): n for n in others}
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(f"  - 적재 완료: {result['name']} ({result['rows']:,}행, "
+                  f"파일 {result['partitions']}개, {result['seconds']:.1f}초)")
+    return results
+
+
+def open_dataset(name, lake_dir=LAKE_DIR):
+    """파티션 정보를 포함한 pyarrow Dataset 반환 (필터는 파티션 단위로 먼저 적용됨)"""
+    ds = _import_pyarrow()[3]
+    path = Path(lake_dir) / name
+    if not path.exists():
+        raise FileNotFoundError(f"레이크에 '{name}' 데이터셋이 없습니다. 먼저 python sangkwon_lake.py 를 실행하세요.")
+    return ds.dataset(path, format='parquet', partitioning='hive')
+
+
+def partition_filter(dataset, districts=None, quarters=None, codes=None):
+    """
+    자치구 / 분기 범위 / 상권_코드 조건을 pyarrow 필터 식으로 변환
+
+    quarters: (시작, 끝) 분기 코드 튜플 (예: (20221, 20244)) 또는 분기 코드 목록
+    """
+    ds = _import_pyarrow()[3]
+    expr = None
+
+    def both(a, b):
+        return b if a is None else a & b
+
+    if districts is not None:
+        expr = both(expr, ds.field(DISTRICT_COLUMN).isin(list(districts)))
+    if quarters is not None and QUARTER_COLUMN in dataset.schema.names:
+        if isinstance(quarters, tuple) and len(quarters) == 2:
+            expr = both(expr, (ds.field(QUARTER_COLUMN) >= quarters[0]) & (ds.field(QUARTER_COLUMN) <= quarters[1]))
+        else:
+            expr = both(expr, ds.field(QUARTER_COLUMN).isin([int(q) for q in quarters]))
+    if codes is not None:
+        pa = _import_pyarrow()[0]
+        code_type = dataset.schema.field(CODE_COLUMN).type
+        values = pa.array(list(codes)).cast(code_type) if not pa.types.is_string(code_type) \
+            else pa.array([str(c) for c in codes])
+        expr = both(expr, ds.field(CODE_COLUMN).isin(values))
+    return expr
+
+
+def read_dataset(name, districts=None, quarters=None, codes=None, columns=None, lake_dir=LAKE_DIR):
+    """
+    필요한 파티션만 읽어 pandas DataFrame으로 반환
+
+    Parameters:
+    -----------
+    name : str
+        데이터셋 이름 (예: '추정매출-상권')
+    districts : list, optional
+        자치구_코드_명 목록 (예: ['강남구'])
+    quarters : tuple or list, optional
+        (시작, 끝) 분기 코드 또는 분기 코드 목록 (예: (20221, 20244))
+    codes : iterable, optional
+        상권_코드 목록
+    columns : list, optional
+        읽을 컬럼 (None이면 전체)
+
+    행은 원본 CSV 순서로 정렬해 반환합니다.
+    """
+    dataset = open_dataset(name, lake_dir)
+    expr = partition_filter(dataset, districts, quarters, codes)
+    columns = [c for c in (columns or dataset.schema.names) if c != ROW_COLUMN]
+    table = dataset.to_table(columns=columns + [ROW_COLUMN], filter=expr)
+    return table.sort_by(ROW_COLUMN).drop([ROW_COLUMN]).to_pandas()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="서울시 상권분석서비스 CSV를 파티션 Parquet 레이크로 적재")
+    parser.add_argument('--source-dir', default=str(SOURCE_DIR), help="원본 CSV 폴더")
+    parser.add_argument('--lake-dir', default=str(LAKE_DIR), help="Parquet 레이크 폴더")
+    parser.add_argument('--datasets', help="적재할 데이터셋 이름 (쉼표 구분, 기본: 전체)")
+    parser.add_argument('--workers', type=int, help="동시에 적재할 파일 수 (기본: CPU 코어 수)")
+    parser.add_argument('--force', action='store_true', help="변경 여부와 관계없이 다시 적재")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("서울시 상권 CSV → Parquet 레이크 적재 시작")
+    print("=" * 60)
+    names = [n.strip() for n in args.datasets.split(',')] if args.datasets else None
+    started = time.perf_counter()
+    results = ingest_all(names, Path(args.source_dir), Path(args.lake_dir), args.workers, args.force)
+    print("=" * 60)
+    print(f"적재 완료: {len(results)}개 데이터셋, 총 {sum(r['rows'] for r in results):,}행, "
+          f"{time.perf_counter() - started:.1f}초")
+    print(f"저장 위치: {args.lake_dir}")
+
+
+# 프로세스 풀을 쓰므로 Windows에서는 반드시 이 블록 안에서 실행
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+import math
+import os
+import re
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+BATCH_SIZE = 20000          # reviews per Arrow record batch handed to a worker
+MIN_DF = 5                  # ignore terms that appear in fewer reviews than this in rankings
+MIN_TOKEN_LENGTH = 2
+
+# Common Korean particles / copula endings stripped from the end of a Hangul token
+# when no morphological analyser is installed ("피부과에서" -> "피부과").
+# Single-syllable particles that also end common nouns (과: 피부과, 도: 만족도, 이: 어린이, 와, 로, 만, 랑)
+# are left alone so one word is not counted under two forms.
+JOSA = sorted([
+    '은', '는', '가', '을', '를', '에', '의', '으로',
+    '에서', '에게', '한테', '께서', '까지', '부터', '보다', '처럼', '이랑', '하고',
+    '이에요', '예요', '입니다', '이다', '이고', '이라', '라서', '이라서',
+], key=len, reverse=True)
+
+# Particles that only follow a syllable without a final consonant ("전문가가" -> "전문가",
+# but "전문가" itself is kept because 문 ends in ㄴ)
+AFTER_VOWEL_JOSA = {'가'}
+
+TOKEN_RE = re.compile(r'[가-힣]+|[A-Za-z]+|\d+')
+HANGUL_RE = re.compile(r'^[가-힣]+$')
+
+_kiwi = None
+
+
+def _get_kiwi():
+    """Kiwi morphological analyser if kiwipiepy is installed, else None (regex fallback)."""
+    global _kiwi
+    if _kiwi is None:
+        try:
+            from kiwipiepy import Kiwi
+            _kiwi = Kiwi()
+        except ImportError:
+            _kiwi = False
+    return _kiwi or None
+
+
+def _has_final_consonant(syllable):
+    return (ord(syllable) - 0xAC00) % 28 != 0
+
+
+def strip_josa(token):
+    if HANGUL_RE.match(token):
+        for josa in JOSA:
+            if token.endswith(josa) and len(token) - len(josa) >= MIN_TOKEN_LENGTH:
+                stem = token[:-len(josa)]
+                if josa in AFTER_VOWEL_JOSA and _has_final_consonant(stem[-1]):
+                    continue
+                return stem
+    return token
+
+
+def tokenize(text):
+    """
+    Korean-aware tokenizer.
+
+    With kiwipiepy: nouns, verb/adjective stems, roots and foreign words.
+    Without it: Hangul/Latin/digit runs with trailing particles stripped.
+    """
+    kiwi = _get_kiwi()
+    if kiwi is not None:
+        tokens = [t.form for t in kiwi.tokenize(text)
+                  if t.tag in ('NNG', 'NNP', 'VV', 'VA', 'XR', 'SL')]
+    else:
+        tokens = [strip_josa(t) for t in TOKEN_RE.findall(text)]
+    return [t for t in tokens if len(t) >= MIN_TOKEN_LENGTH]
+
+
+class KeywordStats:
+    """
+    Mergeable per-rating term statistics.
+
+    tf[rating]: term occurrences, df[rating]: reviews containing the term,
+    docs[rating]: number of reviews.
+    """
+
+    def __init__(self):
+        self.tf = {}
+        self.df = {}
+        self.docs = Counter()
+
+    def update(self, contents, ratings):
+        for text, rating in zip(contents, ratings):
+            if text is None or rating is None:
+                continue
+            tokens = tokenize(text)
+            self.tf.setdefault(rating, Counter()).update(tokens)
+            self.df.setdefault(rating, Counter()).update(set(tokens))
+            self.docs[rating] += 1
+        return self
+
+    def merge(self, other):
+        for rating, counter in other.tf.items():
+            self.tf.setdefault(rating, Counter()).update(counter)
+        for rating, counter in other.df.items():
+            self.df.setdefault(rating, Counter()).update(counter)
+        self.docs.update(other.docs)
+        return self
+
+    def total_df(self):
+        total = Counter()
+        for counter in self.df.values():
+            total.update(counter)
+        return total
+
+    def top_terms(self, rating, n=20):
+        """Most frequent terms for one rating (full corpus counts)."""
+        return self.tf.get(rating, Counter()).most_common(n)
+
+    def tfidf(self, rating, n=20, min_df=MIN_DF):
+        """
+        Terms ranked by tf(term, rating) * log(N / df(term)) over all reviews.
+        """
+        total_df = self.total_df()
+        n_docs = sum(self.docs.values())
+        scores = {
+            term: count * math.log(n_docs / total_df[term])
+            for term, count in self.tf.get(rating, Counter()).items()
+            if total_df[term] >= min_df
+        }
+        return sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:n]
+
+    def lift(self, rating, n=20, min_df=MIN_DF):
+        """
+        Terms ranked by P(term | rating) / P(term), using review (document) frequencies.
+        """
+        total_df = self.total_df()
+        n_docs = sum(self.docs.values())
+        rating_docs = self.docs.get(rating, 0)
+        if not rating_docs:
+            return []
+        scores = {
+            term: (count / rating_docs) / (total_df[term] / n_docs)
+            for term, count in self.df[rating].items()
+            if count >= min_df
+        }
+        return sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:n]
+
+
+def _count_batch(contents, ratings):
+    return KeywordStats().update(contents, ratings)
+
+
+def iter_batches(source_path, batch_size=BATCH_SIZE):
+    """Yield (contents, ratings) lists from the Parquet file or partitioned directory."""
+    import pyarrow.dataset as ds
+    source_path = Path(source_path)
+    dataset = ds.dataset(source_path, format='parquet',
+                         partitioning='hive' if source_path.is_dir() else None)
+    scanner = dataset.scanner(columns=['content', 'rating'],
+                              filter=ds.field('content').is_valid(), batch_size=batch_size)
+    for batch in scanner.to_batches():
+        if batch.num_rows:
+            yield batch.column(0).to_pylist(), batch.column(1).to_pylist()
+
+
+def compute_keyword_stats(source_path, workers=None, batch_size=BATCH_SIZE):
+    """
+    Walk every review in Arrow record batches and count terms per rating.
+
+    Batches are tokenised in parallel worker processes and the partial counters merged
+    as they finish (at most 2 batches per worker in flight to bound memory).
+    """
+    workers = workers or os.cpu_count() or 1
+    stats = KeywordStats()
+    batches = iter_batches(source_path, batch_size)
+
+    if workers == 1:
+        for contents, ratings in batches:
+            stats.update(contents, ratings)
+        return stats
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        running = set()
+        for contents, ratings in batches:
+            running.add(executor.submit(_count_batch, contents, ratings))
+            if len(running) >= workers * 2:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stats.merge(future.result())
+        for future in running:
+            stats.merge(future.result())
+    return stats
@@ -0,0 +1,236 @@
+import duckdb
+from pathlib import Path
+
+base_dir = Path(r'd:\git_rk')
+# Month-partitioned dataset written by run_conversion.py (a single .parquet file also works)
+parquet_path = base_dir / 'data' / 'processed' / 'gangnam_reviews'
+catalog_path = base_dir / 'data' / 'processed' / 'gangnam_reviews.duckdb'
+
+# Materialised aggregates: table name -> (column name, expression) grouping keys.
+# Every table stores additive metrics only (counts and sums), so new reviews can be
+# merged into the existing rows without rescanning the old ones. Averages are
+# derived at query time, e.g. rating_sum / review_count.
+# All tables are computed together in one GROUPING SETS pass over the new rows;
+# adding an entry here triggers a full rebuild on the next refresh().
+AGGREGATES = {
+    'rating_stats': [('rating', 'rating')],
+    'monthly_stats': [('month', "strftime(review_date, '%Y-%m')")],
+    'hospital_stats': [('hospital_name', 'hospital_name')],
+    'weekday_stats': [('dow_num', "strftime(review_date, '%w')")],
+    'photo_stats': [('has_photo', 'has_photo')],
+    'treatment_stats': [('treatments', 'treatments')],
+}
+
+METRICS = """
+    count(*) AS review_count,
+    sum(_rating) AS rating_sum,
+    count(_content) AS content_count,
+    sum(length(_content)) AS length_sum
+"""
+
+
+def _source_signature(path):
+    path = Path(path)
+    files = sorted(path.rglob('*.parquet')) if path.is_dir() else [path]
+    stats = [(str(f), f.stat().st_size, f.stat().st_mtime) for f in files if f.exists()]
+    return repr(stats)
+
+
+def _grouping_plan(aggregates=AGGREGATES):
+    """
+    Distinct key columns (review_id last) and, per table, the GROUPING() bitmask of its set.
+    """
+    columns = {}
+    for keys in aggregates.values():
+        for name, expr in keys:
+            columns.setdefault(name, expr)
+    columns['review_id'] = 'review_id'
+    names = list(columns)
+
+    def mask(set_names):
+        return sum(1 << (len(names) - 1 - i) for i, n in enumerate(names) if n not in set_names)
+
+    masks = {table: mask([n for n, _ in keys]) for table, keys in aggregates.items()}
+    masks['ingested_reviews'] = mask(['review_id'])
+    return columns, masks
+
+
+def grouped_metrics(con, source_sql, aggregates=AGGREGATES):
+    """
+    Compute every aggregate (plus the per-review_id set) in a single scan of source_sql.
+
+    The result is left in the temp table `grouped`; rows of one aggregate are selected with
+    `WHERE _set = masks[table]`. Returns masks.
+    """
+    columns, masks = _grouping_plan(aggregates)
+    names = ', '.join(columns)
+    projection = ', '.join(f"{expr} AS {name}" for name, expr in columns.items())
+    sets = ', '.join(
+        f"({', '.join(n for n, _ in keys)})" for keys in aggregates.values()
+    ) + ', (review_id)'
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE grouped AS
+        SELECT GROUPING({names}) AS _set, {names}, {METRICS}
+        FROM (SELECT {projection}, rating AS _rating, content AS _content FROM ({source_sql}))
+        GROUP BY GROUPING SETS ({sets})
+    """)
+    return masks
+
+
+def _gram_sql(docs_table):
+    # Character bigrams of the (lower-cased) text, skipping pairs that span whitespace.
+    # Bigrams suit Korean (no reliable word boundaries, particles glued to nouns).
+    return f"""
+        SELECT DISTINCT review_id, gram FROM (
+            SELECT review_id, substr(text, i, 2) AS gram
+            FROM (SELECT review_id, text, unnest(range(1, length(text))) AS i FROM {docs_table})
+        )
+        WHERE NOT regexp_matches(gram, '\\s')
+    """
+
+
+def update_search_index(con, source_sql, full):
+    """
+    Maintain the bigram inverted index used by review_search.py.
+
+    review_docs holds (review_id, rating, lower-cased text) for verification and rating
+    breakdowns, review_grams holds one row per (review_id, bigram).
+    """
+    docs = f"""
+        SELECT review_id, rating, lower(content) AS text FROM ({source_sql})
+        WHERE review_id IS NOT NULL AND content IS NOT NULL
+    """
+    if full or 'review_grams' not in _tables(con):
+        con.execute(f"CREATE OR REPLACE TABLE review_docs AS {docs}")
+        con.execute(f"CREATE OR REPLACE TABLE review_grams AS {_gram_sql('review_docs')} ORDER BY gram")
+        con.execute("CREATE INDEX review_grams_gram ON review_grams (gram)")
+    else:
+        con.execute(f"CREATE OR REPLACE TEMP TABLE new_docs AS {docs}")
+        con.execute("INSERT INTO review_docs SELECT * FROM new_docs")
+        con.execute(f"INSERT INTO review_grams {_gram_sql('new_docs')}")
+        con.execute("DROP TABLE new_docs")
+
+
+def connect(db_path=catalog_path, source_path=parquet_path):
+    """
+    Open the persistent catalog and (re)register the `reviews` view over the Parquet data.
+
+    The view always reads the current Parquet files; the *_stats tables are only as fresh
+    as the last refresh() call.
+    """
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    con = duckdb.connect(str(db_path))
+    source_path = Path(source_path)
+    if source_path.is_dir():
+        source = f"read_parquet('{source_path.as_posix()}/**/*.parquet', hive_partitioning=true)"
+    else:
+        source = f"read_parquet('{source_path.as_posix()}')"
+    con.execute(f"CREATE OR REPLACE VIEW reviews AS SELECT * FROM {source}")
+    con.execute("CREATE TABLE IF NOT EXISTS catalog_meta (key VARCHAR PRIMARY KEY, value VARCHAR)")
+    con.execute("INSERT OR REPLACE INTO catalog_meta VALUES ('source_path', ?)", [str(source_path)])
+    return con
+
+
+def _meta(con, key):
+    row = con.execute("SELECT value FROM catalog_meta WHERE key = ?", [key]).fetchone()
+    return row[0] if row else None
+
+
+def _tables(con):
+    return {r[0] for r in con.execute(
+        "SELECT table_name FROM information_schema.tables WHERE table_schema = 'main'").fetchall()}
+
+
+def refresh(con, force=False):
+    """
+    Bring the materialised aggregates and the search index up to date with the `reviews` view.
+
+    - Source files unchanged since the last refresh: nothing to do.
+    - Only new review_ids appeared: aggregate just those rows and merge them in
+      (rows without a review_id are only picked up by a full rebuild).
+    - Reviews were removed, AGGREGATES changed or the catalog is empty (or force=True):
+      rebuild everything.
+
+    Returns (mode, rows aggregated) where mode is 'unchanged', 'incremental' or 'full'.
+    """
+    source_path = _meta(con, 'source_path')
+    signature = _source_signature(source_path)
+    if (not force and _meta(con, 'source_signature') == signature
+            and _meta(con, 'aggregates') == repr(AGGREGATES) and 'ingested_reviews' in _tables(con)):
+        return 'unchanged', 0
+
+    full = force or 'ingested_reviews' not in _tables(con) or _meta(con, 'aggregates') != repr(AGGREGATES)
+    if not full:
+        # An ingested review that is gone from the source means the data was rewritten
+        missing = con.execute("""
+            SELECT count(*) FROM ingested_reviews i
+            WHERE NOT EXISTS (SELECT 1 FROM reviews r WHERE r.review_id = i.review_id)
+        """).fetchone()[0]
+        full = missing > 0
+
+    con.execute("BEGIN TRANSACTION")
+    try:
+        if full:
+            source_sql = "SELECT * FROM reviews"
+        else:
+            source_sql = """
+                SELECT * FROM reviews r
+                WHERE r.review_id IS NOT NULL
+                  AND NOT EXISTS (SELECT 1 FROM ingested_reviews i WHERE i.review_id = r.review_id)
+            """
+        masks = grouped_metrics(con, source_sql)
+        update_search_index(con, source_sql, full)
+        rows = con.execute(
+            f"SELECT coalesce(sum(review_count), 0) FROM grouped WHERE _set = {masks['ingested_reviews']}"
+        ).fetchone()[0]
+
+        for table, keys in AGGREGATES.items():
+            names = ', '.join(n for n, _ in keys)
+            fresh = (f"SELECT {names}, review_count, rating_sum, content_count, length_sum "
+                     f"FROM grouped WHERE _set = {masks[table]}")
+            if full or table not in _tables(con):
+                con.execute(f"CREATE OR REPLACE TABLE {table} AS {fresh}")
+            elif rows:
+                # Re-group old + new partial aggregates (NULL keys merge correctly, unlike ON CONFLICT)
+                con.execute(f"""
+                    CREATE OR REPLACE TABLE {table} AS
+                    SELECT {names},
+                        sum(review_count)::BIGINT AS review_count,
+                        sum(rating_sum) AS rating_sum,
+                        sum(content_count)::BIGINT AS content_count,
+                        sum(length_sum)::BIGINT AS length_sum
+                    FROM (SELECT * FROM {table} UNION ALL BY NAME {fresh})
+                    GROUP BY ALL
+                """)
+
+        new_ids = f"SELECT review_id FROM grouped WHERE _set = {masks['ingested_reviews']} AND review_id IS NOT NULL"
+        if full:
+            con.execute(f"CREATE OR REPLACE TABLE ingested_reviews AS {new_ids}")
+        else:
+            con.execute(f"INSERT INTO ingested_reviews {new_ids}")
+        con.execute("INSERT OR REPLACE INTO catalog_meta VALUES ('source_signature', ?)", [signature])
+        con.execute("INSERT OR REPLACE INTO catalog_meta VALUES ('aggregates', ?)", [repr(AGGREGATES)])
+        con.execute("DROP TABLE grouped")
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+
+    mode = 'full' if full else 'incremental'
+    print(f"Catalog refresh ({mode}): {rows} rows aggregated.")
+    return mode, rows
+
+
+def open_catalog(db_path=catalog_path, source_path=parquet_path):
+    """connect() + refresh(): the usual entry point for the analysis scripts."""
+    con = connect(db_path, source_path)
+    refresh(con)
+    return con
+
+
+if __name__ == "__main__":
+    con = connect()
+    mode, rows = refresh(con, force=True)
+    for table in AGGREGATES:
+        print(f"{table}: {con.execute(f'SELECT count(*) FROM {table}').fetchone()[0]} groups")
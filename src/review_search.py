@@ -0,0 +1,83 @@
+import argparse
+import time
+
+from review_catalog import open_catalog
+
+
+def keyword_grams(keyword):
+    """Distinct character bigrams of every whitespace-separated part of the keyword."""
+    grams = []
+    for part in keyword.lower().split():
+        for i in range(len(part) - 1):
+            if part[i:i + 2] not in grams:
+                grams.append(part[i:i + 2])
+    return grams
+
+
+def search(con, keyword, limit=None):
+    """
+    Reviews whose content contains `keyword` (case-insensitive substring, like LIKE '%keyword%').
+
+    Candidates come from intersecting the bigram postings (ART-indexed lookups); each
+    candidate is then checked against the stored text, so results are exact. Keywords
+    with a one-character part fall back to a scan of review_docs.
+
+    Returns a dict: keyword, count, review_ids, ratings ({rating: count}), elapsed_ms.
+    """
+    start = time.perf_counter()
+    needle = keyword.lower()
+    grams = keyword_grams(keyword)
+    parts = needle.split()
+
+    if grams and all(len(p) >= 2 for p in parts):
+        candidates = ' INTERSECT '.join(["SELECT review_id FROM review_grams WHERE gram = ?"] * len(grams))
+        con.execute(f"CREATE OR REPLACE TEMP TABLE search_candidates AS {candidates}", grams)
+        if con.execute("SELECT count(*) FROM search_candidates").fetchone()[0] == 0:
+            rows = []
+        elif len(parts) == 1 and len(needle) == 2:
+            # A single bigram match is already exact
+            rows = con.execute(
+                "SELECT review_id, rating FROM review_docs SEMI JOIN search_candidates USING (review_id) "
+                "ORDER BY review_id"
+            ).fetchall()
+        else:
+            rows = con.execute(
+                "SELECT review_id, rating FROM review_docs SEMI JOIN search_candidates USING (review_id) "
+                "WHERE contains(text, ?) ORDER BY review_id",
+                [needle]
+            ).fetchall()
+    else:
+        rows = con.execute(
+            "SELECT review_id, rating FROM review_docs WHERE contains(text, ?) ORDER BY review_id", [needle]
+        ).fetchall()
+
+    ratings = {}
+    for _, rating in rows:
+        ratings[rating] = ratings.get(rating, 0) + 1
+    review_ids = [r[0] for r in rows]
+    return {
+        'keyword': keyword,
+        'count': len(rows),
+        'review_ids': review_ids[:limit] if limit else review_ids,
+        'ratings': dict(sorted(ratings.items(), key=lambda kv: (kv[0] is None, kv[0]))),
+        'elapsed_ms': (time.perf_counter() - start) * 1000,
+    }
+
+
+def search_many(con, keywords):
+    """Run several searches on one connection: {keyword: result}."""
+    return {keyword: search(con, keyword) for keyword in keywords}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search review content through the bigram index")
+    parser.add_argument('keywords', nargs='+', help="keywords (each one is searched separately)")
+    parser.add_argument('--show', type=int, default=10, help="number of review_ids to print")
+    args = parser.parse_args()
+
+    con = open_catalog()
+    for keyword, result in search_many(con, args.keywords).items():
+        ratings = ', '.join(f"{r}: {n}" for r, n in result['ratings'].items())
+        print(f"'{keyword}': {result['count']} reviews ({result['elapsed_ms']:.1f} ms)")
+        print(f"  ratings: {ratings}")
+        print(f"  review_ids: {result['review_ids'][:args.show]}")
@@ -1,33 +1,35 @@
 
-import duckdb
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 from pathlib import Path
 import os
-from collections import Counter
-import re
+
+from keyword_stats import compute_keyword_stats
+from review_catalog import open_catalog, parquet_path
 
 # Settings
 plt.rcParams['font.family'] = 'Malgun Gothic' # Windows standard Korean font
 plt.rcParams['axes.unicode_minus'] = False
 
 base_dir = Path(r'd:\git_rk')
-parquet_path = base_dir / 'data' / 'processed' / 'gangnam_reviews.parquet'
 figures_dir = base_dir / 'output' / 'figures'
 artifacts_dir = base_dir / 'output' / 'artifacts'
 
 os.makedirs(figures_dir, exist_ok=True)
 os.makedirs(artifacts_dir, exist_ok=True)
 
-con = duckdb.connect(':memory:')
+con = None
 
 def run_analysis():
+    global con
     print("Loading data for analysis...")
+    # Persistent catalog: figures come from small pre-aggregated tables, `reviews` view for raw rows
+    con = open_catalog()
     
     # 1. Rating Distribution
     print("Analyzing Rating Distribution...")
-    df_rating = con.execute(f"SELECT rating, count(*) as count FROM '{parquet_path}' GROUP BY rating ORDER BY rating").fetchdf()
+    df_rating = con.execute("SELECT rating, review_count as count FROM rating_stats ORDER BY rating").fetchdf()
     
     plt.figure(figsize=(10, 6))
     sns.barplot(data=df_rating, x='rating', y='count', palette='viridis')
@@ -39,13 +41,10 @@ def run_analysis():
     
     # 2. Time Trend (Monthly)
     print("Analyzing Time Trend...")
-    query_time = f"""
-        SELECT 
-            strftime(review_date, '%Y-%m') as month,
-            count(*) as count
-        FROM '{parquet_path}'
-        WHERE review_date IS NOT NULL
-        GROUP BY 1
+    query_time = """
+        SELECT month, review_count as count
+        FROM monthly_stats
+        WHERE month IS NOT NULL
         ORDER BY 1
     """
     df_time = con.execute(query_time).fetchdf()
@@ -66,11 +65,10 @@ def run_analysis():
     print("Analyzing Treatments...")
     # Treatments might be comma separated or single. Assuming simple string for now.
     # Grouping by the exact string in 'treatments' column.
-    query_treatments = f"""
-        SELECT treatments, count(*) as count, avg(rating) as avg_rating
-        FROM '{parquet_path}'
+    query_treatments = """
+        SELECT treatments, review_count as count, rating_sum / review_count as avg_rating
+        FROM treatment_stats
         WHERE treatments IS NOT NULL
-        GROUP BY 1
         ORDER BY count DESC
         LIMIT 20
     """
@@ -85,41 +83,25 @@ def run_analysis():
     plt.savefig(figures_dir / 'top_treatments.png')
     plt.close()
 
-    # 4. Simple NLP Sampling
-    print("Performing NLP Sampling...")
-    
-    def get_top_keywords(rating_val, label):
-        # Sample 2000 reviews
-        query_sample = f"""
-            SELECT content 
-            FROM '{parquet_path}' 
-            WHERE rating = {rating_val} AND content IS NOT NULL
-            USING SAMPLE 2000
-        """
-        reviews = con.execute(query_sample).fetchall() # list of tuples
-        
-        text = " ".join([r[0] for r in reviews])
-        # Simple regex split for Korean (and English)
-        words = re.findall(r'\w+', text)
-        
-        # Filter short words
-        words = [w for w in words if len(w) > 1]
-        
-        counter = Counter(words)
-        return counter.most_common(20)
+    # 4. Keyword statistics over the full corpus (streamed in Arrow batches, parallel tokenising)
+    print("Computing keyword statistics...")
+    stats = compute_keyword_stats(parquet_path)
 
-    top_bad = get_top_keywords(1, "Bad (1.0)")
-    top_good = get_top_keywords(5, "Good (5.0)")
-    
     with open(artifacts_dir / 'nlp_insights.txt', 'w', encoding='utf-8') as f:
-        f.write("=== Top Keywords for Rating 1.0 ===\n")
-        for word, count in top_bad:
-            f.write(f"{word}: {count}\n")
-        
-        f.write("\n=== Top Keywords for Rating 5.0 ===\n")
-        for word, count in top_good:
-            f.write(f"{word}: {count}\n")
-            
+        f.write(f"Reviews analysed: {sum(stats.docs.values())} "
+                f"({', '.join(f'{r}: {n}' for r, n in sorted(stats.docs.items()))})\n\n")
+        for rating_val in (1.0, 5.0):
+            f.write(f"=== Top Keywords for Rating {rating_val} ===\n")
+            for word, count in stats.top_terms(rating_val):
+                f.write(f"{word}: {count}\n")
+            f.write(f"\n=== TF-IDF Keywords for Rating {rating_val} ===\n")
+            for word, score in stats.tfidf(rating_val):
+                f.write(f"{word}: {score:.1f}\n")
+            f.write(f"\n=== Rating-Lift Keywords for Rating {rating_val} ===\n")
+            for word, score in stats.lift(rating_val):
+                f.write(f"{word}: {score:.2f}\n")
+            f.write("\n")
+
     print("Analysis Complete. Figures and Artifacts saved.")
 
 if __name__ == "__main__":
@@ -1,59 +1,255 @@
 
 import duckdb
 from pathlib import Path
+import argparse
+import json
 import os
+import shutil
 import time
 
-def run_conversion():
-    base_dir = Path(r'd:\git_rk')
-    raw_csv_path = base_dir / 'data' / 'gangnam_reviews_FINAL_ALL.csv'
-    processed_dir = base_dir / 'data' / 'processed'
-    output_parquet_path = processed_dir / 'gangnam_reviews.parquet'
+from review_catalog import connect, refresh
 
+base_dir = Path(r'd:\git_rk')
+raw_csv_path = base_dir / 'data' / 'gangnam_reviews_FINAL_ALL.csv'
+processed_dir = base_dir / 'data' / 'processed'
+# Hive-partitioned by month: gangnam_reviews/review_month=2024-03/data.parquet
+dataset_dir = processed_dir / 'gangnam_reviews'
+rejected_path = processed_dir / 'gangnam_reviews_rejected.csv'
+manifest_path = dataset_dir / '_conversion.json'
+
+ROW_GROUP_SIZE = 100000     # rows per Parquet row group (DuckDB default is 122880)
+CODEC = 'ZSTD'
+UNKNOWN_MONTH = 'unknown'   # partition for reviews without a parseable date
+
+# Columns compared to decide whether an existing review_id changed
+VALUE_COLUMNS = ['hospital_id', 'hospital_name', 'nickname', 'rating', 'treatments',
+                 'content', 'review_date', 'has_photo']
+
+
+def _csv_signature(path):
+    stat = Path(path).stat()
+    return {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+
+def _load_manifest():
+    if manifest_path.exists():
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def stage_csv(con, csv_path):
+    """
+    Parse the CSV into the temp table `incoming` (one row per review_id, last occurrence wins)
+    and collect every rejected line into the temp table `rejected`.
+
+    Returns (rows read, duplicates collapsed).
+    """
+    # all_varchar: cast ourselves so a bad value rejects the row instead of failing the scan
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE raw AS
+        SELECT *, row_number() OVER () AS _line
+        FROM read_csv('{Path(csv_path).as_posix()}',
+            header=true,
+            all_varchar=true,
+            store_rejects=true,
+            rejects_table='csv_errors',
+            rejects_scan='csv_scans')
+    """)
+    con.execute("""
+        CREATE OR REPLACE TEMP TABLE typed AS
+        SELECT
+            hospital_id,
+            hospital_name,
+            review_id,
+            nickname,
+            try_cast(rating as FLOAT) as rating,
+            treatments,
+            content,
+            try_cast(date as DATE) as review_date,
+            try_cast(has_photo as BOOLEAN) as has_photo,
+            rating as _raw_rating,
+            _line
+        FROM raw
+    """)
+    # Typed rejects carry the whole raw row re-encoded as a CSV line (so it can be fixed and
+    # re-ingested) plus its data row number; `line` is only known for parse errors.
+    raw_columns = [r[0] for r in con.execute("DESCRIBE raw").fetchall() if r[0] != '_line']
+    raw_line = " || ',' || ".join(
+        f"""CASE WHEN regexp_matches(r."{c}", '[,"\\r\\n]') THEN '"' || replace(r."{c}", '"', '""') || '"'
+            ELSE coalesce(r."{c}", '') END""" for c in raw_columns
+    )
+    # DuckDB stores one csv_errors row per offending column: collapse them to one row per line
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE rejected AS
+        SELECT 'parse' as reason, string_agg(DISTINCT error_type, '; ') as detail, line,
+            NULL::BIGINT as row_number, NULL as review_id, any_value(csv_line) as csv_line
+        FROM csv_errors
+        GROUP BY scan_id, file_id, line
+        UNION ALL
+        SELECT 'missing review_id', NULL, NULL, t._line, NULL, {raw_line}
+        FROM typed t JOIN raw r USING (_line) WHERE t.review_id IS NULL
+        UNION ALL
+        SELECT 'invalid rating', t._raw_rating, NULL, t._line, t.review_id, {raw_line}
+        FROM typed t JOIN raw r USING (_line) WHERE t.review_id IS NOT NULL AND t.rating IS NULL
+        ORDER BY reason, line, row_number
+    """)
+    con.execute("""
+        CREATE OR REPLACE TEMP TABLE incoming AS
+        SELECT * EXCLUDE (_raw_rating, _line, _rn),
+            coalesce(strftime(review_date, '%Y-%m'), ?) as review_month
+        FROM (
+            SELECT *, row_number() OVER (PARTITION BY review_id ORDER BY _line DESC) as _rn
+            FROM typed
+            WHERE review_id IS NOT NULL AND rating IS NOT NULL
+        )
+        WHERE _rn = 1
+    """, [UNKNOWN_MONTH])
+    rows = con.execute("SELECT count(*) FROM raw").fetchone()[0]
+    valid = con.execute("SELECT count(*) FROM typed WHERE review_id IS NOT NULL AND rating IS NOT NULL").fetchone()[0]
+    kept = con.execute("SELECT count(*) FROM incoming").fetchone()[0]
+    return rows, valid - kept
+
+
+def write_partition(con, month, select_sql):
+    """Atomically replace one month partition with the rows of select_sql."""
+    part_dir = dataset_dir / f'review_month={month}'
+    part_dir.mkdir(parents=True, exist_ok=True)
+    target = part_dir / 'data.parquet'
+    tmp = part_dir / 'data.parquet.tmp'
+    con.execute(f"""
+        COPY ({select_sql}) TO '{tmp.as_posix()}'
+        (FORMAT PARQUET, CODEC '{CODEC}', ROW_GROUP_SIZE {ROW_GROUP_SIZE})
+    """)
+    os.replace(tmp, target)
+
+
+def upsert(con, full=False):
+    """
+    Merge `incoming` into the partitioned dataset.
+
+    Only partitions that receive new or changed reviews are rewritten; every other
+    partition file is left untouched.
+
+    Returns (inserted, updated, partitions rewritten).
+    """
+    columns = ', '.join(['hospital_id', 'hospital_name', 'review_id', 'nickname', 'rating',
+                         'treatments', 'content', 'review_date', 'has_photo'])
+    existing_files = list(dataset_dir.glob('review_month=*/data.parquet'))
+
+    if full or not existing_files:
+        if dataset_dir.exists():
+            shutil.rmtree(dataset_dir)
+        months = [r[0] for r in con.execute("SELECT DISTINCT review_month FROM incoming ORDER BY 1").fetchall()]
+        for month in months:
+            write_partition(con, month, f"""
+                SELECT {columns} FROM incoming WHERE review_month = '{month}' ORDER BY review_date, review_id
+            """)
+        inserted = con.execute("SELECT count(*) FROM incoming").fetchone()[0]
+        return inserted, 0, len(months)
+
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE existing AS
+        SELECT review_id, review_month, hash({', '.join(VALUE_COLUMNS)}) as _hash
+        FROM read_parquet('{dataset_dir.as_posix()}/**/*.parquet', hive_partitioning=true)
+    """)
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE changes AS
+        SELECT i.review_id, i.review_month, e.review_month as old_month,
+            CASE WHEN e.review_id IS NULL THEN 'insert' ELSE 'update' END as change
+        FROM incoming i
+        LEFT JOIN existing e USING (review_id)
+        WHERE e.review_id IS NULL OR e._hash != hash({', '.join('i.' + c for c in VALUE_COLUMNS)})
+    """)
+    inserted, updated = con.execute("""
+        SELECT count(*) FILTER (change = 'insert'), count(*) FILTER (change = 'update') FROM changes
+    """).fetchone()
+    months = [r[0] for r in con.execute("""
+        SELECT review_month FROM changes
+        UNION SELECT old_month FROM changes WHERE old_month IS NOT NULL
+        ORDER BY 1
+    """).fetchall()]
+
+    for month in months:
+        part_file = dataset_dir / f'review_month={month}' / 'data.parquet'
+        old_rows = ''
+        if part_file.exists():
+            # Keep this partition's rows except the ones being replaced or moved
+            old_rows = f"""
+                SELECT {columns} FROM read_parquet('{part_file.as_posix()}')
+                WHERE review_id NOT IN (SELECT review_id FROM changes)
+                UNION ALL BY NAME
+            """
+        write_partition(con, month, f"""
+            SELECT {columns} FROM (
+                {old_rows}
+                SELECT {columns} FROM incoming
+                WHERE review_month = '{month}' AND review_id IN (SELECT review_id FROM changes)
+            )
+            ORDER BY review_date, review_id
+        """)
+
+    # Partitions emptied because all their reviews moved to another month
+    for month in months:
+        part_file = dataset_dir / f'review_month={month}' / 'data.parquet'
+        if con.execute(f"SELECT count(*) FROM read_parquet('{part_file.as_posix()}')").fetchone()[0] == 0:
+            shutil.rmtree(part_file.parent)
+    return inserted, updated, len(months)
+
+
+def run_conversion(full=False):
     if not raw_csv_path.exists():
         print(f"Error: {raw_csv_path} not found.")
         return
 
     os.makedirs(processed_dir, exist_ok=True)
 
-    print("Starting conversion...")
+    manifest = _load_manifest()
+    signature = _csv_signature(raw_csv_path)
+    if not full and manifest.get('source') == signature and dataset_dir.exists():
+        print("Source CSV unchanged since the last conversion. Nothing to do.")
+        return
+
+    print(f"Starting {'full' if full else 'incremental'} conversion...")
     start_time = time.time()
-    
+
     con = duckdb.connect(database=':memory:')
-    
-    # Using read_csv with specific options to handle potential encoding or format issues
-    # We use 'auto' but hint utf-8. If it fails, we might need latin-1 or cp949, 
-    # but based on the check earlier, it's utf-8-sig.
-    
+
     try:
-        query = f"""
-            COPY (
-                SELECT 
-                    hospital_id,
-                    hospital_name,
-                    review_id,
-                    nickname,
-                    try_cast(rating as FLOAT) as rating,
-                    treatments,
-                    content,
-                    try_cast(date as DATE) as review_date,
-                    has_photo
-                FROM read_csv('{raw_csv_path}', 
-                    auto_detect=true, 
-                    ignore_errors=true,
-                    sample_size=20000)
-                WHERE rating IS NOT NULL
-            ) TO '{output_parquet_path}' (FORMAT PARQUET, CODEC 'SNAPPY');
-        """
-        con.execute(query)
+        rows, duplicates = stage_csv(con, raw_csv_path)
+        inserted, updated, partitions = upsert(con, full=full)
+
+        # Rejected rows sidecar (replaced on every run) and counts
+        con.execute(f"COPY rejected TO '{rejected_path.as_posix()}' (HEADER, DELIMITER ',')")
+        rejected = dict(con.execute("SELECT reason, count(*) FROM rejected GROUP BY 1 ORDER BY 1").fetchall())
+
+        dataset_dir.mkdir(parents=True, exist_ok=True)
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump({'source': signature, 'rows_read': rows, 'inserted': inserted, 'updated': updated,
+                       'duplicates': duplicates, 'rejected': rejected,
+                       'converted_at': time.strftime('%Y-%m-%dT%H:%M:%S')}, f, ensure_ascii=False, indent=2)
+
         print(f"Conversion finished in {time.time() - start_time:.2f} seconds.")
-        
+        print(f"Rows read: {rows}, inserted: {inserted}, updated: {updated}, "
+              f"duplicates collapsed: {duplicates}, partitions rewritten: {partitions}")
+        print(f"Rejected rows: {sum(rejected.values())} {rejected} -> {rejected_path}")
+
         # Verify
-        count = con.execute(f"SELECT count(*) FROM parquet_scan('{output_parquet_path}')").fetchone()[0]
+        count = con.execute(
+            f"SELECT count(*) FROM read_parquet('{dataset_dir.as_posix()}/**/*.parquet')").fetchone()[0]
         print(f"Total rows in parquet: {count}")
-        
+
+        # Bring the persistent catalog's aggregates up to date for the analysis scripts.
+        # Updated reviews keep their review_id, so the catalog has to rebuild rather than append.
+        catalog = connect(source_path=dataset_dir)
+        refresh(catalog, force=updated > 0)
+        catalog.close()
+
     except Exception as e:
         print(f"An error occurred: {e}")
 
 if __name__ == "__main__":
-    run_conversion()
+    parser = argparse.ArgumentParser(description="Convert the review CSV into month-partitioned Parquet")
+    parser.add_argument('--full', action='store_true', help="rebuild every partition instead of upserting")
+    args = parser.parse_args()
+    run_conversion(full=args.full)
@@ -0,0 +1,36 @@
+import keyword_stats
+from keyword_stats import KeywordStats, strip_josa
+
+
+def test_strip_josa_keeps_nouns_ending_in_particle_syllables():
+    for word in ['피부과', '성형외과', '만족도', '전문가', '어린이', '고양이']:
+        assert strip_josa(word) == word
+
+
+def test_strip_josa_strips_particles_after_nouns():
+    assert strip_josa('피부과에서') == '피부과'
+    assert strip_josa('피부과는') == '피부과'
+    assert strip_josa('성형외과를') == '성형외과'
+    assert strip_josa('만족도가') == '만족도'
+    assert strip_josa('전문가가') == '전문가'
+    assert strip_josa('어린이가') == '어린이'
+    assert strip_josa('어린이는') == '어린이'
+
+
+def test_one_word_is_counted_under_one_form(monkeypatch):
+    # Regex fallback tokenizer, even if kiwipiepy is installed
+    monkeypatch.setattr(keyword_stats, '_kiwi', False)
+    stats = KeywordStats()
+    stats.update(['피부과 추천', '피부과에서 시술', '피부과는 친절'], [5.0, 5.0, 5.0])
+    assert stats.tf[5.0]['피부과'] == 3
+    assert '피부' not in stats.tf[5.0]
+
+
+def test_nouns_ending_in_ga_or_i_are_counted_under_one_form(monkeypatch):
+    monkeypatch.setattr(keyword_stats, '_kiwi', False)
+    stats = KeywordStats()
+    stats.update(['전문가 추천', '전문가가 친절', '어린이 진료', '어린이가 편한'], [5.0, 5.0, 5.0, 5.0])
+    assert stats.tf[5.0]['전문가'] == 2
+    assert stats.tf[5.0]['어린이'] == 2
+    assert '전문' not in stats.tf[5.0]
+    assert '어린' not in stats.tf[5.0]